@@ -0,0 +1,174 @@
+# adversarialSearch.py
+# --------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Building blocks shared by the game-tree search agents in multiAgents.py:
+
+  ZobristHasher:       64-bit position keys for GameStates, updated
+                       incrementally from parent to child.
+  TranspositionTable:  a bounded table of searched values with
+                       exact/lower/upper bound flags.
+  MoveOrdering:        killer-move and history heuristics for trying the
+                       most promising actions first.
+  SearchTimeout:       raised to abandon a search whose time is up.
+"""
+
+import random
+import util
+
+
+def isEnabled(option):
+    "Interprets an agent option passed with -a (e.g. -a ordering=True)."
+    return str(option).lower() in ('1', 'true', 'yes', 'on')
+
+
+class SearchTimeout(Exception):
+    "Raised inside a search to abandon it once its time budget is spent."
+    pass
+
+
+class ZobristHasher:
+    """
+    Assigns a random 64-bit key to every feature of a Pacman state (an
+    agent's position and, for ghosts, heading and scared timer; each food
+    pellet; each capsule) and hashes a state as the XOR of its features.
+
+    Keys are drawn lazily from a seeded generator, so any position --
+    including the half-steps of scared ghosts -- gets one, and the same
+    hasher always produces the same keys.  successorHash() turns a parent's
+    hash into its child's by XOR-ing out what changed, instead of walking the
+    whole food grid again.
+
+    The score is not part of the hash; callers that need it (evaluation
+    functions usually do) should add it to their table keys.
+    """
+
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+        self.keys = {}
+
+    def key(self, feature):
+        if feature not in self.keys:
+            self.keys[feature] = self.random.getrandbits(64)
+        return self.keys[feature]
+
+    def agentKey(self, agentIndex, agentState):
+        conf = agentState.configuration
+        if agentIndex == 0:
+            # Pacman may reverse at will, so his heading does not matter
+            return self.key((0, conf.pos))
+        return self.key((agentIndex, conf.pos, conf.direction, agentState.scaredTimer))
+
+    def hash(self, gameState):
+        "Hashes a state from scratch."
+        h = 0
+        for agentIndex, agentState in enumerate(gameState.data.agentStates):
+            h ^= self.agentKey(agentIndex, agentState)
+        for pos in gameState.getFood().asList():
+            h ^= self.key(('food', pos))
+        for pos in gameState.getCapsules():
+            h ^= self.key(('capsule', pos))
+        return h
+
+    def successorHash(self, h, gameState, successor):
+        """
+        Returns the hash of successor, given that h is the hash of gameState
+        and successor was generated from it by a single action.
+        """
+        before = gameState.data.agentStates
+        after = successor.data.agentStates
+        for agentIndex in range(len(after)):
+            # Eating a capsule or a ghost can change agents other than the mover
+            old, new = before[agentIndex], after[agentIndex]
+            if old.configuration != new.configuration or old.scaredTimer != new.scaredTimer:
+                h ^= self.agentKey(agentIndex, old) ^ self.agentKey(agentIndex, new)
+        if successor.data._foodEaten is not None:
+            h ^= self.key(('food', successor.data._foodEaten))
+        if successor.data._capsuleEaten is not None:
+            h ^= self.key(('capsule', successor.data._capsuleEaten))
+        return h
+
+
+class TranspositionTable:
+    """
+    Remembers the results of earlier searches so that a state reached again
+    through a different move order is not searched twice.
+
+    Each entry records the depth searched, the value found, whether that value
+    is EXACT or only a LOWERBOUND / UPPERBOUND (because the search was cut
+    off), and the best action.  Once maxSize entries are held, the oldest
+    entry is evicted to make room.
+    """
+    EXACT, LOWERBOUND, UPPERBOUND = 0, 1, 2
+
+    def __init__(self, maxSize=100000):
+        self.maxSize = maxSize
+        self.entries = {}
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, key):
+        "Returns (depth, value, flag, action) or None."
+        return self.entries.get(key)
+
+    def store(self, key, depth, value, flag, action):
+        old = self.entries.get(key)
+        if old is not None:
+            if old[0] > depth:
+                return # keep the deeper result
+        elif len(self.entries) >= self.maxSize:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = (depth, value, flag, action)
+
+    def clear(self):
+        self.entries = {}
+
+
+class MoveOrdering:
+    """
+    Orders actions so that alpha-beta sees its cutoffs early: first the best
+    action remembered for the state, then the killer actions that caused a
+    cutoff at the same ply, then the rest by their history score (the
+    accumulated depth^2 of the cutoffs each (agent, action) has caused).
+    """
+    NUM_KILLERS = 2
+
+    def __init__(self):
+        self.killers = {}
+        self.history = util.Counter()
+
+    def order(self, actions, agentIndex, ply, bestAction=None):
+        killers = self.killers.get(ply, [])
+        history = self.history
+
+        def rank(action):
+            if action == bestAction:
+                return (0, 0)
+            if action in killers:
+                return (1, killers.index(action))
+            return (2, -history[(agentIndex, action)])
+        return sorted(actions, key=rank)
+
+    def recordCutoff(self, action, agentIndex, ply, depth):
+        killers = self.killers.setdefault(ply, [])
+        if action in killers:
+            killers.remove(action)
+        killers.insert(0, action)
+        del killers[MoveOrdering.NUM_KILLERS:]
+        self.history[(agentIndex, action)] += depth * depth
+
+    def clear(self):
+        "Forgets the killers (which are tied to plies below the last root)."
+        self.killers = {}
@@ -0,0 +1,222 @@
+# compactState.py
+# ---------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+A compact, immutable representation of a Pacman game state for game-tree
+search.
+
+GameState.generateSuccessor copies every AgentState, the food grid (whenever
+food is eaten) and the capsule list, and records both states in
+GameState.explored.  A CompactState is a single named tuple:
+
+  positions:     a tuple of (x,y) positions, Pacman first
+  directions:    the direction each agent is heading
+  scaredTimers:  the scared timer of each agent (always 0 for Pacman)
+  food:          an int with bit x*height+y set for each remaining pellet
+  capsules:      a tuple of the remaining capsule positions
+  score:         the game score
+  win, lose:     whether the game is over
+
+CompactRules holds what does not change during a game (walls, legal moves per
+cell, the ghosts' start positions) and generates successors by the same rules
+as PacmanRules and GhostRules in pacman.py, so that
+
+  rules = CompactRules(gameState)
+  state = rules.fromGameState(gameState)
+  rules.toGameState(rules.generateSuccessor(state, agentIndex, action))
+
+equals gameState.generateSuccessor(agentIndex, action).  Use toGameState to
+hand a leaf to an evaluation function that expects a GameState.
+
+The rules' constants and the GameState class are taken from the module that
+defined gameState's class, so this module never imports pacman.py itself:
+run as 'python pacman.py' that module is __main__, and importing pacman
+would load a second copy whose GameState the game does not use.
+"""
+
+import collections
+import sys
+
+from game import Actions, AgentState, Configuration, Directions, Grid
+from util import nearestPoint
+
+CompactState = collections.namedtuple('CompactState', ['positions', 'directions', 'scaredTimers',
+                                                       'food', 'capsules', 'score', 'win', 'lose'])
+
+
+class CompactRules:
+    """
+    Successor generation for CompactStates of one layout.
+    """
+
+    def __init__(self, gameState):
+        self.template = gameState
+        pacman = sys.modules[gameState.__class__.__module__]
+        self.scaredTime = pacman.SCARED_TIME
+        self.collisionTolerance = pacman.COLLISION_TOLERANCE
+        self.timePenalty = pacman.TIME_PENALTY
+        self.pacmanSpeed = pacman.PacmanRules.PACMAN_SPEED
+        self.ghostSpeed = pacman.GhostRules.GHOST_SPEED
+        self.walls = gameState.getWalls()
+        self.width, self.height = self.walls.width, self.walls.height
+        agentStates = gameState.data.agentStates
+        self.numAgents = len(agentStates)
+        self.startConfigurations = [s.start for s in agentStates]
+        self.starts = [(s.start.pos, s.start.direction) for s in agentStates]
+        self.isPacman = [s.isPacman for s in agentStates]
+
+        # Food bit and Pacman's legal actions for each open cell
+        self.bits = {}
+        self.pacmanActions = {}
+        for x in range(self.width):
+            for y in range(self.height):
+                if self.walls[x][y]: continue
+                self.bits[(x, y)] = 1 << (x * self.height + y)
+                self.pacmanActions[(x, y)] = [dir for dir, (dx, dy) in Actions._directionsAsList
+                                              if not self.walls[x + dx][y + dy]]
+        # Ghosts' legal actions by (position, direction), filled in as needed
+        self.ghostActions = {}
+
+    def fromGameState(self, gameState):
+        "Returns the CompactState of a GameState."
+        agentStates = gameState.data.agentStates
+        food = 0
+        for pos in gameState.getFood().asList():
+            food |= self.bits[pos]
+        return CompactState(tuple(s.configuration.pos for s in agentStates),
+                            tuple(s.configuration.direction for s in agentStates),
+                            tuple(s.scaredTimer for s in agentStates),
+                            food, tuple(gameState.getCapsules()), gameState.data.score,
+                            gameState.isWin(), gameState.isLose())
+
+    def toGameState(self, state):
+        "Returns a GameState equal to the CompactState."
+        gameState = self.template.__class__(self.template)
+        data = gameState.data
+        food = Grid(self.width, self.height)
+        for (x, y), bit in self.bits.items():
+            if state.food & bit:
+                food[x][y] = True
+        data.setFood(food)
+        data.setCapsules(list(state.capsules))
+        agentStates = []
+        for index in range(self.numAgents):
+            agentState = AgentState(self.startConfigurations[index], self.isPacman[index])
+            agentState.configuration = Configuration(state.positions[index], state.directions[index])
+            agentState.scaredTimer = state.scaredTimers[index]
+            agentStates.append(agentState)
+        data.agentStates = agentStates
+        data.score = state.score
+        data._win = state.win
+        data._lose = state.lose
+        return gameState
+
+    def getNumFood(self, state):
+        return bin(state.food).count('1')
+
+    def getLegalActions(self, state, agentIndex=0):
+        if state.win or state.lose:
+            return []
+        pos = state.positions[agentIndex]
+        direction = state.directions[agentIndex]
+        if agentIndex == 0:
+            actions = self.pacmanActions.get(pos)
+            if actions is None:
+                actions = Actions.getPossibleActions(Configuration(pos, direction), self.walls)
+            return list(actions)
+
+        key = (pos, direction)
+        actions = self.ghostActions.get(key)
+        if actions is None:
+            # Ghosts cannot stop, and turn around only at dead ends
+            actions = Actions.getPossibleActions(Configuration(pos, direction), self.walls)
+            reverse = Actions.reverseDirection(direction)
+            if Directions.STOP in actions:
+                actions.remove(Directions.STOP)
+            if reverse in actions and len(actions) > 1:
+                actions.remove(reverse)
+            self.ghostActions[key] = actions
+        return list(actions)
+
+    def generateSuccessor(self, state, agentIndex, action):
+        """
+        Returns the CompactState after the agent takes the action.
+        """
+        if state.win or state.lose:
+            raise Exception('Can\'t generate a successor of a terminal state.')
+        if action not in self.getLegalActions(state, agentIndex):
+            raise Exception('Illegal action ' + str(action))
+
+        positions = list(state.positions)
+        directions = state.directions
+        timers = state.scaredTimers
+        food, capsules = state.food, state.capsules
+        win = lose = False
+        scoreChange = 0
+
+        x, y = positions[agentIndex]
+        dx, dy = Actions._directions[action]
+        if agentIndex == 0:
+            speed = self.pacmanSpeed
+        else:
+            speed = self.ghostSpeed
+            if timers[agentIndex] > 0:
+                speed /= 2.0
+        pos = (x + dx * speed, y + dy * speed)
+        if action != Directions.STOP:
+            directions = directions[:agentIndex] + (action,) + directions[agentIndex + 1:]
+
+        if agentIndex == 0:
+            # Eat
+            nearest = nearestPoint(pos)
+            if abs(nearest[0] - pos[0]) + abs(nearest[1] - pos[1]) <= 0.5:
+                bit = self.bits.get(nearest, 0)
+                if food & bit:
+                    scoreChange += 10
+                    food &= ~bit
+                    if food == 0:
+                        scoreChange += 500
+                        win = True
+                if nearest in capsules:
+                    capsules = tuple(c for c in capsules if c != nearest)
+                    timers = (timers[0],) + (self.scaredTime,) * (self.numAgents - 1)
+            scoreChange -= self.timePenalty
+            positions[0] = pos
+            ghosts = range(1, self.numAgents)
+        else:
+            timer = timers[agentIndex]
+            if timer == 1:
+                pos = nearestPoint(pos)
+            if timer > 0:
+                timers = timers[:agentIndex] + (timer - 1,) + timers[agentIndex + 1:]
+            positions[agentIndex] = pos
+            ghosts = (agentIndex,)
+
+        # Resolve collisions
+        px, py = positions[0]
+        for index in ghosts:
+            gx, gy = positions[index]
+            if abs(gx - px) + abs(gy - py) > self.collisionTolerance:
+                continue
+            if timers[index] > 0:
+                scoreChange += 200
+                positions[index], startDirection = self.starts[index]
+                directions = directions[:index] + (startDirection,) + directions[index + 1:]
+                timers = timers[:index] + (0,) + timers[index + 1:]
+            elif not win:
+                scoreChange -= 500
+                lose = True
+
+        return CompactState(tuple(positions), directions, timers, food, capsules,
+                            state.score + scoreChange, win, lose)
@@ -0,0 +1,163 @@
+# evaluationCache.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Memoized and batched leaf evaluation for the agents in multiAgents.py.
+
+An EvaluationCache wraps an evaluation function.  Called on one GameState it
+looks the state up by a compact key (every agent's position, heading and
+scared timer, the food grid as a tuple, the capsules, the score and whether
+the game is over) and only evaluates states it has not seen, keeping at
+most maxSize values and evicting the least recently used.
+
+evaluateAll(states) does the same for a whole frontier of leaves.  If the
+cache was given a batch version of the evaluation function, the states it
+has not seen are evaluated together: LeafFeatures turns them into NumPy
+arrays (Pacman and ghost positions, scared timers, scores, the distance to
+the nearest pellet) and the batch function computes every value at once.
+
+cache = EvaluationCache(betterEvaluationFunction, 100000, betterEvaluationBatch)
+values = cache.evaluateAll(leaves)
+print(cache.hitRate())
+"""
+
+import collections
+
+import numpy
+
+
+class LeafFeatures:
+    """
+    NumPy arrays describing a list of GameStates of one layout, N states
+    with G ghosts each:
+
+      pacman:       (N, 2) Pacman's positions
+      ghosts:       (N, G, 2) the ghosts' positions
+      scaredTimers: (N, G) the ghosts' scared timers
+      scores:       (N,) the game scores
+      wins, losses: (N,) booleans
+      foodDistance: (N,) Manhattan distance from Pacman to the nearest
+                    pellet (infinite when no food is left)
+    """
+
+    def __init__(self, states):
+        agents = [state.data.agentStates for state in states]
+        positions = numpy.array([[s.configuration.pos for s in agentStates] for agentStates in agents],
+                                dtype=float).reshape(len(states), -1, 2)
+        self.pacman = positions[:, 0, :]
+        self.ghosts = positions[:, 1:, :]
+        self.scaredTimers = numpy.array([[s.scaredTimer for s in agentStates[1:]] for agentStates in agents],
+                                        dtype=float).reshape(len(states), -1)
+        self.scores = numpy.array([state.data.score for state in states], dtype=float)
+        self.wins = numpy.array([state.data._win for state in states], dtype=bool)
+        self.losses = numpy.array([state.data._lose for state in states], dtype=bool)
+        self.foodDistance = self.nearestFood(states)
+
+    def nearestFood(self, states):
+        """
+        Distances to the nearest pellet, computed once per distinct food grid:
+        successors share their parent's grid until a pellet is eaten.
+        """
+        groups = collections.OrderedDict()
+        for i, state in enumerate(states):
+            data = state.data.food.data
+            groups.setdefault(id(data), (data, []))[1].append(i)
+        distance = numpy.full(len(states), numpy.inf)
+        for data, indices in groups.values():
+            food = numpy.argwhere(numpy.array(data, dtype=bool))
+            if len(food) == 0:
+                continue
+            pacman = self.pacman[indices]
+            manhattan = numpy.abs(pacman[:, None, :] - food[None, :, :]).sum(axis=2)
+            distance[indices] = manhattan.min(axis=1)
+        return distance
+
+
+class EvaluationCache:
+    """
+    An LRU-bounded memo of an evaluation function's values; see the module
+    docstring.  hits, misses and evictions count lookups since creation.
+    """
+
+    def __init__(self, evaluate, maxSize=100000, batchEvaluate=None):
+        self.evaluate = evaluate
+        self.batchEvaluate = batchEvaluate
+        self.maxSize = maxSize
+        self.values = collections.OrderedDict()
+        self.foodKeys = {} # id(food data) -> (food data, key)
+        self.hits = self.misses = self.evictions = 0
+
+    def foodKey(self, food):
+        data = food.data
+        entry = self.foodKeys.get(id(data))
+        if entry is not None and entry[0] is data:
+            return entry[1]
+        key = tuple(map(tuple, data))
+        if len(self.foodKeys) >= self.maxSize:
+            self.foodKeys = {}
+        self.foodKeys[id(data)] = (data, key)
+        return key
+
+    def key(self, gameState):
+        data = gameState.data
+        return (tuple([(s.configuration.pos, s.configuration.direction, s.scaredTimer)
+                       for s in data.agentStates]),
+                self.foodKey(data.food), tuple(data.capsules), data.score, data._win, data._lose)
+
+    def lookup(self, key):
+        value = self.values.get(key)
+        if value is not None:
+            self.values.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+        return value
+
+    def store(self, key, value):
+        self.values[key] = value
+        if len(self.values) > self.maxSize:
+            self.values.popitem(last=False)
+            self.evictions += 1
+
+    def __call__(self, gameState):
+        key = self.key(gameState)
+        value = self.lookup(key)
+        if value is None:
+            value = self.evaluate(gameState)
+            self.store(key, value)
+        return value
+
+    def evaluateAll(self, states):
+        "Returns the values of a list of GameStates, evaluating the unseen ones together."
+        keys = [self.key(state) for state in states]
+        values = [self.lookup(key) for key in keys]
+        missing = [i for i, value in enumerate(values) if value is None]
+        if not missing:
+            return values
+        if self.batchEvaluate is not None:
+            computed = self.batchEvaluate(LeafFeatures([states[i] for i in missing])).tolist()
+        else:
+            computed = [self.evaluate(states[i]) for i in missing]
+        for i, value in zip(missing, computed):
+            values[i] = value
+            self.store(keys[i], value)
+        return values
+
+    def hitRate(self):
+        lookups = self.hits + self.misses
+        return self.hits / float(lookups) if lookups else 0.0
+
+    def clear(self):
+        self.values.clear()
+        self.foodKeys = {}
@@ -219,16 +219,30 @@ class Grid:
         return hash(h)
 
     def copy(self):
-        g = Grid(self.width, self.height)
-        g.data = [x[:] for x in self.data]
-        return g
+        return self._withData([x[:] for x in self.data])
 
     def deepCopy(self):
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
-        g.data = self.data
+        return self._withData(self.data)
+
+    def cleared(self, x, y):
+        """
+        Returns a copy of the grid with cell (x,y) set to False.  Only column x
+        is copied; the others are shared, as in a shallowCopy.
+        """
+        data = list(self.data)
+        column = data[x][:]
+        column[y] = False
+        data[x] = column
+        return self._withData(data)
+
+    def _withData(self, data):
+        "A Grid of this size holding data, without filling in a blank grid first."
+        g = Grid.__new__(Grid)
+        g.CELLS_PER_INT = self.CELLS_PER_INT
+        g.width, g.height, g.data = self.width, self.height, data
         return g
 
     def count(self, item=True):
@@ -393,6 +407,18 @@ class Actions:
     getSuccessor = staticmethod(getSuccessor)
 
 
+FOOD_KEY_MASK = (1 << 64) - 1
+
+def foodKey(x, y):
+    """
+    A fixed pseudo-random 64-bit key for a pellet at (x,y) (SplitMix64 of the
+    position), so that a food hash means the same in every process.
+    """
+    z = (x * 0x9E3779B97F4A7C15 + y * 0xD1B54A32D192ED03 + 0x632BE59BD9B4E019) & FOOD_KEY_MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & FOOD_KEY_MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & FOOD_KEY_MASK
+    return z ^ (z >> 31)
+
 class GameStateData:
 
     def __init__(self, prevState=None):
@@ -402,6 +428,9 @@ class GameStateData:
         if prevState != None:
             self.food = prevState.food.shallowCopy()
             self.capsules = prevState.capsules[:]
+            self.numFood = prevState.numFood
+            self.foodHash = prevState.foodHash
+            self.capsuleSet = prevState.capsuleSet
             self.agentStates = self.copyAgentStates(prevState.agentStates)
             self.layout = prevState.layout
             self._eaten = prevState._eaten
@@ -418,7 +447,7 @@ class GameStateData:
     def deepCopy(self):
         state = GameStateData(self)
         state.food = self.food.deepCopy()
-        state.layout = self.layout.deepCopy()
+        # GameStateData(self) already shares the layout, which is immutable
         state._agentMoved = self._agentMoved
         state._foodEaten = self._foodEaten
         state._foodAdded = self._foodAdded
@@ -431,6 +460,35 @@ class GameStateData:
             copiedStates.append(agentState.copy())
         return copiedStates
 
+    def setFood(self, food):
+        """
+        Replaces the food grid.  numFood and foodHash (the XOR of foodKey over
+        the pellets) are recomputed here and then kept up to date by
+        removeFood, so they never need a scan of the grid.
+        """
+        self.food = food
+        self.numFood = 0
+        self.foodHash = 0
+        for x in range(food.width):
+            for y in range(food.height):
+                if food[x][y]:
+                    self.numFood += 1
+                    self.foodHash ^= foodKey(x, y)
+
+    def setCapsules(self, capsules):
+        self.capsules = capsules
+        self.capsuleSet = frozenset(capsules)
+
+    def removeFood(self, x, y):
+        "Eats the pellet at (x,y), copying only the column it was in."
+        self.food = self.food.cleared(x, y)
+        self.numFood -= 1
+        self.foodHash ^= foodKey(x, y)
+
+    def removeCapsule(self, position):
+        self.capsules.remove(position)
+        self.capsuleSet = self.capsuleSet - frozenset([position])
+
     def __eq__(self, other):
         """
         Allows two states to be compared.
@@ -440,6 +498,8 @@ class GameStateData:
         # TODO Check for type of other
         if not self.agentStates == other.agentStates:
             return False
+        if self.numFood != other.numFood or self.foodHash != other.foodHash:
+            return False
         if not self.food == other.food:
             return False
         if not self.capsules == other.capsules:
@@ -458,7 +518,7 @@ class GameStateData:
             except TypeError as e:
                 print(e)
                 # hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113 * hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575)
+        return int((hash(tuple(self.agentStates)) + 13*self.foodHash + 113 * hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575)
 
     def __str__(self):
         width, height = self.layout.width, self.layout.height
@@ -518,9 +578,8 @@ class GameStateData:
         """
         Creates an initial game state from a layout array (see layout.py).
         """
-        self.food = layout.food.copy()
-        #self.capsules = []
-        self.capsules = layout.capsules[:]
+        self.setFood(layout.food.copy())
+        self.setCapsules(list(layout.capsules))
         self.layout = layout
         self.score = 0
         self.scoreChange = 0
@@ -0,0 +1,231 @@
+# monteCarloSearch.py
+# -------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Monte Carlo tree search for Pacman, used by MonteCarloAgent in multiAgents.py.
+
+The search runs on the CompactStates of compactState.py rather than on
+GameStates, so a playout step is a single tuple update:
+
+  MonteCarloTree:    open-loop UCT over Pacman's moves.  A node stands for a
+                     sequence of Pacman actions; the ghosts' replies are
+                     sampled afresh on every visit from ghost models.
+  CompactGhostView:  the part of the GameState interface that the ghosts of
+                     ghostAgents.py read, over a CompactState, so that a
+                     RandomGhost or DirectionalGhost can move in a playout.
+  rollout policies:  functions (rules, state, actions) -> action choosing
+                     Pacman's moves below the tree; see ROLLOUT_POLICIES.
+"""
+
+import math
+import random
+import time
+
+from game import Actions, Directions
+from util import manhattanDistance
+
+
+class CompactGhostView:
+    """
+    Presents a CompactState to a GhostAgent as if it were a GameState.
+    """
+
+    class GhostState:
+        __slots__ = ('scaredTimer',)
+
+        def __init__(self, scaredTimer):
+            self.scaredTimer = scaredTimer
+
+    def __init__(self, rules, state):
+        self.rules = rules
+        self.state = state
+
+    def getLegalActions(self, agentIndex=0):
+        return self.rules.getLegalActions(self.state, agentIndex)
+
+    def getGhostState(self, agentIndex):
+        return CompactGhostView.GhostState(self.state.scaredTimers[agentIndex])
+
+    def getGhostPosition(self, agentIndex):
+        return self.state.positions[agentIndex]
+
+    def getPacmanPosition(self):
+        return self.state.positions[0]
+
+    def getNumAgents(self):
+        return self.rules.numAgents
+
+
+def randomRollout(rules, state, actions):
+    "Moves at random, stopping only when there is nothing else to do."
+    if len(actions) > 1 and Directions.STOP in actions:
+        actions = [a for a in actions if a != Directions.STOP]
+    return random.choice(actions)
+
+def greedyRollout(rules, state, actions):
+    """
+    Eats an adjacent pellet if there is one, otherwise moves at random,
+    avoiding cells next to a ghost that is not scared.
+    """
+    x, y = state.positions[0]
+    eating, safe = [], []
+    for action in actions:
+        if action == Directions.STOP:
+            continue
+        dx, dy = Actions._directions[action]
+        pos = (int(x + dx), int(y + dy))
+        if state.food & rules.bits.get(pos, 0):
+            eating.append(action)
+        threatened = False
+        for index in range(1, rules.numAgents):
+            if state.scaredTimers[index] == 0 and manhattanDistance(pos, state.positions[index]) <= 1:
+                threatened = True
+                break
+        if not threatened:
+            safe.append(action)
+    safeEating = [a for a in eating if a in safe]
+    return random.choice(safeEating or safe or eating or actions)
+
+ROLLOUT_POLICIES = {'random': randomRollout, 'greedy': greedyRollout}
+
+
+class MonteCarloNode:
+    __slots__ = ('children', 'visits', 'total')
+
+    def __init__(self):
+        self.children = {} # action -> MonteCarloNode
+        self.visits = 0
+        self.total = 0.0
+
+
+class MonteCarloTree:
+    """
+    UCT search from one root state.
+
+    Each iteration walks down the tree from the root, picking the action
+    with the best upper confidence bound (rewards are rescaled to [0, 1] by
+    the smallest and largest seen so far), expands one untried action,
+    plays out up to 'depth' further Pacman moves with the rollout policy,
+    scores the final state with 'evaluate' and adds the score to every node
+    on the way down.
+
+    stats counts iterations, successors generated ('nodes') and playout
+    steps ('rolloutSteps').
+    """
+
+    def __init__(self, rules, root, ghosts, evaluate, rollout=randomRollout,
+                 depth=10, exploration=1.4, stats=None):
+        self.rules = rules
+        self.rootState = root
+        self.ghosts = ghosts
+        self.evaluate = evaluate
+        self.rollout = rollout
+        self.depth = depth
+        self.exploration = exploration
+        self.stats = stats if stats is not None else {}
+        for key in ('iterations', 'nodes', 'rolloutSteps'):
+            self.stats.setdefault(key, 0)
+        self.root = MonteCarloNode()
+        self.lowest, self.highest = float("inf"), -float("inf")
+
+    def search(self, iterations=0, seconds=0):
+        """
+        Runs iterations until 'iterations' are done or 'seconds' have passed
+        (whichever is given; both may be), then returns the root's most
+        visited action.
+        """
+        if iterations <= 0 and seconds <= 0:
+            raise Exception('MonteCarloTree.search needs an iteration or time budget')
+        deadline = time.time() + seconds if seconds > 0 else None
+        done = 0
+        while True:
+            self.iterate()
+            done += 1
+            if iterations > 0 and done >= iterations:
+                break
+            if deadline is not None and time.time() >= deadline:
+                break
+        return self.bestAction()
+
+    def bestAction(self):
+        children = self.root.children
+        actions = self.rules.getLegalActions(self.rootState, 0)
+        return max(actions, key=lambda a: children[a].visits if a in children else -1)
+
+    def isTerminal(self, state):
+        return state.win or state.lose
+
+    def playRound(self, state, action):
+        "Pacman's action followed by one sampled move of every ghost."
+        rules, stats = self.rules, self.stats
+        state = rules.generateSuccessor(state, 0, action)
+        stats['nodes'] += 1
+        for ghost in self.ghosts:
+            if state.win or state.lose:
+                break
+            ghostAction = ghost.getAction(CompactGhostView(rules, state))
+            state = rules.generateSuccessor(state, ghost.index, ghostAction)
+            stats['nodes'] += 1
+        return state
+
+    def select(self, node, actions):
+        "The action of node with the best upper confidence bound."
+        scale = self.highest - self.lowest
+        if scale <= 0:
+            scale = 1.0
+        logVisits = math.log(node.visits)
+        children, lowest, exploration = node.children, self.lowest, self.exploration
+
+        def bound(action):
+            child = children[action]
+            mean = (child.total / child.visits - lowest) / scale
+            return mean + exploration * math.sqrt(logVisits / child.visits)
+        return max(actions, key=bound)
+
+    def iterate(self):
+        rules = self.rules
+        state, node = self.rootState, self.root
+        path = [node]
+        while not self.isTerminal(state):
+            actions = rules.getLegalActions(state, 0)
+            untried = [a for a in actions if a not in node.children]
+            if untried:
+                action = random.choice(untried)
+                node.children[action] = MonteCarloNode()
+            else:
+                action = self.select(node, actions)
+            state = self.playRound(state, action)
+            node = node.children[action]
+            path.append(node)
+            if untried:
+                break
+
+        reward = self.playout(state)
+        self.lowest = min(self.lowest, reward)
+        self.highest = max(self.highest, reward)
+        for node in path:
+            node.visits += 1
+            node.total += reward
+        self.stats['iterations'] += 1
+
+    def playout(self, state):
+        "Plays up to self.depth rounds with the rollout policy; returns the final evaluation."
+        rules, rollout = self.rules, self.rollout
+        for step in range(self.depth):
+            if state.win or state.lose:
+                break
+            action = rollout(rules, state, rules.getLegalActions(state, 0))
+            state = self.playRound(state, action)
+            self.stats['rolloutSteps'] += 1
+        return self.evaluate(state)
@@ -14,9 +14,17 @@
 
 from util import manhattanDistance
 from game import Directions
-import random, util
+import random, util, time
+import numpy
 
 from game import Agent
+from ghostAgents import RandomGhost, DirectionalGhost
+from compactState import CompactRules
+from adversarialSearch import ZobristHasher, TranspositionTable, MoveOrdering, isEnabled
+from adversarialSearch import SearchTimeout
+import monteCarloSearch
+import parallelSearch
+from evaluationCache import EvaluationCache
 
 class ReflexAgent(Agent):
     """
@@ -98,6 +106,32 @@ def scoreEvaluationFunction(currentGameState):
     """
     return currentGameState.getScore()
 
+def scoreEvaluationBounds(gameState, depth, timePenalty=1):
+    """
+    Returns (lower, upper) bounds on scoreEvaluationFunction at the leaves of
+    a search from gameState in which Pacman moves at most depth times.
+
+    Each Pacman move costs timePenalty (TIME_PENALTY in pacman.py, which this
+    module does not import) and eats at most one pellet.  The game ends with
+    either a win (if few enough pellets are left) or a loss, and on the move
+    that loses it every ghost on Pacman's cell costs 500.  A ghost can only
+    be eaten while scared: once now if it already is, and once more for each
+    capsule within Pacman's reach, however many are eaten on the same move.
+    """
+    score = gameState.getScore()
+    numFood = gameState.getNumFood()
+    numGhosts = gameState.getNumAgents() - 1
+    pos = gameState.getPacmanPosition()
+    capsules = [c for c in gameState.getCapsules() if manhattanDistance(pos, c) <= depth]
+    scared = len([g for g in gameState.getGhostStates() if g.scaredTimer > 0]) > 0
+
+    lower = score - depth * timePenalty - 500 * numGhosts
+    upper = score + 10 * min(depth, numFood)
+    if numFood <= depth:
+        upper += 500
+    upper += 200 * numGhosts * (len(capsules) + int(scared))
+    return lower, upper
+
 class MultiAgentSearchAgent(Agent):
     """
     This class provides some common elements to all of your
@@ -111,12 +145,68 @@ class MultiAgentSearchAgent(Agent):
     Note: this is an abstract class: one that should not be instantiated.  It's
     only partially specified, and designed to be extended.  Agent (game.py)
     is another abstract class.
+
+    With evalCache=N (e.g. -a evalCache=100000) leaf values are memoized in
+    an EvaluationCache of at most N states (see evaluationCache.py), which
+    also evaluates whole frontiers at once when the evaluation function has
+    a batch version in batchEvaluations.  self.leafEvaluation is always the
+    plain evaluation function.
     """
 
-    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2'):
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', timeLimit = '0', evalCache = '0'):
         self.index = 0 # Pacman is always agent index 0
-        self.evaluationFunction = util.lookup(evalFn, globals())
+        self.leafEvaluation = util.lookup(evalFn, globals())
+        self.evaluationFunction = self.leafEvaluation
+        if int(evalCache) > 0:
+            self.evaluationFunction = EvaluationCache(self.leafEvaluation, int(evalCache),
+                                                      batchEvaluations.get(self.leafEvaluation))
         self.depth = int(depth)
+        self.timeLimit = float(timeLimit)
+        self.deepening = False
+
+    def iterativeDeepening(self, gameState):
+        """
+        Anytime version of getAction, used when the agent is given a timeLimit
+        (in seconds, e.g. -a timeLimit=0.5): searches to depth 1, 2, 3, ...
+        until the time is spent and returns the action chosen by the deepest
+        search that finished.  An unfinished search is abandoned from inside
+        the evaluation function, which every leaf goes through.
+
+        Deepening stops early once a search reaches only terminal states,
+        since searching deeper cannot change its answer.  Afterwards
+        self.depth holds the depth that was completed.
+        """
+        deadline = time.time() + self.timeLimit
+        evaluate = self.evaluationFunction
+        depthLimited = [False]
+
+        def timedEvaluation(state):
+            if time.time() > deadline:
+                raise SearchTimeout()
+            if not (state.isWin() or state.isLose()):
+                depthLimited[0] = True
+            return evaluate(state)
+
+        bestAction, completed = None, 0
+        self.deepening = True
+        self.evaluationFunction = timedEvaluation
+        try:
+            while True:
+                depthLimited[0] = False
+                self.depth = completed + 1
+                action = self.getAction(gameState)
+                bestAction, completed = action, completed + 1
+                if not depthLimited[0]:
+                    break
+        except SearchTimeout:
+            pass
+        finally:
+            self.deepening = False
+            self.evaluationFunction = evaluate
+            self.depth = max(completed, 1)
+        if bestAction is None:
+            bestAction = gameState.getLegalActions(self.index)[0]
+        return bestAction
 
 class MinimaxAgent(MultiAgentSearchAgent):
     """
@@ -146,6 +236,9 @@ class MinimaxAgent(MultiAgentSearchAgent):
         gameState.isLose():
         Returns whether or not the game state is a losing state
         """
+        if self.timeLimit > 0 and not self.deepening:
+            return self.iterativeDeepening(gameState)
+
         "*** YOUR CODE HERE ***"
         depth = self.depth
         num_agents = gameState.getNumAgents()
@@ -183,16 +276,69 @@ class MinimaxAgent(MultiAgentSearchAgent):
 class AlphaBetaAgent(MultiAgentSearchAgent):
     """
     Your minimax agent with alpha-beta pruning (question 3)
+
+    Two optional enhancements are off by default (the autograder checks the
+    exact states the plain search generates):
+
+      transpositions=True  caches searched values in a TranspositionTable
+                           keyed by Zobrist hash, score and agent to move
+      ordering=True        tries table moves, killers and history-ranked
+                           moves first
+
+    e.g. python pacman.py -p AlphaBetaAgent -a depth=3,transpositions=True,ordering=True
+
+    Both are switched on when a timeLimit is given, so that each deepening
+    iteration starts from the best moves the previous one stored.
+
+    The plain search can instead split the root across worker processes
+    (see parallelSearch.py), which share alpha as they go:
+
+      jobs=4               searches Pacman's moves on 4 forked workers
+      split=ybw            searches the first move before handing out the
+                           rest (young brothers wait); split=root does not
+
+    e.g. python pacman.py -p AlphaBetaAgent -l mediumClassic -a depth=4,jobs=4
+
+    self.stats counts the successors generated ('nodes'), leaves evaluated,
+    cutoffs and table hits over the whole game.
     """
 
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', timeLimit = '0',
+                 transpositions = 'False', ordering = 'False', tableSize = '100000',
+                 jobs = '0', split = 'root', evalCache = '0'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, timeLimit, evalCache)
+        self.useTranspositions = isEnabled(transpositions) or self.timeLimit > 0
+        self.useOrdering = isEnabled(ordering) or self.timeLimit > 0
+        self.table = TranspositionTable(int(tableSize))
+        self.hasher = ZobristHasher()
+        self.moveOrdering = MoveOrdering()
+        self.stats = util.Counter()
+        self.jobs = int(jobs)
+        if split not in ('root', 'ybw'):
+            raise Exception('Unknown split ' + split + ' (use root or ybw)')
+        self.split = split
+        self.splitter = None
+
     def getAction(self, gameState):
         """
         Returns the minimax action using self.depth and self.evaluationFunction
         """
+        if self.timeLimit > 0 and not self.deepening:
+            return self.iterativeDeepening(gameState)
+
+        self.stats['moves'] += 1
+        if self.useTranspositions or self.useOrdering:
+            return self.enhancedAlphaBeta(gameState)
+        if self.jobs > 1:
+            return self.parallelAlphaBeta(gameState)
+
         "*** YOUR CODE HERE ***"
+        stats = self.stats
 
         def value(gameState, depth, a, b, index):
+            stats['nodes'] += 1
             if depth == 0 or gameState.isWin() or gameState.isLose():
+                stats['leaves'] += 1
                 return self.evaluationFunction(gameState)
             if index == 0:
                 return maxValue(gameState, depth, a, b, index)
@@ -205,6 +351,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
             for action in pac_actions:
                 v = max(v, value(gameState.generateSuccessor(0, action), depth, a, b, index+1))
                 if v > b: #prune max
+                    stats['cutoffs'] += 1
                     return v
                 a = max(a, v)
             return v
@@ -219,6 +366,7 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
                     d, i = depth, index+1
                 v = min(v, value(gameState.generateSuccessor(index, action), d, a, b, i))
                 if v < a: #prune min
+                    stats['cutoffs'] += 1
                     return v
                 b = min(b,v)
             return v
@@ -238,11 +386,152 @@ class AlphaBetaAgent(MultiAgentSearchAgent):
         chosenIndex = random.choice(bestIndices)
         return legalMoves[chosenIndex]
 
+    def parallelAlphaBeta(self, gameState):
+        """
+        The plain search with the root's moves searched on the worker pool,
+        which is started on the first call and kept until final().
+        """
+        if self.splitter is None:
+            self.splitter = parallelSearch.RootSplitter(self.jobs, self.evaluationFunction)
+        legalMoves, scores = self.splitter.search(gameState, self.depth, self.evaluationFunction,
+                                                  self.stats, self.split)
+        bestScore = max(scores)
+        bestIndices = [index for index in range(len(scores)) if scores[index] == bestScore]
+        chosenIndex = random.choice(bestIndices)
+        return legalMoves[chosenIndex]
+
+    def final(self, gameState):
+        if self.splitter is not None:
+            self.splitter.close()
+            self.splitter = None
+
+    def enhancedAlphaBeta(self, gameState):
+        """
+        Alpha-beta over the same tree as getAction, with the transposition
+        table and/or move ordering switched on.
+        """
+        numAgents = gameState.getNumAgents()
+        table, hasher, ordering, stats = self.table, self.hasher, self.moveOrdering, self.stats
+        useTable, useOrdering = self.useTranspositions, self.useOrdering
+        if not self.deepening:
+            ordering.clear()
+
+        def value(gameState, h, depth, a, b, index, ply):
+            if depth == 0 or gameState.isWin() or gameState.isLose():
+                stats['leaves'] += 1
+                return self.evaluationFunction(gameState), None
+
+            key = (h, index, gameState.getScore())
+            bestAction = None
+            if useTable:
+                entry = table.lookup(key)
+                if entry is not None:
+                    entryDepth, entryValue, flag, bestAction = entry
+                    if entryDepth >= depth:
+                        if flag == TranspositionTable.EXACT:
+                            stats['tableHits'] += 1
+                            return entryValue, bestAction
+                        if flag == TranspositionTable.LOWERBOUND:
+                            a = max(a, entryValue)
+                        else:
+                            b = min(b, entryValue)
+                        if a >= b:
+                            stats['tableHits'] += 1
+                            return entryValue, bestAction
+            alpha, beta = a, b
+
+            actions = gameState.getLegalActions(index)
+            if useOrdering:
+                actions = ordering.order(actions, index, ply, bestAction)
+            if index == numAgents - 1:
+                nextDepth, nextIndex = depth - 1, 0
+            else:
+                nextDepth, nextIndex = depth, index + 1
+
+            maximizing = index == 0
+            v = -float("inf") if maximizing else float("inf")
+            for action in actions:
+                successor = gameState.generateSuccessor(index, action)
+                stats['nodes'] += 1
+                childHash = hasher.successorHash(h, gameState, successor) if useTable else None
+                childValue, _ = value(successor, childHash, nextDepth, a, b, nextIndex, ply + 1)
+                if (maximizing and childValue > v) or (not maximizing and childValue < v):
+                    v, bestAction = childValue, action
+                if maximizing:
+                    a = max(a, v)
+                else:
+                    b = min(b, v)
+                if a >= b:
+                    stats['cutoffs'] += 1
+                    if useOrdering:
+                        ordering.recordCutoff(action, index, ply, depth)
+                    break
+
+            if useTable:
+                if v <= alpha:
+                    flag = TranspositionTable.UPPERBOUND
+                elif v >= beta:
+                    flag = TranspositionTable.LOWERBOUND
+                else:
+                    flag = TranspositionTable.EXACT
+                table.store(key, depth, v, flag, bestAction)
+            return v, bestAction
+
+        h = hasher.hash(gameState) if self.useTranspositions else None
+        _, action = value(gameState, h, self.depth, -float("inf"), float("inf"), 0, 0)
+        return action
+
 class ExpectimaxAgent(MultiAgentSearchAgent):
     """
       Your expectimax agent (question 4)
+
+    Two optional enhancements are off by default (the autograder checks the
+    exact states the plain search generates):
+
+      pruning=star1|star2  skips ghost replies that cannot change a chance
+                           node's average enough to matter, using bounds on
+                           the evaluation function (Ballard's Star1; Star2
+                           first probes one Pacman move below each reply)
+      caching=True         caches chance-node values in a TranspositionTable
+                           keyed by Zobrist hash, score and depth
+
+    With an EvaluationCache (evalCache=N) leaf values are memoized.  If
+    neither enhancement is on, the last round of moves is also expanded
+    whole and its leaves evaluated in one batch; that path has no windows
+    or table, so with pruning or caching the leaves are looked up one at a
+    time instead.
+
+    e.g. python pacman.py -p ExpectimaxAgent -l smallClassic -a depth=3,pruning=star2,caching=True
+
+    Pruning needs lower <= evaluation <= upper at every leaf.  For
+    scoreEvaluationFunction the bounds are worked out from the root state
+    (scoreEvaluationBounds); other evaluation functions must be given them,
+    e.g. -a evalFn=myEvaluation,pruning=star1,lower=-1000,upper=1000.  With
+    valid bounds both enhancements return the plain search's action.
+
+    self.stats counts the successors generated ('nodes'), leaves evaluated,
+    cutoffs, Star2 probes and table hits over the whole game.
     """
 
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '2', timeLimit = '0',
+                 pruning = 'False', caching = 'False', lower = None, upper = None,
+                 tableSize = '100000', evalCache = '0'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth, timeLimit, evalCache)
+        pruning = str(pruning).lower()
+        if pruning in ('star1', 'star2'):
+            self.pruning = pruning
+        else:
+            self.pruning = 'star1' if isEnabled(pruning) else None
+        self.useCaching = isEnabled(caching)
+        if (lower is None) != (upper is None):
+            raise Exception('Give both lower and upper evaluation bounds, or neither')
+        self.bounds = None if lower is None else (float(lower), float(upper))
+        if self.pruning and self.bounds is None and self.leafEvaluation is not scoreEvaluationFunction:
+            raise Exception('Pruning with ' + evalFn + ' needs lower and upper evaluation bounds')
+        self.table = TranspositionTable(int(tableSize))
+        self.hasher = ZobristHasher()
+        self.stats = util.Counter()
+
     def getAction(self, gameState):
         """
         Returns the expectimax action using self.depth and self.evaluationFunction
@@ -250,14 +539,24 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
         All ghosts should be modeled as choosing uniformly at random from their
         legal moves.
         """
+        if self.timeLimit > 0 and not self.deepening:
+            return self.iterativeDeepening(gameState)
+
+        self.stats['moves'] += 1
+        if self.pruning or self.useCaching or isinstance(self.evaluationFunction, EvaluationCache):
+            return self.boundedExpectimax(gameState)
+
         "*** YOUR CODE HERE ***"
         depth = self.depth
         num_agents = gameState.getNumAgents()
         agentindex = -1
 
+        stats = self.stats
+
         def value(gameState, agentindex, depth):
             agentindex = (agentindex + 1) % num_agents
             if gameState.isLose() or gameState.isWin() or depth == 0:
+                stats['leaves'] += 1
                 return self.evaluationFunction(gameState), None
             elif agentindex == 0:
                 return max_value(gameState, agentindex, depth)
@@ -270,6 +569,7 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             for x in pac_actions:
                 val, _ = value(gameState.generateSuccessor(agentindex, x), agentindex, depth - 1)
                 list_of_actions.append((val, x))
+            stats['nodes'] += len(pac_actions)
             return max(list_of_actions, key = lambda y: y[0])
         
         def exp_value(gameState, agentindex, depth):
@@ -278,11 +578,276 @@ class ExpectimaxAgent(MultiAgentSearchAgent):
             for x in ghost_actions:
                 val, _ = value(gameState.generateSuccessor(agentindex, x), agentindex, depth - 1)
                 list_of_actions.append((val, x))
+            stats['nodes'] += len(ghost_actions)
             return sum(i for i, _ in list_of_actions)/len(ghost_actions)
 
         _val, action = value(gameState, agentindex, num_agents*depth)
         return action
 
+    def boundedExpectimax(self, gameState):
+        """
+        Expectimax over the same tree as getAction, searched with (alpha, beta)
+        windows so that pruning can stop a chance node once its average is
+        known to fall outside the window.  Values strictly inside a node's
+        window are exact; values outside it are bounds, as in alpha-beta.
+
+        At a chance node with n replies, after the first i have been searched
+        the average is at least (sum so far + remaining lower bounds) / n and
+        at most (sum so far + remaining upper bounds) / n, which gives each
+        reply the window it must land in for the search to continue.  The
+        lower bound of a reply is the evaluation bound, or under Star2 the
+        value of Pacman's first move after it.
+        """
+        numAgents = gameState.getNumAgents()
+        evaluate, stats, table, hasher = self.evaluationFunction, self.stats, self.table, self.hasher
+        useTable = self.useCaching
+        inf = float("inf")
+        if self.pruning:
+            lower, upper = self.bounds or scoreEvaluationBounds(gameState, self.depth)
+        else:
+            lower, upper = -inf, inf
+        probing = self.pruning == 'star2'
+        # Batching the last round skips the windows and the table, so it is
+        # only worth it when neither is in use
+        evaluateAll = None
+        if not self.pruning and not useTable:
+            evaluateAll = getattr(evaluate, 'evaluateAll', None)
+
+        def successor(gameState, h, index, action):
+            child = gameState.generateSuccessor(index, action)
+            stats['nodes'] += 1
+            return child, hasher.successorHash(h, gameState, child) if useTable else None
+
+        def value(gameState, h, depth, index, a, b):
+            if gameState.isLose() or gameState.isWin() or depth == 0:
+                stats['leaves'] += 1
+                return evaluate(gameState)
+            if evaluateAll is not None and depth <= numAgents:
+                return lastRound(gameState, depth, index)
+            if index == 0:
+                return maxValue(gameState, h, depth, a, b)
+            return chanceValue(gameState, h, depth, index, a, b)
+
+        def lastRound(gameState, depth, index):
+            """
+            The exact value of a node less than a round from the leaves: its
+            whole subtree is generated, every leaf is evaluated in one batch,
+            and the values are folded back up without pruning.
+            """
+            leaves = []
+
+            def expand(gameState, depth, index):
+                if gameState.isLose() or gameState.isWin() or depth == 0:
+                    leaves.append(gameState)
+                    return len(leaves) - 1
+                children = []
+                for action in gameState.getLegalActions(index):
+                    child = gameState.generateSuccessor(index, action)
+                    stats['nodes'] += 1
+                    children.append(expand(child, depth - 1, (index + 1) % numAgents))
+                return (index, children)
+
+            def fold(tree):
+                if not isinstance(tree, tuple):
+                    return values[tree]
+                index, children = tree
+                childValues = [fold(child) for child in children]
+                if index == 0:
+                    return max(childValues)
+                return sum(childValues) / len(childValues)
+
+            tree = expand(gameState, depth, index)
+            values = evaluateAll(leaves)
+            stats['leaves'] += len(leaves)
+            return fold(tree)
+
+        def maxValue(gameState, h, depth, a, b, firstValue=None):
+            "firstValue, if known, is the exact value of the first action."
+            v = -inf
+            for i, action in enumerate(gameState.getLegalActions(0)):
+                if i == 0 and firstValue is not None:
+                    childValue = firstValue
+                else:
+                    child, childHash = successor(gameState, h, 0, action)
+                    childValue = value(child, childHash, depth - 1, 1 % numAgents, max(a, v), b)
+                if childValue > v:
+                    v = childValue
+                    if v >= b:
+                        stats['cutoffs'] += 1
+                        return v
+            return v
+
+        def probe(gameState, h, depth, b):
+            """
+            A lower bound on a max node: the value of its first action, or of
+            the node itself at a leaf.  Returns (bound, isLeaf, isExact),
+            where isExact says the first action's value is not just a bound.
+            """
+            stats['probes'] += 1
+            if gameState.isLose() or gameState.isWin() or depth == 0:
+                return value(gameState, h, depth, 0, -inf, inf), True, True
+            action = gameState.getLegalActions(0)[0]
+            child, childHash = successor(gameState, h, 0, action)
+            bound = value(child, childHash, depth - 1, 1 % numAgents, -inf, b)
+            return bound, False, bound < b
+
+        def chanceValue(gameState, h, depth, index, a, b):
+            if useTable:
+                key = (h, index, gameState.getScore(), depth)
+                entry = table.lookup(key)
+                if entry is not None:
+                    _, entryValue, flag, _ = entry
+                    if (flag == TranspositionTable.EXACT or
+                            (flag == TranspositionTable.LOWERBOUND and entryValue >= b) or
+                            (flag == TranspositionTable.UPPERBOUND and entryValue <= a)):
+                        stats['tableHits'] += 1
+                        return entryValue
+
+            actions = gameState.getLegalActions(index)
+            n = len(actions)
+            nextIndex = (index + 1) % numAgents
+            children = [None] * n
+            lowerBounds = [lower] * n
+            exact = [None] * n       # values of leaf replies
+            firstValues = [None] * n # values of Pacman's first move after a reply
+
+            v, flag = None, TranspositionTable.EXACT
+            if probing and nextIndex == 0:
+                lowerSum = lower * n
+                for i in range(n):
+                    children[i] = successor(gameState, h, index, actions[i])
+                    child, childHash = children[i]
+                    bound, isLeaf, isExact = probe(child, childHash, depth - 1, n * b - (lowerSum - lower))
+                    if isLeaf:
+                        exact[i] = bound
+                    elif isExact:
+                        firstValues[i] = bound
+                    if bound > lower:
+                        lowerSum += bound - lower
+                        lowerBounds[i] = bound
+                    if lowerSum / n >= b:
+                        stats['cutoffs'] += 1
+                        v, flag = max(lowerSum / n, b), TranspositionTable.LOWERBOUND
+                        break
+
+            if v is None:
+                total = 0
+                lowerRest, upperRest = sum(lowerBounds), upper * n
+                for i in range(n):
+                    if self.pruning:
+                        lowerRest -= lowerBounds[i]
+                        upperRest -= upper
+                        childA = n * a - total - upperRest
+                        childB = n * b - total - lowerRest
+                    else:
+                        childA, childB = -inf, inf
+                    if exact[i] is not None:
+                        childValue = exact[i]
+                    else:
+                        if children[i] is None:
+                            children[i] = successor(gameState, h, index, actions[i])
+                        child, childHash = children[i]
+                        if firstValues[i] is not None:
+                            childValue = maxValue(child, childHash, depth - 1, childA, childB, firstValues[i])
+                        else:
+                            childValue = value(child, childHash, depth - 1, nextIndex, childA, childB)
+                    if self.pruning and childValue <= childA:
+                        stats['cutoffs'] += 1
+                        v, flag = min((total + childValue + upperRest) / n, a), TranspositionTable.UPPERBOUND
+                        break
+                    if self.pruning and childValue >= childB:
+                        stats['cutoffs'] += 1
+                        v, flag = max((total + childValue + lowerRest) / n, b), TranspositionTable.LOWERBOUND
+                        break
+                    total += childValue
+                else:
+                    v = total / n
+
+            if useTable:
+                table.store(key, depth, v, flag, None)
+            return v
+
+        h = hasher.hash(gameState) if useTable else None
+        bestValue, bestAction = -inf, None
+        for action in gameState.getLegalActions(0):
+            child, childHash = successor(gameState, h, 0, action)
+            childValue = value(child, childHash, numAgents * self.depth - 1, 1 % numAgents, bestValue, inf)
+            if bestAction is None or childValue > bestValue:
+                bestValue, bestAction = childValue, action
+        return bestAction
+
+class MonteCarloAgent(MultiAgentSearchAgent):
+    """
+    A Monte Carlo tree search (UCT) agent; see monteCarloSearch.py.
+
+    Its cost grows with the budget rather than with the number of ghosts:
+
+      iterations=200     playouts per move
+      milliseconds=0     or a time budget per move (both may be given; the
+                         first one reached ends the search)
+      depth=10           Pacman moves per playout below the tree
+      ghosts=random      ghost model: random (RandomGhost) or directional
+                         (DirectionalGhost)
+      rollout=random     playout policy: random, greedy, or the dotted name
+                         of any function (rules, state, actions) -> action
+      exploration=1.4    UCT exploration constant
+
+    e.g. python pacman.py -p MonteCarloAgent -l mediumClassic -a milliseconds=100,rollout=greedy
+
+    Leaves are scored with evalFn.  scoreEvaluationFunction is read straight
+    off the CompactState; any other one is handed an equal GameState.
+
+    self.stats counts iterations, successors generated ('nodes'), playout
+    steps and search time over a game, and final() reports them.
+    """
+
+    def __init__(self, evalFn = 'scoreEvaluationFunction', depth = '10', iterations = '200',
+                 milliseconds = '0', ghosts = 'random', rollout = 'random', exploration = '1.4'):
+        MultiAgentSearchAgent.__init__(self, evalFn, depth)
+        self.iterations = int(iterations)
+        self.seconds = float(milliseconds) / 1000.0
+        ghostTypes = {'random': RandomGhost, 'directional': DirectionalGhost}
+        if ghosts not in ghostTypes:
+            raise Exception('Unknown ghost model ' + ghosts + ' (use random or directional)')
+        self.ghostType = ghostTypes[ghosts]
+        self.rollout = monteCarloSearch.ROLLOUT_POLICIES.get(rollout) or util.lookup(rollout, globals())
+        self.exploration = float(exploration)
+        self.rules = None
+        self.stats = util.Counter()
+
+    def registerInitialState(self, gameState):
+        self.rules = CompactRules(gameState)
+        self.stats = util.Counter()
+        self.ghosts = [self.ghostType(i) for i in range(1, gameState.getNumAgents())]
+
+    def getAction(self, gameState):
+        """
+        Returns the most visited action after searching for the agent's budget.
+        """
+        if self.rules is None or self.rules.walls is not gameState.getWalls():
+            self.registerInitialState(gameState)
+        rules = self.rules
+        if self.evaluationFunction is scoreEvaluationFunction:
+            evaluate = lambda state: state.score
+        else:
+            evaluate = lambda state: self.evaluationFunction(rules.toGameState(state))
+
+        start = time.time()
+        tree = monteCarloSearch.MonteCarloTree(rules, rules.fromGameState(gameState), self.ghosts,
+                                               evaluate, self.rollout, self.depth, self.exploration,
+                                               self.stats)
+        action = tree.search(self.iterations, self.seconds)
+        self.stats['seconds'] += time.time() - start
+        self.stats['moves'] += 1
+        return action
+
+    def final(self, gameState):
+        stats = self.stats
+        if stats['seconds'] > 0:
+            print('MonteCarloAgent: %d playouts in %.1fs (%.0f playouts/sec, %.0f successors/sec, %.1f per move)' % (
+                stats['iterations'], stats['seconds'], stats['iterations'] / stats['seconds'],
+                stats['nodes'] / stats['seconds'], stats['iterations'] / float(max(stats['moves'], 1))))
+
 def betterEvaluationFunction(currentGameState):
     """
     Your extreme ghost-hunting, pellet-nabbing, food-gobbling, unstoppable
@@ -316,6 +881,25 @@ def betterEvaluationFunction(currentGameState):
 
 
 
+def scoreEvaluationBatch(features):
+    "scoreEvaluationFunction over the LeafFeatures of many states."
+    return features.scores
+
+def betterEvaluationBatch(features):
+    "betterEvaluationFunction over the LeafFeatures of many states."
+    distToGhost = numpy.abs(features.ghosts - features.pacman[:, None, :]).sum(axis=2)
+    minDistToGhost = distToGhost.min(axis=1)
+    minScaredTime = features.scaredTimers.min(axis=1)
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        values = (features.scores - 0.5 * features.foodDistance + 0.75 * minScaredTime / minDistToGhost
+                  + 0.5 * numpy.minimum(minDistToGhost, 10))
+    values[features.losses] = -float("inf")
+    values[features.wins] = float("inf")
+    return values
+
+# Batch versions of evaluation functions, used by EvaluationCache.evaluateAll
+batchEvaluations = {scoreEvaluationFunction: scoreEvaluationBatch,
+                    betterEvaluationFunction: betterEvaluationBatch}
 
 # Abbreviation
 better = betterEvaluationFunction
@@ -0,0 +1,265 @@
+# multiagentBenchmark.py
+# ----------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Compares the search effort of differently configured adversarial agents on
+the same positions.  The first configuration plays a short game against
+seeded random ghosts; at every Pacman turn each configuration is asked for a
+move from the current state, and the script reports the successors each one
+generated ('nodes'), its transposition-table hits, how many of its moves
+matched the first configuration's and its total time:
+
+> python multiagentBenchmark.py
+> python multiagentBenchmark.py -l trickyClassic -d 3 -m 20
+
+With -x the configurations are ExpectimaxAgents with and without Star1/Star2
+pruning and chance-node caching, which must all choose the same moves:
+
+> python multiagentBenchmark.py -x -l smallClassic -d 3
+
+With -e they are ExpectimaxAgents with betterEvaluationFunction, with and
+without an EvaluationCache (memoized, batched leaf evaluation); the
+'evalHits' column is the cache's hit rate:
+
+> python multiagentBenchmark.py -e -l mediumClassic -d 3
+
+With -s it instead measures how many successors per second random playouts
+generate with GameStates (with and without GameState.explored tracking) and
+with the CompactStates of compactState.py:
+
+> python multiagentBenchmark.py -s 20000
+
+With -t it measures the game framework's own cost per turn: the time to
+deep-copy a GameState (Game.run hands each agent a deep copy every turn) and
+the time per move of whole games between trivial agents:
+
+> python multiagentBenchmark.py -t 2000 -l originalClassic
+"""
+
+import random
+import sys
+import time
+
+import layout
+import pacman
+import ghostAgents
+import multiAgents
+import pacmanAgents
+import textDisplay
+from compactState import CompactRules
+
+LAYOUTS = ['minimaxClassic', 'smallClassic', 'trickyClassic']
+
+# name -> (agent class, agent options); the first one drives the game
+CONFIGURATIONS = [
+    ('alphabeta', 'AlphaBetaAgent', {}),
+    ('+table', 'AlphaBetaAgent', {'transpositions': 'True'}),
+    ('+ordering', 'AlphaBetaAgent', {'ordering': 'True'}),
+    ('+both', 'AlphaBetaAgent', {'transpositions': 'True', 'ordering': 'True'}),
+]
+
+EXPECTIMAX_CONFIGURATIONS = [
+    ('expectimax', 'ExpectimaxAgent', {}),
+    ('+star1', 'ExpectimaxAgent', {'pruning': 'star1'}),
+    ('+star2', 'ExpectimaxAgent', {'pruning': 'star2'}),
+    ('+cache', 'ExpectimaxAgent', {'caching': 'True'}),
+    ('+star1+cache', 'ExpectimaxAgent', {'pruning': 'star1', 'caching': 'True'}),
+]
+
+EVALUATION_CONFIGURATIONS = [
+    ('expectimax', 'ExpectimaxAgent', {'evalFn': 'better'}),
+    ('+evalCache', 'ExpectimaxAgent', {'evalFn': 'better', 'evalCache': '100000'}),
+    ('+cache', 'ExpectimaxAgent', {'evalFn': 'better', 'caching': 'True'}),
+    ('+both', 'ExpectimaxAgent', {'evalFn': 'better', 'caching': 'True', 'evalCache': '100000'}),
+]
+
+def startState(lay):
+    state = pacman.GameState()
+    state.initialize(lay, lay.getNumGhosts())
+    return state
+
+def makeAgents(configurations, depth):
+    agents = []
+    for name, agentType, options in configurations:
+        opts = dict(options)
+        opts['depth'] = str(depth)
+        agents.append((name, getattr(multiAgents, agentType)(**opts)))
+    return agents
+
+def benchmarkLayout(lay, configurations, depth, moves, seed=0):
+    """
+    Plays up to 'moves' Pacman turns and returns, per configuration, the
+    accumulated (nodes, tableHits, seconds, moves agreeing with the first,
+    evaluation cache hit rate or None).
+    """
+    random.seed(seed)
+    state = startState(lay)
+    agents = makeAgents(configurations, depth)
+    ghosts = [ghostAgents.RandomGhost(i) for i in range(1, state.getNumAgents())]
+    times = dict((name, 0.0) for name, _ in agents)
+    agreed = dict((name, 0) for name, _ in agents)
+    for turn in range(moves):
+        if state.isWin() or state.isLose(): break
+        chosen = None
+        for name, agent in agents:
+            start = time.perf_counter()
+            action = agent.getAction(state)
+            times[name] += time.perf_counter() - start
+            if chosen is None: chosen = action
+            if action == chosen: agreed[name] += 1
+        state = state.generateSuccessor(0, chosen)
+        for ghost in ghosts:
+            if state.isWin() or state.isLose(): break
+            state = state.generateSuccessor(ghost.index, ghost.getAction(state))
+    return [(name, agent.stats['nodes'], agent.stats['tableHits'], times[name], agreed[name],
+             evaluationHitRate(agent)) for name, agent in agents]
+
+def evaluationHitRate(agent):
+    "The hit rate of the agent's EvaluationCache, or None if it has none."
+    hitRate = getattr(agent.evaluationFunction, 'hitRate', None)
+    return hitRate() if hitRate is not None else None
+
+def runBenchmark(layoutNames, configurations, depth, moves, out=sys.stdout):
+    rows = []
+    print('%-16s %-12s %10s %10s %9s %6s %8s %10s' % ('layout', 'agent', 'nodes', 'tableHits',
+                                                      'vs first', 'same', 'evalHits', 'time(s)'), file=out)
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        if lay is None:
+            raise Exception('The layout ' + layoutName + ' cannot be found')
+        results = benchmarkLayout(lay, configurations, depth, moves)
+        baseline = float(max(results[0][1], 1))
+        for name, nodes, hits, seconds, agreed, hitRate in results:
+            evalHits = '-' if hitRate is None else '%.1f%%' % (100 * hitRate)
+            row = (layoutName, name, nodes, hits, nodes / baseline, agreed, evalHits, seconds)
+            print('%-16s %-12s %10d %10d %8.2fx %6d %8s %10.2f' % row, file=out)
+            rows.append(row)
+    return rows
+
+def playoutRate(state, getLegalActions, generateSuccessor, isTerminal, numAgents, steps, seed=0):
+    "Generates 'steps' successors along random playouts from state; returns successors/sec."
+    random.seed(seed)
+    current, agentIndex = state, 0
+    start = time.perf_counter()
+    for step in range(steps):
+        if isTerminal(current):
+            current, agentIndex = state, 0
+        action = random.choice(getLegalActions(current, agentIndex))
+        current = generateSuccessor(current, agentIndex, action)
+        agentIndex = (agentIndex + 1) % numAgents
+    return steps / (time.perf_counter() - start)
+
+def successorBenchmark(layoutNames, steps, out=sys.stdout):
+    rows = []
+    print('%-16s %-18s %12s %9s' % ('layout', 'state', 'succ/sec', 'vs first'), file=out)
+    tracking = pacman.GameState.trackExplored
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        if lay is None:
+            raise Exception('The layout ' + layoutName + ' cannot be found')
+        state = startState(lay)
+        rules = CompactRules(state)
+        gameStateArgs = (state, lambda s, i: s.getLegalActions(i),
+                         lambda s, i, a: s.generateSuccessor(i, a),
+                         lambda s: s.isWin() or s.isLose(), state.getNumAgents(), steps)
+        results = []
+        try:
+            for name, track in (('GameState+explored', True), ('GameState', False)):
+                pacman.GameState.trackExplored = track
+                results.append((name, playoutRate(*gameStateArgs)))
+                pacman.GameState.getAndResetExplored()
+        finally:
+            pacman.GameState.trackExplored = tracking
+        results.append(('CompactState', playoutRate(rules.fromGameState(state), rules.getLegalActions,
+                                                    rules.generateSuccessor, lambda s: s.win or s.lose,
+                                                    rules.numAgents, steps)))
+        for name, rate in results:
+            row = (layoutName, name, rate, rate / results[0][1])
+            print('%-16s %-18s %12.0f %8.2fx' % row, file=out)
+            rows.append(row)
+    return rows
+
+def turnOverhead(lay, turns, seed=0):
+    """
+    Returns the seconds per GameState.deepCopy and per move of games in which
+    a LeftTurnAgent plays RandomGhosts for about 'turns' moves in total.
+    """
+    state = startState(lay)
+    start = time.perf_counter()
+    for i in range(turns):
+        state.deepCopy()
+    perCopy = (time.perf_counter() - start) / turns
+
+    random.seed(seed)
+    rules = pacman.ClassicGameRules()
+    ghosts = [ghostAgents.RandomGhost(i + 1) for i in range(lay.getNumGhosts())]
+    moves, elapsed = 0, 0.0
+    while moves < turns:
+        game = rules.newGame(lay, pacmanAgents.LeftTurnAgent(), ghosts,
+                             textDisplay.NullGraphics(), True)
+        start = time.perf_counter()
+        game.run()
+        elapsed += time.perf_counter() - start
+        moves += len(game.moveHistory)
+    return perCopy, elapsed / moves
+
+def turnBenchmark(layoutNames, turns, out=sys.stdout):
+    rows = []
+    print('%-16s %14s %14s' % ('layout', 'deepCopy(us)', 'per move(us)'), file=out)
+    for layoutName in layoutNames:
+        lay = layout.getLayout(layoutName)
+        if lay is None:
+            raise Exception('The layout ' + layoutName + ' cannot be found')
+        perCopy, perMove = turnOverhead(lay, turns)
+        row = (layoutName, perCopy * 1e6, perMove * 1e6)
+        print('%-16s %14.1f %14.1f' % row, file=out)
+        rows.append(row)
+    return rows
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python multiagentBenchmark.py <options>')
+    parser.add_option('-l', '--layouts', dest='layouts', default=','.join(LAYOUTS),
+                      help='comma separated layouts (default: %default)')
+    parser.add_option('-d', '--depth', dest='depth', type='int', default=2,
+                      help='search depth (default: %default)')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=10,
+                      help='Pacman turns to play per layout (default: %default)')
+    parser.add_option('-s', '--successors', dest='successors', type='int', default=0,
+                      help='time this many random-playout successors per state type instead')
+    parser.add_option('-t', '--turns', dest='turns', type='int', default=0,
+                      help='time this many state copies and game moves instead')
+    parser.add_option('-x', '--expectimax', dest='expectimax', action='store_true', default=False,
+                      help='compare the ExpectimaxAgent configurations instead of AlphaBetaAgent')
+    parser.add_option('-e', '--evaluation', dest='evaluation', action='store_true', default=False,
+                      help='compare evaluation caching configurations instead of AlphaBetaAgent')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    configurations = CONFIGURATIONS
+    if options.expectimax:
+        configurations = EXPECTIMAX_CONFIGURATIONS
+    elif options.evaluation:
+        configurations = EVALUATION_CONFIGURATIONS
+    return (options.layouts.split(','), options.depth, options.moves, options.successors,
+            options.turns, configurations)
+
+if __name__ == '__main__':
+    layoutNames, depth, moves, successors, turns, configurations = readCommand(sys.argv[1:])
+    if successors > 0:
+        successorBenchmark(layoutNames, successors)
+    elif turns > 0:
+        turnBenchmark(layoutNames, turns)
+    else:
+        runBenchmark(layoutNames, configurations, depth, moves)
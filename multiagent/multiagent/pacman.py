@@ -79,6 +79,8 @@ class GameState:
 
     # static variable keeps track of which states have had getLegalActions called
     explored = set()
+    # set to False to skip that bookkeeping when nobody reads it
+    trackExplored = True
 
     def getAndResetExplored():
         tmp = GameState.explored.copy()
@@ -129,8 +131,9 @@ class GameState:
         # Book keeping
         state.data._agentMoved = agentIndex
         state.data.score += state.data.scoreChange
-        GameState.explored.add(self)
-        GameState.explored.add(state)
+        if GameState.trackExplored:
+            GameState.explored.add(self)
+            GameState.explored.add(state)
         return state
 
     def getLegalPacmanActions(self):
@@ -183,7 +186,7 @@ class GameState:
         return self.data.capsules
 
     def getNumFood(self):
-        return self.data.food.count()
+        return self.data.numFood
 
     def getFood(self):
         """
@@ -379,17 +382,14 @@ class PacmanRules:
         # Eat food
         if state.data.food[x][y]:
             state.data.scoreChange += 10
-            state.data.food = state.data.food.copy()
-            state.data.food[x][y] = False
+            state.data.removeFood(x, y)
             state.data._foodEaten = position
-            # TODO: cache numFood?
-            numFood = state.getNumFood()
-            if numFood == 0 and not state.data._lose:
+            if state.data.numFood == 0 and not state.data._lose:
                 state.data.scoreChange += 500
                 state.data._win = True
         # Eat capsule
-        if(position in state.getCapsules()):
-            state.data.capsules.remove(position)
+        if(position in state.data.capsuleSet):
+            state.data.removeCapsule(position)
             state.data._capsuleEaten = position
             # Reset all ghosts' scared timers
             for index in range(1, len(state.data.agentStates)):
@@ -554,12 +554,19 @@ def readCommand(argv):
                       help='Turns on exception handling and timeouts during games', default=False)
     parser.add_option('--timeout', dest='timeout', type='int',
                       help=default('Maximum length of time an agent can spend computing in a single game'), default=30)
+    parser.add_option('--trackExplored', action='store_true', dest='trackExplored',
+                      help='Records every generated state in GameState.explored', default=False)
+    parser.add_option('-j', '--jobs', dest='jobs', type='int',
+                      help=default('Worker processes to play the non-training games on (0: play them here)'), default=0)
 
     options, otherjunk = parser.parse_args(argv)
     if len(otherjunk) != 0:
         raise Exception('Command line input not understood: ' + str(otherjunk))
     args = dict()
 
+    # Only the autograder reads GameState.explored
+    GameState.trackExplored = options.trackExplored
+
     # Fix the random seed
     if options.fixRandomSeed:
         random.seed('cs188')
@@ -606,6 +613,7 @@ def readCommand(argv):
     args['record'] = options.record
     args['catchExceptions'] = options.catchExceptions
     args['timeout'] = options.timeout
+    args['jobs'] = options.jobs
 
     # Special case: recorded games don't use the runGames method or args structure
     if options.gameToReplay != None:
@@ -672,14 +680,55 @@ def replayGame(layout, actions, display):
     display.finish()
 
 
-def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30):
+def recordGame(layout, game, i):
+    import time
+    import pickle
+    fname = ('recorded-game-%d' % (i + 1)) + \
+        '-'.join([str(t) for t in time.localtime()[1:6]])
+    f = open(fname, 'wb')
+    components = {'layout': layout, 'actions': game.moveHistory}
+    pickle.dump(components, f)
+    f.close()
+
+
+def runParallelGames(rules, layout, pacman, ghosts, display, indices, record, catchExceptions, jobs):
+    """
+    Plays the games with the given indices on 'jobs' worker processes (see
+    parallelGames.py) and returns them in order.  They are not displayed.
+    """
+    import __main__
+    import parallelGames
+    import textDisplay
+
+    def newGame(i):
+        return rules.newGame(layout, pacman, ghosts, textDisplay.NullGraphics(), True, catchExceptions)
+
+    agents = [pacman] + ghosts[:layout.getNumGhosts()]
+    games = {}
+    # Agents that draw through _display must not touch the real one from the workers
+    __main__.__dict__['_display'] = textDisplay.NullGraphics()
+    try:
+        for i, game in parallelGames.playGames(newGame, indices, jobs, random.getrandbits(32)):
+            game.agents, game.display, game.rules = agents, display, rules
+            if record:
+                recordGame(layout, game, i)
+            games[i] = game
+    finally:
+        __main__.__dict__['_display'] = display
+    return [games[i] for i in indices]
+
+
+def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, catchExceptions=False, timeout=30, jobs=0):
     import __main__
     __main__.__dict__['_display'] = display
 
     rules = ClassicGameRules(timeout)
     games = []
 
-    for i in range(numGames):
+    # With --jobs only the training games, which agents may learn from, are
+    # played here; the rest are handed to runParallelGames
+    numSequential = numGames if jobs <= 0 else min(numTraining, numGames)
+    for i in range(numSequential):
         beQuiet = i < numTraining
         if beQuiet:
                 # Suppress output and graphics
@@ -696,14 +745,11 @@ def runGames(layout, pacman, ghosts, display, numGames, record, numTraining=0, c
             games.append(game)
 
         if record:
-            import time
-            import pickle
-            fname = ('recorded-game-%d' % (i + 1)) + \
-                '-'.join([str(t) for t in time.localtime()[1:6]])
-            f = file(fname, 'w')
-            components = {'layout': layout, 'actions': game.moveHistory}
-            pickle.dump(components, f)
-            f.close()
+            recordGame(layout, game, i)
+
+    if numSequential < numGames:
+        games.extend(runParallelGames(rules, layout, pacman, ghosts, display,
+                                      range(numSequential, numGames), record, catchExceptions, jobs))
 
     if (numGames-numTraining) > 0:
         scores = [game.state.getScore() for game in games]
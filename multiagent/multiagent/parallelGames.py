@@ -0,0 +1,77 @@
+# parallelGames.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Plays independent games on a pool of worker processes, for the --jobs option
+of pacman.py and busters.py.
+
+Before game i is set up, the random module is seeded from (seed, i), so a
+batch plays the same games whether one job or many play it and in whatever
+order they finish.  The workers are forked, so they inherit the agents
+instead of unpickling them; only the finished Game objects travel back, with
+their agents, display and rules stripped.
+"""
+
+import multiprocessing
+import random
+import sys
+
+_newGame = None
+
+
+def gameSeed(seed, index):
+    "The random seed of game 'index' in a batch seeded with 'seed'."
+    return '%s-%d' % (seed, index)
+
+
+def _playGame(task):
+    index, seed = task
+    random.seed(gameSeed(seed, index))
+    game = _newGame(index)
+    game.run()
+    game.agents = game.display = game.rules = None
+    return index, game
+
+
+def playGames(newGame, indices, jobs, seed):
+    """
+    Plays the Game newGame(i) for each i in indices on 'jobs' processes and
+    yields (i, game) pairs as the games finish, printing a line for each.
+    The caller should reattach agents, display and rules to the games.
+    """
+    global _newGame
+    _newGame = newGame
+    indices = list(indices)
+    tasks = [(index, seed) for index in indices]
+    jobs = min(jobs, len(tasks))
+    if jobs > 1 and 'fork' not in multiprocessing.get_all_start_methods():
+        print('Parallel games need fork(); playing them one at a time', file=sys.stderr)
+        jobs = 1
+    if jobs > 1:
+        pool = multiprocessing.get_context('fork').Pool(jobs)
+        results = pool.imap_unordered(_playGame, tasks)
+    else:
+        pool = None
+        results = map(_playGame, tasks)
+
+    try:
+        for finished, (index, game) in enumerate(results):
+            print('Game %d (%d/%d done): %s, score %d' %
+                  (index + 1, finished + 1, len(tasks),
+                   ['Loss', 'Win'][int(game.state.isWin())], game.state.getScore()))
+            yield index, game
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
@@ -0,0 +1,144 @@
+# parallelSearch.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Root-split alpha-beta on a pool of worker processes, for AlphaBetaAgent's
+jobs option.
+
+Each of Pacman's moves at the root is searched by a worker.  The workers
+share the root's alpha through shared memory: when one finishes a move that
+beats it, alpha is raised at once, and every other worker reads it at each
+ghost node, so a move found to be good in one process prunes the others
+straight away.  With split='ybw' (young brothers wait) the first move is
+searched in the calling process before the rest are handed out, so that the
+workers start from a real bound rather than -infinity.
+
+The pool is forked once, when the agent first needs it, and kept for the
+rest of the game: the workers inherit the evaluation function instead of
+unpickling it, and only the root state travels to them with each task.
+
+Values at least as good as alpha are exact, as in the sequential search, so
+the set of best moves (and the move the agent picks from it) is the same.
+"""
+
+import multiprocessing
+
+_evaluate = None
+_sharedAlpha = None
+_alphaLock = None
+
+
+def alphaBetaValue(gameState, depth, a, b, index, evaluate, stats, sharedAlpha=None):
+    """
+    The alpha-beta value of gameState with agent 'index' to move, searched as
+    AlphaBetaAgent.getAction searches it.  If sharedAlpha is given, ghost
+    nodes also prune against its current value.
+    """
+    stats['nodes'] += 1
+    if depth == 0 or gameState.isWin() or gameState.isLose():
+        stats['leaves'] += 1
+        return evaluate(gameState)
+    if index == 0:
+        v = -float("inf")
+        for action in gameState.getLegalActions(0):
+            v = max(v, alphaBetaValue(gameState.generateSuccessor(0, action), depth, a, b, 1,
+                                      evaluate, stats, sharedAlpha))
+            if v > b:
+                stats['cutoffs'] += 1
+                return v
+            a = max(a, v)
+        return v
+
+    v = float("inf")
+    numAgents = gameState.getNumAgents()
+    if index == numAgents - 1:
+        nextDepth, nextIndex = depth - 1, 0
+    else:
+        nextDepth, nextIndex = depth, index + 1
+    for action in gameState.getLegalActions(index):
+        if sharedAlpha is not None:
+            a = max(a, sharedAlpha.value)
+        v = min(v, alphaBetaValue(gameState.generateSuccessor(index, action), nextDepth, a, b, nextIndex,
+                                  evaluate, stats, sharedAlpha))
+        if v < a:
+            stats['cutoffs'] += 1
+            return v
+        b = min(b, v)
+    return v
+
+
+def raiseAlpha(value):
+    "Raises the shared alpha to value if it is higher."
+    with _alphaLock:
+        if value > _sharedAlpha.value:
+            _sharedAlpha.value = value
+
+
+def _initWorker(evaluate, sharedAlpha, alphaLock):
+    global _evaluate, _sharedAlpha, _alphaLock
+    _evaluate, _sharedAlpha, _alphaLock = evaluate, sharedAlpha, alphaLock
+
+
+def _searchMove(task):
+    position, gameState, action, depth = task
+    stats = {'nodes': 0, 'leaves': 0, 'cutoffs': 0}
+    a = _sharedAlpha.value
+    v = alphaBetaValue(gameState.generateSuccessor(0, action), depth, a, float("inf"), 1,
+                       _evaluate, stats, _sharedAlpha)
+    raiseAlpha(v)
+    return position, v, stats
+
+
+class RootSplitter:
+    """
+    A persistent pool of 'jobs' forked workers that search root moves.
+    """
+
+    def __init__(self, jobs, evaluate):
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise Exception('Parallel alpha-beta needs fork()')
+        global _sharedAlpha, _alphaLock
+        context = multiprocessing.get_context('fork')
+        self.jobs = jobs
+        self.sharedAlpha = context.RawValue('d', -float("inf"))
+        self.alphaLock = context.Lock()
+        _sharedAlpha, _alphaLock = self.sharedAlpha, self.alphaLock
+        self.pool = context.Pool(jobs, _initWorker, (evaluate, self.sharedAlpha, self.alphaLock))
+
+    def search(self, gameState, depth, evaluate, stats, split='root'):
+        """
+        Returns the values of Pacman's legal moves, in order.  Moves worse
+        than the best may have only upper bounds as values.
+        """
+        actions = gameState.getLegalActions(0)
+        scores = [None] * len(actions)
+        self.sharedAlpha.value = -float("inf")
+        first = 0
+        if split == 'ybw' and len(actions) > 1:
+            # The eldest brother is searched here; the young brothers wait for its bound
+            scores[0] = alphaBetaValue(gameState.generateSuccessor(0, actions[0]), depth,
+                                       -float("inf"), float("inf"), 1, evaluate, stats)
+            self.sharedAlpha.value = scores[0]
+            first = 1
+
+        tasks = [(i, gameState, actions[i], depth) for i in range(first, len(actions))]
+        for i, v, workerStats in self.pool.imap_unordered(_searchMove, tasks):
+            scores[i] = v
+            for key, count in workerStats.items():
+                stats[key] += count
+        return actions, scores
+
+    def close(self):
+        self.pool.terminate()
+        self.pool.join()
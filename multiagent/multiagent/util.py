@@ -29,6 +29,7 @@
 import sys
 import inspect
 import heapq
+import collections
 import random
 import io
 
@@ -157,11 +158,11 @@ class Queue:
     "A container with a first-in-first-out (FIFO) queuing policy."
 
     def __init__(self):
-        self.list = []
+        self.list = collections.deque()
 
     def push(self, item):
         "Enqueue the 'item' into the queue"
-        self.list.insert(0, item)
+        self.list.appendleft(item)
 
     def pop(self):
         """
@@ -181,38 +182,64 @@ class PriorityQueue:
     has a priority associated with it and the client is usually interested
     in quick retrieval of the lowest-priority item in the queue. This
     data structure allows O(1) access to the lowest-priority item.
+
+    Items are indexed by value so that update() can lower an item's
+    priority in O(log n): the old heap entry is marked as removed and
+    skipped when it surfaces, instead of being searched for and the heap
+    rebuilt.  Duplicates pushed with push() are kept as in a plain heap and
+    update() acts on the lowest-priority copy.  Unhashable items can still
+    be pushed and popped, but cannot be updated.
     """
+    REMOVED = object()  # placeholder for an entry superseded by update()
 
     def __init__(self):
         self.heap = []
         self.count = 0
+        self.entries = {}  # item -> its lowest-priority live entry
+        self.removed = 0  # number of stale entries still in the heap
 
     def push(self, item, priority):
-        entry = (priority, self.count, item)
+        entry = [priority, self.count, item]
         heapq.heappush(self.heap, entry)
         self.count += 1
+        try:
+            best = self.entries.get(item)
+        except TypeError:
+            return  # unhashable items are not indexed
+        if best is None or priority < best[0]:
+            self.entries[item] = entry
 
     def pop(self):
-        (_, _, item) = heapq.heappop(self.heap)
+        while True:
+            entry = heapq.heappop(self.heap)
+            item = entry[2]
+            if item is not PriorityQueue.REMOVED:
+                break
+            self.removed -= 1
+        try:
+            if self.entries.get(item) is entry:
+                del self.entries[item]
+        except TypeError:
+            pass
         return item
 
     def isEmpty(self):
-        return len(self.heap) == 0
+        return len(self.heap) == self.removed
 
     def update(self, item, priority):
-        # If item already in priority queue with higher priority, update its priority and rebuild the heap.
+        # If item already in priority queue with higher priority, update its priority.
         # If item already in priority queue with equal or lower priority, do nothing.
         # If item not in priority queue, do the same thing as self.push.
-        for index, (p, c, i) in enumerate(self.heap):
-            if i == item:
-                if p <= priority:
-                    break
-                del self.heap[index]
-                self.heap.append((priority, c, item))
-                heapq.heapify(self.heap)
-                break
-        else:
+        entry = self.entries.get(item)
+        if entry is None:
             self.push(item, priority)
+        elif priority < entry[0]:
+            # Keep the original insertion count so ties still break FIFO
+            entry[2] = PriorityQueue.REMOVED
+            self.removed += 1
+            newEntry = [priority, entry[1], item]
+            heapq.heappush(self.heap, newEntry)
+            self.entries[item] = newEntry
 
 
 class PriorityQueueWithFunction(PriorityQueue):
@@ -426,6 +426,12 @@ def parseOptions():
                          help='Manually control agent')
     optParser.add_option('-v', '--valueSteps',action='store_true' ,default=False,
                          help='Display each step of value iteration')
+    optParser.add_option('--vectorized',action='store_true',
+                         dest='vectorized',default=False,
+                         help='Run value iteration as NumPy array operations (see mdpCompiler.py)')
+    optParser.add_option('--tolerance',action='store',
+                         type='float',dest='tolerance',default=0.0,
+                         help='Stop value iteration once no value changes by this much (default %default)')
 
     opts, args = optParser.parse_args()
 
@@ -482,7 +488,8 @@ if __name__ == '__main__':
     import valueIterationAgents, qlearningAgents
     a = None
     if opts.agent == 'value':
-        a = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, opts.iters)
+        a = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, opts.iters,
+                                                     opts.vectorized, opts.tolerance)
     elif opts.agent == 'q':
         #env.getPossibleActions, opts.discount, opts.learningRate, opts.epsilon
         #simulationFn = lambda agent, state: simulation.GridworldSimulation(agent,state,mdp)
@@ -526,13 +533,15 @@ if __name__ == '__main__':
         if not opts.manual and opts.agent in ('value', 'asynchvalue', 'priosweepvalue'):
             if opts.valueSteps:
                 for i in range(opts.iters):
-                    tempAgent = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, i)
+                    tempAgent = valueIterationAgents.ValueIterationAgent(mdp, opts.discount, i, opts.vectorized)
                     display.displayValues(tempAgent, message = "VALUES AFTER "+str(i)+" ITERATIONS")
                     display.pause()
 
-            display.displayValues(a, message = "VALUES AFTER "+str(opts.iters)+" ITERATIONS")
+            # A tolerance can stop value iteration early
+            iters = a.sweeps if opts.agent == 'value' else opts.iters
+            display.displayValues(a, message = "VALUES AFTER "+str(iters)+" ITERATIONS")
             display.pause()
-            display.displayQValues(a, message = "Q-VALUES AFTER "+str(opts.iters)+" ITERATIONS")
+            display.displayQValues(a, message = "Q-VALUES AFTER "+str(iters)+" ITERATIONS")
             display.pause()
     except KeyboardInterrupt:
         sys.exit(0)
@@ -0,0 +1,130 @@
+# mdpCompiler.py
+# --------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Compiles a MarkovDecisionProcess (see mdp.py) into NumPy arrays, so that
+value iteration can sweep all states at once instead of asking the mdp for
+successors and rewards state by state, sweep after sweep.
+
+Every (state, action) pair becomes a row.  Its successors are stored padded
+to the widest row (successors with probability 0 fill the gaps):
+
+  nextStates[row, j], probs[row, j], rewards[row, j]
+
+A state's rows are padded the same way to the most actions of any state
+(rowOfAction[state, k], with -1 for no action).  A sweep then computes
+
+  Q[row] = sum_j probs[row, j] * (rewards[row, j] + discount * V[nextStates[row, j]])
+
+adding the j terms in the order the mdp listed them, as
+ValueIterationAgent.computeQValueFromValues does, so the values come out
+exactly the same.
+"""
+
+import numpy as np
+
+
+class CompiledMDP:
+    """
+    The states, actions, transitions and rewards of an mdp as arrays.
+    """
+
+    def __init__(self, mdp):
+        self.mdp = mdp
+        self.states = list(mdp.getStates())
+        self.stateIndex = dict((state, i) for i, state in enumerate(self.states))
+
+        self.rows = []         # (state, action) of each row
+        actionRows = []        # row numbers of each state's actions
+        successors = []        # [(next state index, prob, reward)] of each row
+        for state in self.states:
+            rows = []
+            for action in mdp.getPossibleActions(state):
+                rows.append(len(self.rows))
+                self.rows.append((state, action))
+                successors.append([(self.stateIndex[nextState], prob,
+                                    mdp.getReward(state, action, nextState))
+                                   for nextState, prob in mdp.getTransitionStatesAndProbs(state, action)])
+            actionRows.append(rows)
+
+        numRows = len(self.rows)
+        self.numSuccessors = np.array([len(s) for s in successors], dtype=np.intp)
+        width = max([len(s) for s in successors] + [1])
+        self.nextStates = np.zeros((numRows, width), dtype=np.intp)
+        self.probs = np.zeros((numRows, width))
+        self.rewards = np.zeros((numRows, width))
+        for row, transitions in enumerate(successors):
+            for j, (nextState, prob, reward) in enumerate(transitions):
+                self.nextStates[row, j] = nextState
+                self.probs[row, j] = prob
+                self.rewards[row, j] = reward
+
+        # States without actions (e.g. TERMINAL_STATE) keep the value 0
+        self.hasActions = np.array([len(rows) > 0 for rows in actionRows], dtype=bool)
+        numActions = max([len(rows) for rows in actionRows] + [1])
+        self.rowOfAction = -np.ones((len(self.states), numActions), dtype=np.intp)
+        for i, rows in enumerate(actionRows):
+            self.rowOfAction[i, :len(rows)] = rows
+
+    def getNumStates(self):
+        return len(self.states)
+
+    def qValues(self, values, discount):
+        "Returns the Q-value of every row given a vector of state values."
+        future = self.rewards + discount * values[self.nextStates]
+        terms = self.probs * future
+        q = terms[:, 0].copy()
+        for j in range(1, terms.shape[1]):
+            q += terms[:, j]
+        return q
+
+    def bestValues(self, q):
+        "Returns the best Q-value of each state, or 0 for states without actions."
+        # rowOfAction's -1 padding picks the appended -inf
+        padded = np.append(q, -np.inf)[self.rowOfAction]
+        return np.where(self.hasActions, padded.max(axis=1), 0.0)
+
+    def denseArrays(self):
+        """
+        Returns arrays T and R indexed by [state, action slot, next state]
+        (action slots as in rowOfAction) holding the transition probabilities
+        and rewards.  They take states^2 * actions floats, so only use them for
+        small mdps.
+        """
+        shape = (len(self.states), self.rowOfAction.shape[1], len(self.states))
+        T, R = np.zeros(shape), np.zeros(shape)
+        for state, slot in zip(*np.nonzero(self.rowOfAction >= 0)):
+            row = self.rowOfAction[state, slot]
+            n = self.numSuccessors[row]
+            np.add.at(T[state, slot], self.nextStates[row, :n], self.probs[row, :n])
+            R[state, slot, self.nextStates[row, :n]] = self.rewards[row, :n]
+        return T, R
+
+    def valueIteration(self, discount, iterations, tolerance=0.0, values=None):
+        """
+        Runs up to 'iterations' batch sweeps of value iteration from 'values'
+        (all zeros by default), stopping early once no value changes by
+        'tolerance' or more.  Returns the value vector and the sweeps run.
+        """
+        if values is None:
+            values = np.zeros(len(self.states))
+        sweeps = 0
+        while sweeps < iterations:
+            newValues = self.bestValues(self.qValues(values, discount))
+            sweeps += 1
+            converged = np.max(np.abs(newValues - values), initial=0.0) < tolerance
+            values = newValues
+            if converged:
+                break
+        return values, sweeps
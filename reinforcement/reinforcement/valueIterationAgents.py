@@ -39,8 +39,12 @@ class ValueIterationAgent(ValueEstimationAgent):
         (see mdp.py) on initialization and runs value iteration
         for a given number of iterations using the supplied
         discount factor.
+
+        With vectorized=True the sweeps run as NumPy array operations over
+        the mdp compiled by mdpCompiler.py, with the same results.  Either
+        way, iteration stops early once no value changes by tolerance or more.
     """
-    def __init__(self, mdp, discount = 0.9, iterations = 100):
+    def __init__(self, mdp, discount = 0.9, iterations = 100, vectorized = False, tolerance = 0.0):
         """
           Your value iteration agent should take an mdp on
           construction, run the indicated number of iterations
@@ -56,10 +60,15 @@ class ValueIterationAgent(ValueEstimationAgent):
         self.mdp = mdp
         self.discount = discount
         self.iterations = iterations
+        self.vectorized = vectorized
+        self.tolerance = tolerance
+        self.sweeps = 0
         self.values = util.Counter() # A Counter is a dict with default 0
         self.runValueIteration()
 
     def runValueIteration(self):
+        if self.vectorized:
+          return self.runVectorizedValueIteration()
         # Write value iteration code here
         for i in range(self.iterations):
           ctr = util.Counter()
@@ -70,7 +79,22 @@ class ValueIterationAgent(ValueEstimationAgent):
               if q > max_value:
                 max_value = q
               ctr[state] = max_value
+          converged = self.tolerance > 0 and max([abs(ctr.get(s, 0) - self.values.get(s, 0))
+                                                  for s in self.mdp.getStates()] + [0]) < self.tolerance
           self.values = ctr
+          self.sweeps += 1
+          if converged:
+            break
+
+    def runVectorizedValueIteration(self):
+        import mdpCompiler
+        compiled = mdpCompiler.CompiledMDP(self.mdp)
+        values, self.sweeps = compiled.valueIteration(self.discount, self.iterations, self.tolerance)
+        self.values = util.Counter()
+        # Like the loop above, leave states without actions out of the Counter
+        for state, hasActions, value in zip(compiled.states, compiled.hasActions, values.tolist()):
+          if hasActions:
+            self.values[state] = value
 
     def getValue(self, state):
         """
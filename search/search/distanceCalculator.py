@@ -0,0 +1,285 @@
+# distanceCalculator.py
+# ---------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+# 
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+This file contains a Distancer object which computes and
+caches the shortest path between any two points in the maze. It
+returns a Manhattan distance between two points if the maze distance
+has not yet been calculated.  The distances themselves come from the
+layout-keyed MazeDistances oracle at the bottom of this file, which
+search heuristics and evaluation functions can also use directly:
+
+oracle = getMazeDistances(gameState.getWalls())
+oracle.distance( (1,1), (10,10) )
+
+Example:
+distancer = Distancer(gameState.data.layout)
+distancer.getDistance( (1,1), (10,10) )
+
+The Distancer object also serves as an example of sharing data
+safely among agents via a global dictionary (distanceMap),
+and performing asynchronous computation via threads. These
+examples may help you in designing your own objects, but you
+shouldn't need to modify the Distancer code in order to use its
+distances.
+"""
+
+import threading, sys, time, random
+import array, hashlib, os, pickle
+
+class Distancer:
+  def __init__(self, layout, background=True, default=10000):
+    """
+    Initialize with Distancer(layout).  Changing default is unnecessary.
+
+    This will start computing maze distances in the background and use them
+    as soon as they are ready.  In the meantime, it returns manhattan distance.
+
+    To compute all maze distances on initialization, set background=False
+    """
+    self._distances = None
+    self.default = default
+
+    # Start computing distances in the background; when the dc finishes,
+    # it will fill in self._distances for us.
+    dc = DistanceCalculator()
+    dc.setAttr(layout, self)
+    dc.setDaemon(True)
+    if background:
+      dc.start()
+    else:
+      dc.run()
+
+  def getDistance(self, pos1, pos2):
+    """
+    The getDistance function is the only one you'll need after you create the object.
+    """
+    if self._distances == None:
+      return manhattanDistance(pos1, pos2)
+    if isInt(pos1) and isInt(pos2):
+      return self.getDistanceOnGrid(pos1, pos2)
+    pos1Grids = getGrids2D(pos1)
+    pos2Grids = getGrids2D(pos2)
+    bestDistance = self.default
+    for pos1Snap, snap1Distance in pos1Grids:
+      for pos2Snap, snap2Distance in pos2Grids:
+        gridDistance = self.getDistanceOnGrid(pos1Snap, pos2Snap)
+        distance = gridDistance + snap1Distance + snap2Distance
+        if bestDistance > distance:
+          bestDistance = distance
+    return bestDistance
+
+  def getDistanceOnGrid(self, pos1, pos2):
+    try:
+      return self._distances.distance(pos1, pos2)
+    except KeyError:
+      raise Exception("Positions not in grid: " + str((pos1, pos2)))
+
+  def isReadyForMazeDistance(self):
+    return self._distances != None
+
+def manhattanDistance(x, y ):
+  return abs( x[0] - y[0] ) + abs( x[1] - y[1] )
+
+def isInt(pos):
+  x, y = pos
+  return x == int(x) and y == int(y)
+
+def getGrids2D(pos):
+  grids = []
+  for x, xDistance in getGrids1D(pos[0]):
+    for y, yDistance in getGrids1D(pos[1]):
+      grids.append(((x, y), xDistance + yDistance))
+  return grids
+
+def getGrids1D(x):
+  intX = int(x)
+  if x == int(x):
+    return [(x, 0)]
+  return [(intX, x-intX), (intX+1, intX+1-x)]
+
+##########################################
+# MACHINERY FOR COMPUTING MAZE DISTANCES #
+##########################################
+
+distanceMap = {}
+distanceMapSemaphore = threading.Semaphore(1)
+distanceThread = None
+
+def waitOnDistanceCalculator(t):
+  global distanceThread
+  if distanceThread != None:
+    time.sleep(t)
+
+class DistanceCalculator(threading.Thread):
+  def setAttr(self, layout, distancer, default = 10000):
+    self.layout = layout
+    self.distancer = distancer
+    self.default = default
+
+  def run(self):
+    global distanceMap, distanceThread
+    distanceMapSemaphore.acquire()
+
+    if self.layout.walls not in distanceMap:
+      if distanceThread != None: raise Exception('Multiple distance threads')
+      distanceThread = self
+
+      distances = computeDistances(self.layout)
+      print('[Distancer]: Switching to maze distances',file=sys.stdout)
+
+      distanceMap[self.layout.walls] = distances
+      distanceThread = None
+    else:
+      distances = distanceMap[self.layout.walls]
+
+    distanceMapSemaphore.release()
+    self.distancer._distances = distances
+
+def computeDistances(layout):
+    "Returns the MazeDistances oracle for a layout (see getMazeDistances)."
+    return getMazeDistances(layout.walls)
+
+
+def getDistanceOnGrid(distances, pos1, pos2):
+    try:
+      return distances.distance(pos1, pos2)
+    except KeyError:
+      return 100000
+
+###########################################
+# ALL-PAIRS MAZE DISTANCES, COMPUTED ONCE #
+###########################################
+
+UNREACHABLE = 1000000000
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mazeDistances')
+CACHE_VERSION = 1
+
+_oracles = {}
+_lastLookup = (None, None) # (walls, oracle) of the most recent lookup
+
+class MazeDistances:
+    """
+    Shortest path lengths between every pair of open cells in a maze.
+
+    Each open cell gets an integer id (its index in walls.asList(False)), and
+    the distances are kept in one flat array of ints where the distance from
+    cell i to cell j is entry i * numCells + j.  Cells that cannot reach each
+    other are UNREACHABLE apart.  Build one with getMazeDistances(walls) so
+    that every caller on the same maze shares it.
+    """
+    def __init__(self, walls, cells=None, distances=None):
+        self.width, self.height = walls.width, walls.height
+        if cells is None:
+            cells = walls.asList(False)
+        self.cells = cells
+        self.cellIds = dict((pos, i) for i, pos in enumerate(cells))
+        self.numCells = len(cells)
+        if distances is None:
+            distances = self._allPairsBFS(walls)
+        self.distances = distances
+
+    def _allPairsBFS(self, walls):
+        cellIds = self.cellIds
+        neighbors = []
+        for x, y in self.cells:
+            adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+            neighbors.append([cellIds[pos] for pos in adjacent if pos in cellIds])
+
+        distances = array.array('i')
+        for source in range(self.numCells):
+            row = [UNREACHABLE] * self.numCells
+            row[source] = 0
+            frontier = [source]
+            depth = 0
+            while frontier:
+                depth += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for other in neighbors[cell]:
+                        if row[other] == UNREACHABLE:
+                            row[other] = depth
+                            nextFrontier.append(other)
+                frontier = nextFrontier
+            distances.extend(row)
+        return distances
+
+    def cellId(self, pos):
+        "Returns the id of an open cell; raises KeyError for walls."
+        return self.cellIds[pos]
+
+    def distance(self, pos1, pos2):
+        "Returns the maze distance between two open cells in O(1), or UNREACHABLE."
+        return self.distances[self.cellIds[pos1] * self.numCells + self.cellIds[pos2]]
+
+    def distancesFrom(self, pos):
+        "Returns the row of distances from pos to every cell, indexed by cell id."
+        start = self.cellIds[pos] * self.numCells
+        return self.distances[start:start + self.numCells]
+
+def layoutKey(walls):
+    "A digest of the wall layout, used to share oracles in memory and on disk."
+    text = '%d %d\n%s' % (walls.width, walls.height, str(walls))
+    return hashlib.sha1(text.encode('ascii')).hexdigest()
+
+def getMazeDistances(walls, useDiskCache=True):
+    """
+    Returns the MazeDistances oracle for the maze with the given walls.
+
+    Oracles are kept in memory for the life of the process and, unless
+    useDiskCache is False, pickled under CACHE_DIR keyed by layoutKey(walls)
+    so that later runs on the same layout skip the BFS entirely.
+    """
+    global _lastLookup
+    if _lastLookup[0] is walls:
+        return _lastLookup[1]
+    key = layoutKey(walls)
+    if key in _oracles:
+        _lastLookup = (walls, _oracles[key])
+        return _oracles[key]
+    oracle = None
+    if useDiskCache:
+        oracle = _loadOracle(key, walls)
+    if oracle is None:
+        oracle = MazeDistances(walls)
+        if useDiskCache:
+            _saveOracle(key, oracle)
+    _oracles[key] = oracle
+    _lastLookup = (walls, oracle)
+    return oracle
+
+def _cachePath(key):
+    return os.path.join(CACHE_DIR, key + '.pickle')
+
+def _loadOracle(key, walls):
+    try:
+        with open(_cachePath(key), 'rb') as f:
+            version, cells, distances = pickle.load(f)
+    except (IOError, OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if version != CACHE_VERSION or len(distances) != len(cells) ** 2:
+        return None
+    return MazeDistances(walls, cells, distances)
+
+def _saveOracle(key, oracle):
+    # The cache is only an optimisation: failing to write it is not an error.
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        tmpPath = '%s.%d.tmp' % (_cachePath(key), os.getpid())
+        with open(tmpPath, 'wb') as f:
+            pickle.dump((CACHE_VERSION, oracle.cells, oracle.distances), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, _cachePath(key))
+    except (IOError, OSError):
+        pass
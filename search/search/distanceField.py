@@ -0,0 +1,141 @@
+# distanceField.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Breadth-first distance fields over a maze, for agents that repeatedly head
+for the closest of a set of targets (see ClosestDotSearchAgent).
+
+A DistanceField numbers the open cells of a maze once and keeps, for every
+cell, its neighbours in the order PositionSearchProblem generates them
+(North, South, East, West); 'moves' holds the same table by position, for
+PositionSearchProblem.getSuccessors.  Each sweep from a new source reuses the same
+arrays, telling stale entries apart by a sweep counter instead of clearing
+them, and stops as soon as it reaches a target.  Ties are broken exactly as
+search.bfs breaks them on an AnyFoodSearchProblem, so the plans are the same.
+
+field = getDistanceField(gameState.getWalls())
+actions = field.closestPath(gameState.getPacmanPosition(), set(food.asList()))
+"""
+
+from game import Actions, Directions
+import distanceCalculator
+
+class DistanceField:
+    """
+    Reusable breadth-first search state for one maze.
+    """
+
+    def __init__(self, walls):
+        self.walls = walls
+        self.cells = walls.asList(False)
+        self.cellIds = dict((pos, i) for i, pos in enumerate(self.cells))
+        self.neighbors = []
+        for x, y in self.cells:
+            row = []
+            for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                dx, dy = Actions.directionToVector(action)
+                neighbor = (int(x + dx), int(y + dy))
+                if neighbor in self.cellIds:
+                    row.append((action, self.cellIds[neighbor]))
+            self.neighbors.append(row)
+        # The same table keyed by position, as PositionSearchProblem expands it
+        cells = self.cells
+        self.moves = dict((pos, tuple([(cells[neighbor], action) for action, neighbor in row]))
+                          for pos, row in zip(cells, self.neighbors))
+
+        numCells = len(self.cells)
+        self.distance = [0] * numCells
+        self.parent = [-1] * numCells
+        self.parentAction = [None] * numCells
+        self.sweepOf = [0] * numCells
+        self.sweep = 0
+        self.source = None
+
+    def closestPath(self, source, targets):
+        """
+        Returns the actions of a shortest path from source to the closest
+        position in targets (which must support 'in'), or None if no target
+        can be reached.  A target at the source itself is not counted.
+        """
+        self.sweep += 1
+        self.source = source
+        sweep, sweepOf = self.sweep, self.sweepOf
+        distance, parent, parentAction = self.distance, self.parent, self.parentAction
+        cells, neighbors = self.cells, self.neighbors
+
+        start = self.cellIds[source]
+        sweepOf[start] = sweep
+        distance[start] = 0
+        parent[start] = -1
+        frontier = [start]
+        while frontier:
+            nextFrontier = []
+            for cell in frontier:
+                if cell != start and cells[cell] in targets:
+                    return self.pathTo(cell)
+                for action, neighbor in neighbors[cell]:
+                    if sweepOf[neighbor] != sweep:
+                        sweepOf[neighbor] = sweep
+                        distance[neighbor] = distance[cell] + 1
+                        parent[neighbor] = cell
+                        parentAction[neighbor] = action
+                        nextFrontier.append(neighbor)
+            frontier = nextFrontier
+        return None
+
+    def distanceTo(self, pos):
+        "The distance from the last sweep's source to pos, or None if it was not reached."
+        cell = self.cellIds.get(pos)
+        if cell is None or self.sweepOf[cell] != self.sweep:
+            return None
+        return self.distance[cell]
+
+    def pathTo(self, cell):
+        "The actions from the last sweep's source to a cell it reached."
+        actions = []
+        while self.parent[cell] != -1:
+            actions.append(self.parentAction[cell])
+            cell = self.parent[cell]
+        actions.reverse()
+        return actions
+
+    def follow(self, position, actions):
+        """
+        Returns the positions visited by taking actions from position,
+        raising an Exception at the first move into a wall.
+        """
+        visited = []
+        x, y = position
+        for action in actions:
+            dx, dy = Actions.directionToVector(action)
+            nextx, nexty = int(x + dx), int(y + dy)
+            if self.walls[nextx][nexty]:
+                raise Exception('Illegal move %s from %s' % (action, str((x, y))))
+            x, y = nextx, nexty
+            visited.append((x, y))
+        return visited
+
+_fields = {}
+_lastLookup = (None, None) # (walls, field) of the most recent lookup
+
+def getDistanceField(walls):
+    "Returns the DistanceField of the maze with the given walls, shared per layout."
+    global _lastLookup
+    if _lastLookup[0] is walls:
+        return _lastLookup[1]
+    key = distanceCalculator.layoutKey(walls)
+    if key not in _fields:
+        _fields[key] = DistanceField(walls)
+    _lastLookup = (walls, _fields[key])
+    return _fields[key]
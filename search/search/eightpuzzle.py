@@ -14,6 +14,7 @@
 
 import search
 import random
+import itertools, os, pickle
 
 # Module Classes
 
@@ -46,18 +47,35 @@ class EightPuzzleState:
             | 6 | 7 | 8 |
             ------------
 
-        The configuration of the puzzle is stored in a 2-dimensional
-        list (a list of lists) 'cells'.
+        The configuration of the puzzle is packed into one int, 'board',
+        with the number in cell i (row-major) in bits 4*i to 4*i+3; the
+        2-dimensional list 'cells' is rebuilt from it on request.
         """
-        self.cells = []
-        numbers = numbers[:] # Make a copy so as not to cause side-effects.
-        numbers.reverse()
-        for row in range( 3 ):
-            self.cells.append( [] )
-            for col in range( 3 ):
-                self.cells[row].append( numbers.pop() )
-                if self.cells[row][col] == 0:
-                    self.blankLocation = row, col
+        board = 0
+        for i, number in enumerate(numbers):
+            board |= number << (4 * i)
+            if number == 0:
+                self.blankLocation = i // 3, i % 3
+        self.board = board
+
+    def _getCells( self ):
+        return [[(self.board >> (4 * (3 * row + col))) & 15 for col in range( 3 )]
+                for row in range( 3 )]
+    cells = property(_getCells, doc="The puzzle as a list of rows.")
+
+    def fromPacked( packed ):
+        "Builds an EightPuzzleState from a packed state (see packState)."
+        puzzle = EightPuzzleState.__new__(EightPuzzleState)
+        puzzle.board = packed >> 4
+        blank = packed & 15
+        puzzle.blankLocation = blank // 3, blank % 3
+        return puzzle
+    fromPacked = staticmethod(fromPacked)
+
+    def pack( self ):
+        "The puzzle as a single int (see packState)."
+        row, col = self.blankLocation
+        return (self.board << 4) | (3 * row + col)
 
     def isGoal( self ):
         """
@@ -77,13 +95,7 @@ class EightPuzzleState:
         >>> EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).isGoal()
         False
         """
-        current = 0
-        for row in range( 3 ):
-            for col in range( 3 ):
-                if current != self.cells[row][col]:
-                    return False
-                current += 1
-        return True
+        return self.board == GOAL_BOARD
 
     def legalMoves( self ):
         """
@@ -119,31 +131,9 @@ class EightPuzzleState:
         NOTE: This function *does not* change the current object.  Instead,
         it returns a new object.
         """
-        row, col = self.blankLocation
-        if(move == 'up'):
-            newrow = row - 1
-            newcol = col
-        elif(move == 'down'):
-            newrow = row + 1
-            newcol = col
-        elif(move == 'left'):
-            newrow = row
-            newcol = col - 1
-        elif(move == 'right'):
-            newrow = row
-            newcol = col + 1
-        else:
-            raise "Illegal Move"
-
-        # Create a copy of the current eightPuzzle
-        newPuzzle = EightPuzzleState([0, 0, 0, 0, 0, 0, 0, 0, 0])
-        newPuzzle.cells = [values[:] for values in self.cells]
-        # And update it to reflect the move
-        newPuzzle.cells[row][col] = self.cells[newrow][newcol]
-        newPuzzle.cells[newrow][newcol] = self.cells[row][col]
-        newPuzzle.blankLocation = newrow, newcol
-
-        return newPuzzle
+        if move not in MOVE_VECTORS:
+            raise Exception("Illegal Move")
+        return EightPuzzleState.fromPacked(packedResult(self.pack(), move))
 
     # Utilities for comparison and display
     def __eq__(self, other):
@@ -155,13 +145,10 @@ class EightPuzzleState:
               EightPuzzleState([1, 0, 2, 3, 4, 5, 6, 7, 8]).result('left')
           True
         """
-        for row in range( 3 ):
-            if self.cells[row] != other.cells[row]:
-                return False
-        return True
+        return self.board == other.board
 
     def __hash__(self):
-        return hash(str(self.cells))
+        return hash(self.board)
 
     def __getAsciiString(self):
         """
@@ -183,6 +170,57 @@ class EightPuzzleState:
     def __str__(self):
         return self.__getAsciiString()
 
+# Packed puzzles
+#
+# A packed state is the int (board << 4) | blank, where board holds the
+# number in cell i (row-major) in bits 4*i to 4*i+3 and blank is the
+# blank's cell.  Moving the blank swaps two nibbles, and the state is its
+# own hash, so searches over packed states never build an EightPuzzleState.
+
+GOAL_BOARD = sum([number << (4 * number) for number in range(9)])
+GOAL_STATE = GOAL_BOARD << 4
+MOVE_VECTORS = {'up': (-1, 0), 'down': (1, 0), 'left': (0, -1), 'right': (0, 1)}
+
+def _packedMoves():
+    "For each cell of the blank, its (move, cell the blank moves to) pairs in legalMoves order."
+    table = []
+    for blank in range(9):
+        moves = []
+        for move in ['up', 'down', 'left', 'right']:
+            row, col = blank // 3 + MOVE_VECTORS[move][0], blank % 3 + MOVE_VECTORS[move][1]
+            if 0 <= row < 3 and 0 <= col < 3:
+                moves.append((move, 3 * row + col))
+        table.append(moves)
+    return table
+
+# PACKED_MOVES[blank]: (move, cell the blank moves to), in legalMoves order
+PACKED_MOVES = _packedMoves()
+
+def packState( numbers ):
+    "Packs a list of nine numbers (0 for the blank) into a packed state."
+    return EightPuzzleState(numbers).pack()
+
+def packedResult( packed, move ):
+    "The packed state after moving the blank; raises KeyError for illegal moves."
+    blank = packed & 15
+    target = dict(PACKED_MOVES[blank])[move]
+    return packedMove(packed, blank, target)
+
+def packedMove( packed, blank, target ):
+    "Slides the tile in cell 'target' into the blank at cell 'blank'."
+    board = packed >> 4
+    tile = (board >> (4 * target)) & 15
+    board = (board & ~(15 << (4 * target))) | (tile << (4 * blank))
+    return (board << 4) | target
+
+def tilePositions( packed ):
+    "positions[tile] is the cell holding each number (0 for the blank)."
+    board = packed >> 4
+    positions = [0] * 9
+    for cell in range(9):
+        positions[(board >> (4 * cell)) & 15] = cell
+    return positions
+
 # TODO: Implement The methods in this class
 
 class EightPuzzleSearchProblem(search.SearchProblem):
@@ -196,7 +234,7 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         self.puzzle = puzzle
 
     def getStartState(self):
-        return puzzle
+        return self.puzzle
 
     def isGoalState(self,state):
         return state.isGoal()
@@ -221,6 +259,235 @@ class EightPuzzleSearchProblem(search.SearchProblem):
         """
         return len(actions)
 
+class PackedEightPuzzleSearchProblem(search.SearchProblem):
+    """
+      The Eight Puzzle over packed states (see packState): the same moves
+    as EightPuzzleSearchProblem, for fast search.  Use
+    EightPuzzleState.fromPacked to display a state.
+    """
+    def __init__(self, puzzle):
+        "puzzle: an EightPuzzleState or a packed state."
+        if isinstance(puzzle, EightPuzzleState):
+            puzzle = puzzle.pack()
+        self.start = puzzle
+        self._expanded = 0
+
+    def getStartState(self):
+        return self.start
+
+    def isGoalState(self, state):
+        return state == GOAL_STATE
+
+    def getSuccessors(self, state):
+        self._expanded += 1
+        blank = state & 15
+        return [(packedMove(state, blank, target), move, 1) for move, target in PACKED_MOVES[blank]]
+
+    def getCostOfActions(self, actions):
+        return len(actions)
+
+# Heuristics, on EightPuzzleStates or packed states
+
+# MANHATTAN[tile][cell]: moves for the tile from cell to its goal cell
+MANHATTAN = [[abs(cell // 3 - tile // 3) + abs(cell % 3 - tile % 3) for cell in range(9)]
+             for tile in range(9)]
+
+def _packed( state ):
+    if isinstance(state, EightPuzzleState):
+        return state.pack()
+    return state
+
+def manhattanHeuristic( state, problem=None ):
+    "The sum of the tiles' Manhattan distances to their goal cells."
+    board = _packed(state) >> 4
+    total = 0
+    for cell in range(9):
+        tile = (board >> (4 * cell)) & 15
+        if tile:
+            total += MANHATTAN[tile][cell]
+    return total
+
+def _longestIncreasing( values ):
+    longest = [1] * len(values)
+    for i in range(len(values)):
+        for j in range(i):
+            if values[j] < values[i]:
+                longest[i] = max(longest[i], longest[j] + 1)
+    return max(longest + [0])
+
+def _lineConflicts():
+    "The extra moves for every ordering of up to three goal places along a line."
+    table = {}
+    for length in range(4):
+        for goals in itertools.permutations(range(3), length):
+            table[goals] = 2 * (length - _longestIncreasing(goals))
+    return table
+
+# LINE_CONFLICTS[goals]: two moves for each tile that has to leave the line
+# so the others can pass, where goals lists the goal places (0-2) along the
+# line of the tiles already in their goal line, in their current order
+LINE_CONFLICTS = _lineConflicts()
+
+def linearConflicts( positions ):
+    """
+      Two extra moves for every tile that must step out of its goal row (or
+    column) and back because tiles in that line are in the wrong order.
+    positions is as tilePositions returns it.
+    """
+    cellTiles = [0] * 9
+    for tile in range(1, 9):
+        cellTiles[positions[tile]] = tile
+    extra = 0
+    for line in range(3):
+        rowGoals = tuple([cellTiles[3 * line + k] % 3 for k in range(3)
+                          if cellTiles[3 * line + k] and cellTiles[3 * line + k] // 3 == line])
+        colGoals = tuple([cellTiles[3 * k + line] // 3 for k in range(3)
+                          if cellTiles[3 * k + line] and cellTiles[3 * k + line] % 3 == line])
+        extra += LINE_CONFLICTS[rowGoals] + LINE_CONFLICTS[colGoals]
+    return extra
+
+def linearConflictHeuristic( state, problem=None ):
+    "Manhattan distance plus linear conflicts; admissible and still consistent."
+    packed = _packed(state)
+    return manhattanHeuristic(packed) + linearConflicts(tilePositions(packed))
+
+# Additive pattern databases
+#
+# The tiles are split into disjoint patterns.  For each pattern, a backward
+# search from the goal over the places of that pattern's tiles (and the blank)
+# finds the fewest moves *of pattern tiles* needed to solve them, whatever
+# the other tiles do.  No move is counted by two patterns, so the values add
+# up to a lower bound on the whole puzzle.
+
+PATTERNS = ((1, 2, 3, 4), (5, 6, 7, 8))
+PATTERN_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.patternDatabases')
+PATTERN_CACHE_VERSION = 2
+
+_patternDatabases = {}
+
+def patternIndex( positions, pattern ):
+    "The index of the pattern tiles' cells in that pattern's database."
+    index = 0
+    for tile in pattern:
+        index = index * 9 + positions[tile]
+    return index
+
+def buildPatternDatabase( pattern ):
+    """
+      Returns a list of the fewest pattern-tile moves for every placement of
+    the pattern's tiles and the blank (at patternIndex * 9 + blank;
+    impossible placements are left at -1), by a 0-1 breadth-first search
+    from the goal.  Keeping the blank's place, rather than the best over all
+    places, keeps the sum of the databases consistent.
+    """
+    import collections
+    size = 9 ** len(pattern)
+    # Place of each tile in the index, counting from the last digit
+    weights = [9 ** (len(pattern) - 1 - k) for k in range(len(pattern))]
+    costs = [-1] * (size * 9)
+    goal = patternIndex(list(range(9)), pattern) * 9 + 0
+    costs[goal] = 0
+    queue = collections.deque([goal])
+    while queue:
+        state = queue.popleft()
+        index, blank = divmod(state, 9)
+        cost = costs[state]
+        cells = [(index // w) % 9 for w in weights]
+        for move, target in PACKED_MOVES[blank]:
+            if target in cells:
+                # A pattern tile slides from target into the blank
+                k = cells.index(target)
+                nextState = (index + (blank - target) * weights[k]) * 9 + target
+                nextCost = cost + 1
+            else:
+                nextState = index * 9 + target
+                nextCost = cost
+            if costs[nextState] == -1 or nextCost < costs[nextState]:
+                costs[nextState] = nextCost
+                if nextCost == cost:
+                    queue.appendleft(nextState)
+                else:
+                    queue.append(nextState)
+    return costs
+
+def getPatternDatabases( patterns=PATTERNS, useDiskCache=True ):
+    """
+      Returns the databases for the given patterns, built once per process
+    and, unless useDiskCache is False, pickled under PATTERN_CACHE_DIR.
+    """
+    patterns = tuple([tuple(pattern) for pattern in patterns])
+    if patterns in _patternDatabases:
+        return _patternDatabases[patterns]
+    path = os.path.join(PATTERN_CACHE_DIR, 'eightpuzzle-%s.pickle' %
+                        '_'.join([''.join(map(str, pattern)) for pattern in patterns]))
+    databases = None
+    if useDiskCache:
+        try:
+            with open(path, 'rb') as f:
+                version, databases = pickle.load(f)
+            if version != PATTERN_CACHE_VERSION or len(databases) != len(patterns):
+                databases = None
+        except (IOError, OSError, EOFError, ValueError, pickle.UnpicklingError):
+            databases = None
+    if databases is None:
+        databases = [buildPatternDatabase(pattern) for pattern in patterns]
+        if useDiskCache:
+            # The cache is only an optimisation: failing to write it is not an error.
+            try:
+                if not os.path.isdir(PATTERN_CACHE_DIR):
+                    os.makedirs(PATTERN_CACHE_DIR)
+                tmpPath = '%s.%d.tmp' % (path, os.getpid())
+                with open(tmpPath, 'wb') as f:
+                    pickle.dump((PATTERN_CACHE_VERSION, databases), f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmpPath, path)
+            except (IOError, OSError):
+                pass
+    _patternDatabases[patterns] = databases
+    return databases
+
+def patternDatabaseHeuristic( state, problem=None ):
+    """
+      The sum of the pattern databases' values.
+    """
+    packed = _packed(state)
+    positions = tilePositions(packed)
+    blank = packed & 15
+    total = 0
+    for pattern, database in zip(PATTERNS, getPatternDatabases()):
+        total += database[patternIndex(positions, pattern) * 9 + blank]
+    return total
+
+# Solving many puzzles
+
+def solveEightPuzzle( puzzle, heuristic=patternDatabaseHeuristic ):
+    "Returns an optimal list of moves for an EightPuzzleState or packed state."
+    return search.aStarSearch(PackedEightPuzzleSearchProblem(puzzle), heuristic)
+
+def _solvePacked( task ):
+    packed, heuristicName = task
+    return solveEightPuzzle(packed, globals()[heuristicName])
+
+def solveEightPuzzles( puzzles, heuristic='patternDatabaseHeuristic', jobs=1 ):
+    """
+      Solves every puzzle (EightPuzzleStates or packed states) with A* and the
+    named heuristic from this module, on 'jobs' processes, and returns the
+    lists of moves in the same order.  The pattern databases are loaded
+    before the workers are forked, so they share them.
+    """
+    import multiprocessing
+    tasks = [(_packed(puzzle), heuristic) for puzzle in puzzles]
+    if heuristic == 'patternDatabaseHeuristic':
+        getPatternDatabases()
+    jobs = min(jobs, len(tasks))
+    if jobs <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+        return list(map(_solvePacked, tasks))
+    pool = multiprocessing.get_context('fork').Pool(jobs)
+    try:
+        return pool.map(_solvePacked, tasks, chunksize=max(1, len(tasks) // (4 * jobs)))
+    finally:
+        pool.terminate()
+        pool.join()
+
 EIGHT_PUZZLE_DATA = [[1, 0, 2, 3, 4, 5, 6, 7, 8],
                      [1, 7, 8, 2, 3, 4, 5, 6, 0],
                      [4, 3, 2, 7, 0, 5, 1, 6, 8],
@@ -262,7 +529,53 @@ def createRandomEightPuzzle(moves=100):
         puzzle = puzzle.result(random.sample(puzzle.legalMoves(), 1)[0])
     return puzzle
 
+def readCommand( argv ):
+    from optparse import OptionParser
+    usageStr = """
+    USAGE:      python eightpuzzle.py <options>
+    EXAMPLES:   (1) python eightpuzzle.py
+                    - steps through a BFS solution of a random puzzle
+                (2) python eightpuzzle.py -n 1000 -j 4
+                    - solves 1000 random puzzles with A* on 4 processes
+    """
+    parser = OptionParser(usageStr)
+    parser.add_option('-n', '--numPuzzles', dest='numPuzzles', type='int', default=0,
+                      help='solve this many random puzzles and report the timing')
+    parser.add_option('-m', '--moves', dest='moves', type='int', default=100,
+                      help='random moves used to scramble each puzzle (default: %default)')
+    parser.add_option('-H', '--heuristic', dest='heuristic', default='patternDatabaseHeuristic',
+                      help='heuristic from this module for -n (default: %default)')
+    parser.add_option('-j', '--jobs', dest='jobs', type='int', default=1,
+                      help='processes to solve the puzzles on (default: %default)')
+    parser.add_option('-s', '--seed', dest='seed', default=None,
+                      help='random seed for the puzzles')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    return options
+
+def runBatch( options ):
+    import time
+    if options.seed is not None:
+        random.seed(options.seed)
+    puzzles = [createRandomEightPuzzle(options.moves) for i in range(options.numPuzzles)]
+    start = time.time()
+    paths = solveEightPuzzles(puzzles, options.heuristic, options.jobs)
+    elapsed = time.time() - start
+    lengths = [len(path) for path in paths]
+    print('Solved %d puzzles with %s on %d process%s in %.2f seconds (%.2f ms each)' %
+          (len(paths), options.heuristic, options.jobs, ('', 'es')[options.jobs > 1],
+           elapsed, 1000.0 * elapsed / max(1, len(paths))))
+    print('Solution lengths: average %.2f, longest %d' %
+          (float(sum(lengths)) / max(1, len(lengths)), max(lengths + [0])))
+
 if __name__ == '__main__':
+    import sys
+    options = readCommand(sys.argv[1:])
+    if options.numPuzzles > 0:
+        runBatch(options)
+        sys.exit(0)
+
     puzzle = createRandomEightPuzzle(25)
     print('A random puzzle:')
     print(puzzle)
@@ -204,16 +204,30 @@ class Grid:
         return hash(h)
 
     def copy(self):
-        g = Grid(self.width, self.height)
-        g.data = [x[:] for x in self.data]
-        return g
+        return self._withData([x[:] for x in self.data])
 
     def deepCopy(self):
         return self.copy()
 
     def shallowCopy(self):
-        g = Grid(self.width, self.height)
-        g.data = self.data
+        return self._withData(self.data)
+
+    def cleared(self, x, y):
+        """
+        Returns a copy of the grid with cell (x,y) set to False.  Only column x
+        is copied; the others are shared, as in a shallowCopy.
+        """
+        data = list(self.data)
+        column = data[x][:]
+        column[y] = False
+        data[x] = column
+        return self._withData(data)
+
+    def _withData(self, data):
+        "A Grid of this size holding data, without filling in a blank grid first."
+        g = Grid.__new__(Grid)
+        g.CELLS_PER_INT = self.CELLS_PER_INT
+        g.width, g.height, g.data = self.width, self.height, data
         return g
 
     def count(self, item =True ):
@@ -274,6 +288,169 @@ class Grid:
                 bools.append(False)
         return bools
 
+class BitGrid:
+    """
+    A boolean Grid packed into a single Python int.  Cell (x,y) is bit
+    x * height + y, the same cell order Grid uses for hashing and packBits,
+    so a BitGrid hashes and packs exactly like the equivalent Grid.
+
+    Data is still accessed via grid[x][y], which returns a lightweight view of
+    column x.  Because ints are immutable, copy() is O(1) and only the grid
+    that is written to pays for a new int; cleared(x, y) does the copy and the
+    write in one step.  count() and asList() only visit the set bits.
+    """
+    CELLS_PER_INT = 30
+
+    def __init__(self, width, height, initialValue=False, bitRepresentation=None):
+        if initialValue not in [False, True]: raise Exception('Grids can only contain booleans')
+        self.width = width
+        self.height = height
+        self.bits = (1 << (width * height)) - 1 if initialValue else 0
+        self._columns = None
+        if bitRepresentation:
+            self._unpackBits(bitRepresentation)
+
+    def fromGrid(grid):
+        "Builds a BitGrid holding the same values as a list-backed Grid."
+        bitGrid = BitGrid(grid.width, grid.height)
+        bits = 0
+        for index, (x, y) in enumerate(bitGrid._cells()):
+            if grid[x][y]:
+                bits |= 1 << index
+        bitGrid.bits = bits
+        return bitGrid
+    fromGrid = staticmethod(fromGrid)
+
+    def _cells(self):
+        for x in range(self.width):
+            for y in range(self.height):
+                yield x, y
+
+    def __getitem__(self, i):
+        if self._columns is None:
+            self._columns = [_BitGridColumn(self, x) for x in range(self.width)]
+        return self._columns[i]
+
+    def __setitem__(self, key, item):
+        column = self[key]
+        for y in range(self.height):
+            column[y] = item[y]
+
+    def get(self, x, y):
+        "Returns grid[x][y] without building a column view."
+        return (self.bits >> (x * self.height + y)) & 1 == 1
+
+    def __str__(self):
+        out = [[str(self.get(x, y))[0] for x in range(self.width)] for y in range(self.height)]
+        out.reverse()
+        return '\n'.join([''.join(x) for x in out])
+
+    def __eq__(self, other):
+        if other == None: return False
+        if isinstance(other, BitGrid):
+            return self.bits == other.bits and self.width == other.width and self.height == other.height
+        return self.data == other.data
+
+    def __hash__(self):
+        return hash(self.bits)
+
+    def _getData(self):
+        return [[self.get(x, y) for y in range(self.height)] for x in range(self.width)]
+    data = property(_getData, doc="The grid as a list of lists, as Grid stores it.")
+
+    def copy(self):
+        g = BitGrid(self.width, self.height)
+        g.bits = self.bits
+        return g
+
+    def deepCopy(self):
+        return self.copy()
+
+    def shallowCopy(self):
+        # A Grid's shallow copy aliases its cells; the only way to alias an
+        # immutable int is to hand out the same object.
+        return self
+
+    def cleared(self, x, y):
+        "Returns a copy of the grid with cell (x,y) set to False."
+        g = BitGrid(self.width, self.height)
+        g.bits = self.bits & ~(1 << (x * self.height + y))
+        return g
+
+    def count(self, item =True ):
+        setBits = bin(self.bits).count('1')
+        if item: return setBits
+        return self.width * self.height - setBits
+
+    def asList(self, key = True):
+        list = []
+        height = self.height
+        if key:
+            bits = self.bits
+            while bits:
+                lowest = bits & -bits
+                index = lowest.bit_length() - 1
+                list.append( (index // height, index % height) )
+                bits ^= lowest
+        else:
+            for index, (x, y) in enumerate(self._cells()):
+                if not (self.bits >> index) & 1: list.append( (x,y) )
+        return list
+
+    def packBits(self):
+        """
+        Returns an efficient int list representation
+
+        (width, height, bitPackedInts...)
+        """
+        return Grid.packBits(self)
+
+    def _unpackBits(self, bits):
+        """
+        Fills in data from a bit-level representation
+        """
+        cell = 0
+        grid = 0
+        for packed in bits:
+            if packed < 0: raise ValueError("must be a positive integer")
+            for i in range(self.CELLS_PER_INT):
+                if cell == self.width * self.height: break
+                if (packed >> (self.CELLS_PER_INT - i - 1)) & 1:
+                    grid |= 1 << cell
+                cell += 1
+        self.bits = grid
+
+    def _cellIndexToPosition(self, index):
+        x = index // self.height
+        y = index % self.height
+        return x, y
+
+class _BitGridColumn:
+    "A view of one column of a BitGrid, so that grid[x][y] keeps working."
+    __slots__ = ('grid', 'offset')
+
+    def __init__(self, grid, x):
+        self.grid = grid
+        self.offset = x * grid.height
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            if -self.grid.height <= y < 0: y += self.grid.height
+            else: raise IndexError('grid index out of range')
+        return (self.grid.bits >> (self.offset + y)) & 1 == 1
+
+    def __setitem__(self, y, value):
+        if not 0 <= y < self.grid.height:
+            if -self.grid.height <= y < 0: y += self.grid.height
+            else: raise IndexError('grid index out of range')
+        if value:
+            self.grid.bits |= 1 << (self.offset + y)
+        else:
+            self.grid.bits &= ~(1 << (self.offset + y))
+
+    def __len__(self):
+        return self.grid.height
+
 def reconstituteGrid(bitRep):
     if type(bitRep) is not type((1,2)):
         return bitRep
@@ -368,6 +545,18 @@ class Actions:
         return (x + dx, y + dy)
     getSuccessor = staticmethod(getSuccessor)
 
+FOOD_KEY_MASK = (1 << 64) - 1
+
+def foodKey(x, y):
+    """
+    A fixed pseudo-random 64-bit key for a pellet at (x,y) (SplitMix64 of the
+    position), so that a food hash means the same in every process.
+    """
+    z = (x * 0x9E3779B97F4A7C15 + y * 0xD1B54A32D192ED03 + 0x632BE59BD9B4E019) & FOOD_KEY_MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & FOOD_KEY_MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & FOOD_KEY_MASK
+    return z ^ (z >> 31)
+
 class GameStateData:
     """
 
@@ -379,6 +568,9 @@ class GameStateData:
         if prevState != None:
             self.food = prevState.food.shallowCopy()
             self.capsules = prevState.capsules[:]
+            self.numFood = prevState.numFood
+            self.foodHash = prevState.foodHash
+            self.capsuleSet = prevState.capsuleSet
             self.agentStates = self.copyAgentStates( prevState.agentStates )
             self.layout = prevState.layout
             self._eaten = prevState._eaten
@@ -395,7 +587,7 @@ class GameStateData:
     def deepCopy( self ):
         state = GameStateData( self )
         state.food = self.food.deepCopy()
-        state.layout = self.layout.deepCopy()
+        # GameStateData(self) already shares the layout, which is immutable
         state._agentMoved = self._agentMoved
         state._foodEaten = self._foodEaten
         state._foodAdded = self._foodAdded
@@ -408,6 +600,35 @@ class GameStateData:
             copiedStates.append( agentState.copy() )
         return copiedStates
 
+    def setFood( self, food ):
+        """
+        Replaces the food grid.  numFood and foodHash (the XOR of foodKey over
+        the pellets) are recomputed here and then kept up to date by
+        removeFood, so they never need a scan of the grid.
+        """
+        self.food = food
+        self.numFood = 0
+        self.foodHash = 0
+        for x in range(food.width):
+            for y in range(food.height):
+                if food[x][y]:
+                    self.numFood += 1
+                    self.foodHash ^= foodKey(x, y)
+
+    def setCapsules( self, capsules ):
+        self.capsules = capsules
+        self.capsuleSet = frozenset(capsules)
+
+    def removeFood( self, x, y ):
+        "Eats the pellet at (x,y), copying only the column it was in."
+        self.food = self.food.cleared(x, y)
+        self.numFood -= 1
+        self.foodHash ^= foodKey(x, y)
+
+    def removeCapsule( self, position ):
+        self.capsules.remove(position)
+        self.capsuleSet = self.capsuleSet - frozenset([position])
+
     def __eq__( self, other ):
         """
         Allows two states to be compared.
@@ -415,6 +636,7 @@ class GameStateData:
         if other == None: return False
         # TODO Check for type of other
         if not self.agentStates == other.agentStates: return False
+        if self.numFood != other.numFood or self.foodHash != other.foodHash: return False
         if not self.food == other.food: return False
         if not self.capsules == other.capsules: return False
         if not self.score == other.score: return False
@@ -430,7 +652,7 @@ class GameStateData:
             except TypeError as e:
                 print(e)
                 #hash(state)
-        return int((hash(tuple(self.agentStates)) + 13*hash(self.food) + 113* hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575 )
+        return int((hash(tuple(self.agentStates)) + 13*self.foodHash + 113* hash(tuple(self.capsules)) + 7 * hash(self.score)) % 1048575 )
 
     def __str__( self ):
         width, height = self.layout.width, self.layout.height
@@ -488,9 +710,8 @@ class GameStateData:
         """
         Creates an initial game state from a layout array (see layout.py).
         """
-        self.food = layout.food.copy()
-        #self.capsules = []
-        self.capsules = layout.capsules[:]
+        self.setFood(layout.food.copy())
+        self.setCapsules(list(layout.capsules))
         self.layout = layout
         self.score = 0
         self.scoreChange = 0
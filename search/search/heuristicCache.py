@@ -0,0 +1,213 @@
+# heuristicCache.py
+# -----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Cached lower bounds for the FoodSearchProblem, used by foodHeuristic in
+searchAgents.py.
+
+A FoodHeuristicCache lives in problem.heuristicInfo (see
+getFoodHeuristicCache) and keeps, for the life of one search:
+
+  - the maze distance between every pair of the problem's pellets, and from
+    each position seen so far to every pellet;
+  - the minimum spanning tree of each set of remaining food, keyed by the
+    food's bitmask (BitGrid.bits).  When the food is the parent's minus the
+    pellet Pacman stands on, the tree is repaired from the parent's tree
+    instead of being rebuilt;
+  - the heuristic value of each (position, food bitmask) state.
+
+The bound is the larger of the distance to the farthest pellet and the
+distance to the nearest pellet plus the weight of the food's spanning tree.
+Each is consistent, so their maximum is too.
+"""
+
+import distanceCalculator
+
+class FoodHeuristicCache:
+    """
+    Heuristic values and food spanning trees for one FoodSearchProblem.
+    """
+
+    def __init__(self, problem):
+        self.oracle = distanceCalculator.getMazeDistances(problem.walls)
+        self.height = problem.walls.height
+        self.pellets = []      # pellet index -> position
+        self.pelletBits = []   # pellet index -> its bit in a food bitmask
+        self.pelletIndex = {}  # bit number -> pellet index
+        self.distances = []    # distances[i][j] between pellets i and j
+        self.knownBits = 0
+        self.positionDistances = {}
+        self.trees = {}        # food bits -> (weight, [(w, i, j)], [pellet indices])
+        self.values = {}
+        self.hits = self.misses = 0
+        self.addPellets(problem.getStartState()[1].asList())
+
+    def addPellets(self, positions):
+        "Adds pellets to the distance matrix."
+        new = [pos for pos in positions if not self.knownBits & self.bitOf(pos)]
+        if not new:
+            return
+        for pos in new:
+            bit = self.bitOf(pos)
+            self.pelletIndex[bit.bit_length() - 1] = len(self.pellets)
+            self.pellets.append(pos)
+            self.pelletBits.append(bit)
+            self.knownBits |= bit
+        distance = self.oracle.distance
+        self.distances = [[distance(a, b) for b in self.pellets] for a in self.pellets]
+        self.positionDistances = {}
+
+    def bitOf(self, pos):
+        x, y = pos
+        return 1 << (x * self.height + y)
+
+    def pelletsIn(self, bits):
+        "The indices of the pellets in a food bitmask."
+        indices = []
+        pelletIndex = self.pelletIndex
+        while bits:
+            low = bits & -bits
+            indices.append(pelletIndex[low.bit_length() - 1])
+            bits ^= low
+        return indices
+
+    def distancesFrom(self, position):
+        "The maze distance from position to each pellet, by pellet index."
+        row = self.positionDistances.get(position)
+        if row is None:
+            fromPosition = self.oracle.distancesFrom(position)
+            cellId = self.oracle.cellId
+            row = [fromPosition[cellId(pos)] for pos in self.pellets]
+            self.positionDistances[position] = row
+        return row
+
+    def value(self, state):
+        "The heuristic value of a (position, foodGrid) state."
+        position, foodGrid = state
+        key = (position, foodGrid.bits)
+        value = self.values.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+
+        bits = foodGrid.bits
+        if bits & ~self.knownBits:
+            self.addPellets(foodGrid.asList())
+        weight, edges, indices = self.tree(bits, position)
+        if not indices:
+            value = 0
+        else:
+            row = self.distancesFrom(position)
+            toFood = [row[i] for i in indices]
+            value = max(max(toFood), min(toFood) + weight)
+        self.values[key] = value
+        return value
+
+    def tree(self, bits, position=None):
+        """
+        Returns (weight, edges, indices) for the minimum spanning tree of the
+        pellets in bits under maze distance, where edges are (w, i, j) triples
+        of pellet indices.  If position holds a pellet that is missing from
+        bits, and the tree with that pellet is known, it is repaired instead.
+        """
+        tree = self.trees.get(bits)
+        if tree is not None:
+            return tree
+        eaten = self.bitOf(position) if position is not None else 0
+        parent = self.trees.get(bits | eaten) if eaten & self.knownBits and not eaten & bits else None
+        if parent is not None:
+            tree = self.removeFromTree(parent, self.pelletIndex[eaten.bit_length() - 1])
+        else:
+            tree = self.primTree(self.pelletsIn(bits))
+        self.trees[bits] = tree
+        return tree
+
+    def primTree(self, indices):
+        "Builds the minimum spanning tree of the pellets with Prim's algorithm."
+        if not indices:
+            return (0, [], [])
+        distances = self.distances
+        first = indices[0]
+        best = dict((i, (distances[first][i], first)) for i in indices[1:])
+        weight, edges = 0, []
+        while best:
+            nearest = min(best, key=lambda i: best[i][0])
+            w, parent = best.pop(nearest)
+            weight += w
+            edges.append((w, parent, nearest))
+            row = distances[nearest]
+            for i, (d, _) in list(best.items()):
+                if row[i] < d:
+                    best[i] = (row[i], nearest)
+        return (weight, edges, indices)
+
+    def removeFromTree(self, parent, removed):
+        """
+        Repairs a spanning tree after a pellet is removed: the tree minus its
+        edges at that pellet is the new tree split into pieces, which are then
+        joined by the shortest edges between them.
+        """
+        weight, edges, indices = parent
+        indices = [i for i in indices if i != removed]
+        kept = [edge for edge in edges if removed not in edge[1:]]
+        if not indices:
+            return (0, [], [])
+        if len(kept) == len(edges) - 1:
+            # A leaf: nothing to reconnect
+            return (weight - sum([e[0] for e in edges if removed in e[1:]]), kept, indices)
+
+        # Label the pieces
+        component = dict((i, i) for i in indices)
+        def find(i):
+            while component[i] != i:
+                component[i] = component[component[i]]
+                i = component[i]
+            return i
+        for w, i, j in kept:
+            component[find(i)] = find(j)
+
+        # Prim's algorithm over the pieces
+        distances = self.distances
+        pieces = {}
+        for i in indices:
+            pieces.setdefault(find(i), []).append(i)
+        pieces = list(pieces.values())
+        inTree = pieces.pop()
+        best = {}
+        for i in indices:
+            if find(i) != find(inTree[0]):
+                best[i] = min([(distances[j][i], j) for j in inTree])
+        weight = sum([e[0] for e in kept])
+        while best:
+            nearest = min(best, key=lambda i: best[i][0])
+            w, j = best[nearest]
+            weight += w
+            kept.append((w, j, nearest))
+            root = find(nearest)
+            joined = [i for i in best if find(i) == root]
+            for i in joined:
+                del best[i]
+            for i in best:
+                for j in joined:
+                    if distances[j][i] < best[i][0]:
+                        best[i] = (distances[j][i], j)
+        return (weight, kept, indices)
+
+def getFoodHeuristicCache(problem):
+    "Returns the FoodHeuristicCache of a problem, making it on first use."
+    cache = problem.heuristicInfo.get('foodHeuristicCache')
+    if cache is None:
+        cache = problem.heuristicInfo['foodHeuristicCache'] = FoodHeuristicCache(problem)
+    return cache
@@ -0,0 +1,199 @@
+# junctionGraph.py
+# ----------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Contracts a maze into a graph of its junctions.
+
+Most of a maze is corridor: cells with exactly two open neighbours, where a
+search has no choice but to keep going.  A JunctionGraph keeps only the other
+cells (dead ends and branch points) as nodes, and joins them by the corridors
+between them, each stored once as the moves and cells along it.  Searching
+the graph instead of the grid expands one node per junction:
+
+graph = getJunctionGraph(gameState.getWalls())
+problem = JunctionSearchProblem(PositionSearchProblem(gameState, ...))
+macroActions = search.uniformCostSearch(problem)
+actions = problem.expandActions(macroActions)
+
+Each action of a JunctionSearchProblem is a tuple of Directions, the whole
+corridor to the next junction, and it costs the sum of the position
+problem's costFn over the cells entered, so uniform cost search and A* still
+find optimal paths.  The start and goal may lie inside a corridor.
+"""
+
+from game import Actions, Directions
+import distanceCalculator
+
+class JunctionGraph:
+    """
+    The junctions of a maze and the corridors between them.
+
+    edges[junction] lists a route (end, actions, cells) for every open
+    neighbour of the junction: the moves along the corridor and the cells
+    they enter, ending at the junction 'end'.  corridor[cell] places every
+    other open cell on one of these routes as (junction, route index,
+    offset), with cells[offset] == cell.
+    """
+
+    def __init__(self, walls):
+        self.width, self.height = walls.width, walls.height
+        cells = walls.asList(False)
+        openCells = set(cells)
+        self.neighbors = {}
+        for x, y in cells:
+            self.neighbors[(x, y)] = [(action, (x + dx, y + dy))
+                                      for action, (dx, dy) in Actions._directionsAsList
+                                      if action != Directions.STOP and (x + dx, y + dy) in openCells]
+
+        self.junctions = set(cell for cell in cells if len(self.neighbors[cell]) != 2)
+        self.edges = {}
+        self.corridor = {}
+        for junction in sorted(self.junctions):
+            self._addRoutes(junction)
+        # Loops of corridor with no junction on them get an arbitrary one
+        for cell in cells:
+            if cell not in self.junctions and cell not in self.corridor:
+                self.junctions.add(cell)
+                self._addRoutes(cell)
+
+    def _addRoutes(self, junction):
+        routes = self.edges[junction] = []
+        for action, cell in self.neighbors[junction]:
+            actions, visited = [action], [cell]
+            previous = junction
+            while cell not in self.junctions:
+                # A corridor cell has exactly one way on
+                for action, nextCell in self.neighbors[cell]:
+                    if nextCell != previous:
+                        break
+                previous, cell = cell, nextCell
+                actions.append(action)
+                visited.append(cell)
+            for offset, inner in enumerate(visited[:-1]):
+                if inner not in self.corridor:
+                    self.corridor[inner] = (junction, len(routes), offset)
+            routes.append((cell, tuple(actions), tuple(visited)))
+
+    def getNumJunctions(self):
+        return len(self.junctions)
+
+    def routesFrom(self, cell):
+        """
+        Returns the routes (end, actions, cells) from any open cell: those of
+        a junction, or the two ways out of a corridor cell.
+        """
+        if cell in self.edges:
+            return self.edges[cell]
+        junction, index, offset = self.corridor[cell]
+        end, actions, cells = self.edges[junction][index]
+        ahead = (end, actions[offset + 1:], cells[offset + 1:])
+        back = (junction,
+                tuple(Directions.REVERSE[a] for a in reversed(actions[:offset + 1])),
+                tuple(reversed(cells[:offset])) + (junction,))
+        return [ahead, back]
+
+def reverseRoute(start, route):
+    "Turns a route from start into the route from its end back to start."
+    end, actions, cells = route
+    return (start,
+            tuple(Directions.REVERSE[a] for a in reversed(actions)),
+            tuple(reversed(cells[:-1])) + (start,))
+
+_graphs = {}
+_lastLookup = (None, None) # (walls, graph) of the most recent lookup
+
+def getJunctionGraph(walls):
+    """
+    Returns the JunctionGraph of the maze with the given walls, building it
+    the first time the maze is seen in this process.
+    """
+    global _lastLookup
+    if _lastLookup[0] is walls:
+        return _lastLookup[1]
+    key = distanceCalculator.layoutKey(walls)
+    if key not in _graphs:
+        _graphs[key] = JunctionGraph(walls)
+    _lastLookup = (walls, _graphs[key])
+    return _graphs[key]
+
+class JunctionSearchProblem:
+    """
+    A PositionSearchProblem searched over its maze's JunctionGraph.  States
+    are positions, as in the position problem, but only junctions, the start
+    and the goal are ever reached.
+    """
+
+    def __init__(self, problem, graph=None):
+        self.problem = problem
+        self.walls = problem.walls
+        self.goal = problem.goal
+        self.costFn = problem.costFn
+        self.startState = problem.getStartState()
+        if graph is None:
+            graph = getJunctionGraph(self.walls)
+        self.graph = graph
+        self.heuristicInfo = {}
+        self._expanded = 0
+
+        # Routes into a goal that lies inside a corridor, by the junction they leave
+        self.goalRoutes = {}
+        if self.goal not in graph.edges and self.goal in graph.corridor:
+            for route in graph.routesFrom(self.goal):
+                self.goalRoutes.setdefault(route[0], []).append(reverseRoute(self.goal, route))
+
+    def getStartState(self):
+        return self.startState
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        """
+        Returns (next state, actions, cost) triples, where actions is the tuple
+        of Directions leading there.
+        """
+        self._expanded += 1
+        routes = list(self.graph.routesFrom(state))
+        if state in self.goalRoutes:
+            routes.extend(self.goalRoutes[state])
+        if state not in self.graph.edges:
+            # The start may share a corridor with the goal
+            for end, actions, cells in list(routes):
+                if self.goal in cells and end != self.goal:
+                    i = cells.index(self.goal) + 1
+                    routes.append((self.goal, actions[:i], cells[:i]))
+        costFn = self.costFn
+        return [(end, actions, sum([costFn(cell) for cell in cells]))
+                for end, actions, cells in routes]
+
+    def getCostOfActions(self, macroActions):
+        return self.problem.getCostOfActions(self.expandActions(macroActions))
+
+    def expandActions(self, macroActions):
+        "Flattens a path of corridor moves into a list of Directions."
+        actions = []
+        for macro in macroActions:
+            actions.extend(macro)
+        return actions
+
+def junctionSearch(problem, searchFunction):
+    """
+    Runs searchFunction on the junction graph of a PositionSearchProblem and
+    returns the path as primitive Directions.  Junction expansions are added
+    to problem._expanded.
+    """
+    junctionProblem = JunctionSearchProblem(problem)
+    actions = junctionProblem.expandActions(searchFunction(junctionProblem))
+    problem._expanded += junctionProblem._expanded
+    return actions
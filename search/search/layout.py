@@ -23,6 +23,11 @@ VISIBILITY_MATRIX_CACHE = {}
 class Layout:
     """
     A Layout manages the static information about the game board.
+
+    Layouts are immutable once built, so all the GameStates of a game share
+    one by reference instead of copying it, and getLayout hands out a single
+    interned Layout per distinct layout text.  The food grid is a template:
+    GameStateData copies it before anything is eaten.
     """
 
     def __init__(self, layoutText):
@@ -34,9 +39,17 @@ class Layout:
         self.agentPositions = []
         self.numGhosts = 0
         self.processLayoutText(layoutText)
-        self.layoutText = layoutText
+        self.capsules = tuple(self.capsules)
+        self.agentPositions = tuple(self.agentPositions)
+        self.layoutText = tuple(layoutText)
         self.totalFood = len(self.food.asList())
         # self.initializeVisibilityMatrix()
+        self.frozen = True
+
+    def __setattr__(self, name, value):
+        if getattr(self, 'frozen', False):
+            raise AttributeError('Layouts are immutable')
+        self.__dict__[name] = value
 
     def getNumGhosts(self):
         return self.numGhosts
@@ -57,10 +70,10 @@ class Layout:
                             while (nextx + nexty) != int(nextx) + int(nexty) or not self.walls[int(nextx)][int(nexty)] :
                                 vis[x][y][direction].add((nextx, nexty))
                                 nextx, nexty = x + dx, y + dy
-            self.visibility = vis
+            self.__dict__['visibility'] = vis
             VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)] = vis
         else:
-            self.visibility = VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)]
+            self.__dict__['visibility'] = VISIBILITY_MATRIX_CACHE[reduce(str.__add__, self.layoutText)]
 
     def isWall(self, pos):
         x, col = pos
@@ -91,7 +104,8 @@ class Layout:
         return "\n".join(self.layoutText)
 
     def deepCopy(self):
-        return Layout(self.layoutText[:])
+        "Layouts are immutable, so a copy is the layout itself."
+        return self
 
     def processLayoutText(self, layoutText):
         """
@@ -146,5 +160,14 @@ def getLayout(name, back = 2):
 def tryToLoad(fullname):
     if(not os.path.exists(fullname)): return None
     f = open(fullname)
-    try: return Layout([line.strip() for line in f])
+    try: return internLayout([line.strip() for line in f])
     finally: f.close()
+
+_internedLayouts = {}
+
+def internLayout(layoutText):
+    "Returns the one Layout for this layout text, building it the first time."
+    key = tuple(layoutText)
+    if key not in _internedLayouts:
+        _internedLayouts[key] = Layout(list(layoutText))
+    return _internedLayouts[key]
@@ -62,6 +62,37 @@ class SearchProblem:
         util.raiseNotDefined()
 
 
+class SearchNode:
+    """
+    A node in the search tree: a state together with a pointer to the node it
+    was expanded from, the action that led here and the path cost so far.
+
+    Nodes share their ancestors instead of copying the action list, so pushing
+    a successor is O(1) no matter how deep it is.  Call path() once a goal has
+    been reached to recover the list of actions from the start state.
+    """
+    __slots__ = ('state', 'parent', 'action', 'cost')
+
+    def __init__(self, state, parent=None, action=None, cost=0):
+        self.state = state
+        self.parent = parent
+        self.action = action
+        self.cost = cost
+
+    def child(self, state, action, stepCost):
+        "Returns the node reached by taking 'action' (of cost 'stepCost') here."
+        return SearchNode(state, self, action, self.cost + stepCost)
+
+    def path(self):
+        "Returns the list of actions leading from the root to this node."
+        actions = []
+        node = self
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        actions.reverse()
+        return actions
+
 def tinyMazeSearch(problem):
     """
     Returns a sequence of moves that solves tinyMaze.  For any other maze, the
@@ -90,16 +121,15 @@ def depthFirstSearch(problem):
     closed = set()
     fringe = util.Stack()
 
-    fringe.push((problem.getStartState(), [], 0))
+    fringe.push(SearchNode(problem.getStartState()))
     while not fringe.isEmpty():
-        node, path, value = fringe.pop()
-        if problem.isGoalState(node):
-            return path
-        if node not in closed:
-            closed.add(node)
-            for nextState, action, cost in problem.getSuccessors(node):
-                newPath = path + [action]
-                fringe.push((nextState, newPath, value + cost))
+        node = fringe.pop()
+        if problem.isGoalState(node.state):
+            return node.path()
+        if node.state not in closed:
+            closed.add(node.state)
+            for nextState, action, cost in problem.getSuccessors(node.state):
+                fringe.push(node.child(nextState, action, cost))
     return [] #todo
     
 
@@ -109,16 +139,15 @@ def breadthFirstSearch(problem):
     closed = set()
     fringe = util.Queue()
 
-    fringe.push((problem.getStartState(), [], 0))
+    fringe.push(SearchNode(problem.getStartState()))
     while not fringe.isEmpty():
-        node, path, value = fringe.pop()
-        if problem.isGoalState(node):
-            return path
-        if node not in closed:
-            closed.add(node)
-            for (nextState, action, cost) in problem.getSuccessors(node):
-                newPath = path + [action]
-                fringe.push((nextState, newPath, value + cost))
+        node = fringe.pop()
+        if problem.isGoalState(node.state):
+            return node.path()
+        if node.state not in closed:
+            closed.add(node.state)
+            for (nextState, action, cost) in problem.getSuccessors(node.state):
+                fringe.push(node.child(nextState, action, cost))
     return [] #todo
 
 def uniformCostSearch(problem):
@@ -126,17 +155,16 @@ def uniformCostSearch(problem):
     closed = set()
     fringe = util.PriorityQueue()
 
-    fringe.push((problem.getStartState(), [], 0), 0)
+    fringe.push(SearchNode(problem.getStartState()), 0)
     while not fringe.isEmpty():
-        node, path, value = fringe.pop()
-        if problem.isGoalState(node):
-            return path
-        if node not in closed:
-            closed.add(node)
-            for nextState, action, cost in problem.getSuccessors(node):
-                newPath = path + [action]
-                newValue = value + cost
-                fringe.push((nextState, newPath, newValue), newValue)
+        node = fringe.pop()
+        if problem.isGoalState(node.state):
+            return node.path()
+        if node.state not in closed:
+            closed.add(node.state)
+            for nextState, action, cost in problem.getSuccessors(node.state):
+                child = node.child(nextState, action, cost)
+                fringe.push(child, child.cost)
     return [] #todo
 
 def nullHeuristic(state, problem=None):
@@ -152,23 +180,625 @@ def aStarSearch(problem, heuristic=nullHeuristic):
     closed = set()
     fringe = util.PriorityQueue()
 
-    node = problem.getStartState()
-    fringe.push((node, [], 0), heuristic(node, problem))
+    start = problem.getStartState()
+    fringe.push(SearchNode(start), heuristic(start, problem))
     while not fringe.isEmpty():
-        node, path, value = fringe.pop()
-        if problem.isGoalState(node):
-            return path
-        if node not in closed:
-            closed.add(node)
-            for nextState, action, cost in problem.getSuccessors(node):
-                newPath = path + [action]
-                newValue = value + cost
-                newHeuristic = newValue + heuristic(nextState, problem)
-                fringe.push((nextState, newPath, newValue), newHeuristic)
+        node = fringe.pop()
+        if problem.isGoalState(node.state):
+            return node.path()
+        if node.state not in closed:
+            closed.add(node.state)
+            for nextState, action, cost in problem.getSuccessors(node.state):
+                child = node.child(nextState, action, cost)
+                fringe.push(child, child.cost + heuristic(nextState, problem))
     return [] #todo
 
+class ReverseSearchProblem:
+    """
+    A view of a problem with a single goal state that runs from the goal back
+    to the start, for the backward half of a bidirectional search.  The
+    problem must provide getGoalState() and getPredecessors(state) (see
+    PositionSearchProblem).  Its 'goal' is the original start, so heuristics
+    that aim at problem.goal, such as manhattanHeuristic, estimate the
+    distance back to the start; other attributes come from the problem.
+    """
+
+    def __init__(self, problem):
+        self.problem = problem
+        self.goal = problem.getStartState()
+
+    def __getattr__(self, name):
+        return getattr(self.problem, name)
+
+    def getStartState(self):
+        return self.problem.getGoalState()
+
+    def isGoalState(self, state):
+        return state == self.goal
+
+    def getSuccessors(self, state):
+        return self.problem.getPredecessors(state)
+
+def joinPaths(forward, backward, meet):
+    """
+    Returns the actions from the start to meet, following the forward parent
+    links (state -> (parent, action)), then from meet to the goal, following
+    the backward links (state -> (next state, action)).
+    """
+    actions = []
+    state = meet
+    while forward[state] is not None:
+        state, action = forward[state]
+        actions.append(action)
+    actions.reverse()
+    state = meet
+    while backward[state] is not None:
+        state, action = backward[state]
+        actions.append(action)
+    return actions
+
+def bidirectionalSearch(problem):
+    """
+    Breadth-first search from the start and from the goal at once, a layer at
+    a time on whichever side has the smaller frontier, until the two meet.
+    Like breadthFirstSearch it finds a path with the fewest moves, but it
+    expands about two balls of half the radius instead of one full one.  The
+    problem needs a single goal (see ReverseSearchProblem).
+    """
+    start, goal = problem.getStartState(), problem.getGoalState()
+    if problem.isGoalState(start):
+        return []
+
+    # state -> (neighbour, action), and the number of moves from each end
+    links = [{start: None}, {goal: None}]
+    depths = [{start: 0}, {goal: 0}]
+    frontiers = [[start], [goal]]
+    expand = [problem.getSuccessors, problem.getPredecessors]
+    while frontiers[0] and frontiers[1]:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        seen, depth = links[side], depths[side]
+        otherDepth = depths[1 - side]
+        meet, best = None, None
+        nextFrontier = []
+        for state in frontiers[side]:
+            for nextState, action, cost in expand[side](state):
+                if nextState in seen:
+                    continue
+                seen[nextState] = (state, action)
+                depth[nextState] = depth[state] + 1
+                nextFrontier.append(nextState)
+                if nextState in otherDepth:
+                    total = depth[nextState] + otherDepth[nextState]
+                    if best is None or total < best:
+                        meet, best = nextState, total
+        # Finish the layer first: the first meeting state found need not be
+        # the one nearest the other end
+        if meet is not None:
+            return joinPaths(links[0], links[1], meet)
+        frontiers[side] = nextFrontier
+    return []
+
+def bidirectionalAStarSearch(problem, heuristic=nullHeuristic):
+    """
+    A* from the start towards the goal and from the goal towards the start,
+    alternating on the side with fewer open nodes.  The cost of the best path
+    through a state reached from both sides bounds the answer; the search
+    stops once either side's lowest f value reaches it, which with a
+    consistent heuristic proves the path optimal.  The heuristic is asked
+    about the ReverseSearchProblem on the backward side.
+    """
+    import heapq
+
+    start, goal = problem.getStartState(), problem.getGoalState()
+    if problem.isGoalState(start):
+        return []
+
+    problems = [problem, ReverseSearchProblem(problem)]
+    expand = [problem.getSuccessors, problem.getPredecessors]
+    links = [{start: None}, {goal: None}]
+    costs = [{start: 0}, {goal: 0}]
+    closed = [set(), set()]
+    # (f, tie breaker, g, state); the tie breaker keeps states uncompared
+    fringes = [[(heuristic(start, problems[0]), 0, 0, start)],
+               [(heuristic(goal, problems[1]), 0, 0, goal)]]
+    pushes = 1
+    meet, best = None, None
+    while fringes[0] and fringes[1]:
+        if best is not None and max(fringes[0][0][0], fringes[1][0][0]) >= best:
+            break
+        side = 0 if len(fringes[0]) <= len(fringes[1]) else 1
+        f, _, g, state = heapq.heappop(fringes[side])
+        if state in closed[side] or g > costs[side][state]:
+            continue
+        closed[side].add(state)
+        otherCosts = costs[1 - side]
+        for nextState, action, stepCost in expand[side](state):
+            nextCost = g + stepCost
+            if nextState in costs[side] and costs[side][nextState] <= nextCost:
+                continue
+            costs[side][nextState] = nextCost
+            links[side][nextState] = (state, action)
+            pushes += 1
+            heapq.heappush(fringes[side], (nextCost + heuristic(nextState, problems[side]),
+                                           pushes, nextCost, nextState))
+            if nextState in otherCosts:
+                total = nextCost + otherCosts[nextState]
+                if best is None or total < best:
+                    meet, best = nextState, total
+    if meet is None:
+        return []
+    return joinPaths(links[0], links[1], meet)
+
+def jumpPointSearch(problem):
+    """
+    A* over jump points for a problem on a 4-connected grid where every move
+    costs 1, such as PositionSearchProblem with its default costFn.  The
+    problem must have 'walls' and a single 'goal'.
+
+    Instead of pushing every neighbour, the search runs straight along a
+    direction until a jump point: the goal, a cell where a wall ends beside
+    the path (so a shortest path may turn there), or, when running
+    vertically, a cell from which a horizontal run finds one.  Only jump
+    points are expanded and counted in problem._expanded; the cells checked
+    along the way are counted in problem._scanned.
+    """
+    from game import Actions
+
+    walls = problem.walls
+    start, goal = problem.getStartState(), problem.goal
+    width, height = walls.width, walls.height
+    gx, gy = goal
+    problem._scanned = getattr(problem, '_scanned', 0)
+
+    def isOpen(x, y):
+        return 0 <= x < width and 0 <= y < height and not walls[x][y]
+
+    def jump(x, y, dx, dy):
+        "Runs from (x,y) in direction (dx,dy); returns the jump point or None."
+        while True:
+            x, y = x + dx, y + dy
+            if not isOpen(x, y):
+                return None
+            problem._scanned += 1
+            if (x, y) == goal:
+                return (x, y)
+            if dx != 0:
+                if (isOpen(x, y - 1) and not isOpen(x - dx, y - 1)) or \
+                   (isOpen(x, y + 1) and not isOpen(x - dx, y + 1)):
+                    return (x, y)
+            else:
+                if (isOpen(x - 1, y) and not isOpen(x - 1, y - dy)) or \
+                   (isOpen(x + 1, y) and not isOpen(x + 1, y - dy)):
+                    return (x, y)
+                if jump(x, y, 1, 0) is not None or jump(x, y, -1, 0) is not None:
+                    return (x, y)
+
+    def directions(state, parent):
+        "The directions worth running from state, given where it was reached from."
+        if parent is None:
+            return [(0, 1), (0, -1), (1, 0), (-1, 0)]
+        (x, y), (px, py) = state, parent
+        if x != px:
+            dx = 1 if x > px else -1
+            return [(0, 1), (0, -1), (dx, 0)]
+        dy = 1 if y > py else -1
+        return [(1, 0), (-1, 0), (0, dy)]
+
+    parents = {start: None}
+    costs = {start: 0}
+    closed = set()
+    fringe = util.PriorityQueue()
+    fringe.push(start, abs(start[0] - gx) + abs(start[1] - gy))
+    while not fringe.isEmpty():
+        state = fringe.pop()
+        if state in closed:
+            continue
+        if problem.isGoalState(state):
+            break
+        closed.add(state)
+        problem._expanded += 1
+        x, y = state
+        for dx, dy in directions(state, parents[state]):
+            point = jump(x, y, dx, dy)
+            if point is None or point in closed:
+                continue
+            cost = costs[state] + abs(point[0] - x) + abs(point[1] - y)
+            if point not in costs or cost < costs[point]:
+                costs[point] = cost
+                parents[point] = state
+                fringe.push(point, cost + abs(point[0] - gx) + abs(point[1] - gy))
+    else:
+        return []
+
+    # Unfold the straight runs between jump points into moves
+    actions = []
+    state = goal
+    while parents[state] is not None:
+        parent = parents[state]
+        dx, dy = state[0] - parent[0], state[1] - parent[1]
+        steps = abs(dx) + abs(dy)
+        action = Actions.vectorToDirection((dx // steps, dy // steps))
+        actions.extend([action] * steps)
+        state = parent
+    actions.reverse()
+    return actions
+
+def approximateSize(obj, seen=None):
+    """
+    Roughly how many bytes obj takes, following tuples, lists, dicts and
+    instance attributes (including __slots__).  Used to turn a byte budget into a node budget.
+    """
+    import sys
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (tuple, list, set, frozenset)):
+        size += sum([approximateSize(item, seen) for item in obj])
+    elif isinstance(obj, dict):
+        size += sum([approximateSize(k, seen) + approximateSize(v, seen) for k, v in obj.items()])
+    else:
+        if hasattr(obj, '__dict__'):
+            size += approximateSize(obj.__dict__, seen)
+        for name in getattr(type(obj), '__slots__', ()):
+            size += approximateSize(getattr(obj, name, None), seen)
+    return size
+
+def nodeBudget(problem, maxNodes=None, maxBytes=None):
+    """
+    Returns (maxNodes, bytesPerNode) for a memory-bounded search: the node
+    budget is maxNodes, or as many nodes as fit in maxBytes, whichever is
+    smaller (None for no limit).  bytesPerNode estimates one search node
+    holding the start state.
+    """
+    bytesPerNode = approximateSize(SearchNode(problem.getStartState())) + 64
+    if maxBytes is not None:
+        byBytes = max(1, int(maxBytes) // bytesPerNode)
+        maxNodes = byBytes if maxNodes is None else min(int(maxNodes), byBytes)
+    elif maxNodes is not None:
+        maxNodes = int(maxNodes)
+    return maxNodes, bytesPerNode
+
+def iterativeDeepeningAStarSearch(problem, heuristic=nullHeuristic, maxNodes=None, maxBytes=None):
+    """
+    Depth-first searches bounded by f = g + h, raising the bound each time to
+    the smallest f that went over it.  Only the current path and the unvisited
+    siblings along it are kept, so memory grows with the solution's depth,
+    not with the number of states; the price is expanding the same nodes
+    again in every iteration.  States already on the path are skipped.
+
+    If the path and its pending siblings would exceed the node budget (see
+    nodeBudget), the branch is cut off.  A path found in that same pass is
+    still optimal, since the previous, complete pass ruled out every cheaper
+    one; but the cut branch has no f to offer the next bound, so raising the
+    bound past it could return a longer path as if it were optimal.  The
+    search therefore gives up and returns [] after the first pass that cut
+    off a branch.  Statistics are left on the problem:
+
+      _iterations:  number of depth-first passes
+      _reexpanded:  expansions of nodes already expanded in the previous pass
+      _peakNodes:   most nodes held at once, and _peakBytes its estimate
+      _cutoff:      whether the node budget cut off any branch
+    """
+    maxNodes, bytesPerNode = nodeBudget(problem, maxNodes, maxBytes)
+    problem._iterations = problem._reexpanded = problem._peakNodes = 0
+    problem._cutoff = False
+    infinity = float('inf')
+
+    start = problem.getStartState()
+    root = SearchNode(start)
+    bound = heuristic(start, problem)
+    previousBound = -1
+    while bound < infinity:
+        problem._iterations += 1
+        nextBound = infinity
+        onPath = set([start])
+        # Each frame is a node, its f value and its unexplored children
+        stack = [(root, bound, None)]
+        held = 1
+        while stack:
+            node, f, children = stack[-1]
+            if children is None:
+                if f > bound:
+                    nextBound = min(nextBound, f)
+                    stack.pop()
+                    held -= 1
+                    onPath.discard(node.state)
+                    continue
+                if problem.isGoalState(node.state):
+                    problem._peakBytes = problem._peakNodes * bytesPerNode
+                    return node.path()
+                if f <= previousBound:
+                    problem._reexpanded += 1
+                children = []
+                for nextState, action, cost in problem.getSuccessors(node.state):
+                    if nextState in onPath:
+                        continue
+                    child = node.child(nextState, action, cost)
+                    children.append((child.cost + heuristic(nextState, problem), len(children), child))
+                if maxNodes is not None and held + len(children) > maxNodes:
+                    problem._cutoff = True
+                    children = []
+                # Visit the most promising child first
+                children.sort(reverse=True)
+                held += len(children)
+                problem._peakNodes = max(problem._peakNodes, held)
+                stack[-1] = (node, f, children)
+            if children:
+                childF, _, child = children.pop()
+                onPath.add(child.state)
+                stack.append((child, childF, None))
+            else:
+                stack.pop()
+                held -= 1
+                onPath.discard(node.state)
+        if problem._cutoff:
+            break
+        previousBound, bound = bound, nextBound
+    problem._peakBytes = problem._peakNodes * bytesPerNode
+    return []
+
+class SMANode(SearchNode):
+    """
+    A node of the SMA* search tree, which also keeps its f value, depth,
+    live children and the best f of each child it has forgotten.
+    """
+    __slots__ = ('f', 'depth', 'children', 'forgotten', 'expanded', 'version')
+
+    def __init__(self, state, parent=None, action=None, cost=0, f=0):
+        SearchNode.__init__(self, state, parent, action, cost)
+        self.f = f
+        self.depth = 0 if parent is None else parent.depth + 1
+        self.children = None
+        self.forgotten = {}
+        self.expanded = False
+        self.version = 0
+
+    def isAncestor(self, state):
+        node = self
+        while node is not None:
+            if node.state == state:
+                return True
+            node = node.parent
+        return False
+
+def simplifiedMemoryBoundedAStarSearch(problem, heuristic=nullHeuristic, maxNodes=100000, maxBytes=None,
+                                       maxReexpansions=None):
+    """
+    SMA*: A* that keeps about maxNodes nodes (or as many as fit in
+    maxBytes; see nodeBudget).  When the tree is full, the leaf with the
+    highest f (the shallowest of those) is dropped, and its parent remembers
+    its f so that the subtree is regenerated only once everything cheaper
+    has been tried.  Nodes that could not be extended without exceeding the
+    budget get f = infinity.  A node's successors are added all at once, so
+    the tree can go over the budget by one expansion's worth of children
+    before the worst leaves are dropped again.  The budget covers the
+    search's own nodes; a heuristic that memoizes values (as foodHeuristic
+    does in problem.heuristicInfo) keeps its own memory.
+
+    It returns an optimal path whenever one fits within the budget, and []
+    when none does.  With a budget too small for the problem it expands
+    parts of the tree again and again; after maxReexpansions such
+    expansions (by default 100 * maxNodes) it gives up and returns [],
+    even if a path within the budget exists.
+    Statistics are left on the problem:
+
+      _reexpanded:   expansions of nodes whose children had been dropped
+      _forgotten:    nodes dropped to stay within the budget
+      _peakNodes:    most nodes held at once, and _peakBytes its estimate
+      _gaveUp:       whether the search stopped at maxReexpansions
+    """
+    import heapq
+
+    maxNodes, bytesPerNode = nodeBudget(problem, maxNodes, maxBytes)
+    infinity = float('inf')
+    if maxReexpansions is None and maxNodes is not None:
+        maxReexpansions = 100 * maxNodes
+    problem._reexpanded = problem._forgotten = 0
+    problem._gaveUp = False
+
+    start = problem.getStartState()
+    root = SMANode(start, f=heuristic(start, problem))
+    best, worst = [], []   # leaves by (f, -depth) and by (-f, depth)
+    pushes = [0]
+    def pushLeaf(node):
+        node.version += 1
+        pushes[0] += 1
+        heapq.heappush(best, (node.f, -node.depth, pushes[0], node.version, node))
+        heapq.heappush(worst, (-node.f, node.depth, pushes[0], node.version, node))
+    def isLive(entry):
+        node = entry[-1]
+        return entry[-2] == node.version and node.children is None
+    def compact(heap):
+        "Drops the stale entries, which would otherwise keep dropped nodes alive."
+        heap[:] = [entry for entry in heap if isLive(entry)]
+        heapq.heapify(heap)
+    pushLeaf(root)
+    held = problem._peakNodes = 1
+
+    while best:
+        entry = heapq.heappop(best)
+        if not isLive(entry):
+            continue
+        node = entry[-1]
+        if node.f == infinity:
+            break
+        if problem.isGoalState(node.state):
+            problem._peakBytes = problem._peakNodes * bytesPerNode
+            return node.path()
+
+        if node.expanded:
+            problem._reexpanded += 1
+            if maxReexpansions is not None and problem._reexpanded > maxReexpansions:
+                problem._gaveUp = True
+                break
+        node.expanded = True
+        node.version += 1
+        node.children = []
+        for nextState, action, cost in problem.getSuccessors(node.state):
+            if node.isAncestor(nextState):
+                continue
+            child = SMANode(nextState, node, action, node.cost + cost)
+            if maxNodes is not None and child.depth >= maxNodes - 1 and not problem.isGoalState(nextState):
+                child.f = infinity
+            else:
+                child.f = max(child.cost + heuristic(nextState, problem), node.f,
+                              node.forgotten.get(action, 0))
+            node.children.append(child)
+            pushLeaf(child)
+        node.forgotten = {}
+        held += len(node.children)
+        problem._peakNodes = max(problem._peakNodes, held)
+
+        if not node.children:
+            # A dead end: nothing below it can reach the goal
+            node.children = None
+            node.f = infinity
+            pushLeaf(node)
+        backUp(node.parent if not node.children else node)
+
+        # Drop the worst leaves until the tree fits again
+        while maxNodes is not None and held > maxNodes and worst:
+            entry = heapq.heappop(worst)
+            if not isLive(entry) or entry[-1] is root:
+                continue
+            leaf = entry[-1]
+            parent = leaf.parent
+            parent.children.remove(leaf)
+            parent.forgotten[leaf.action] = leaf.f
+            leaf.version += 1
+            held -= 1
+            problem._forgotten += 1
+            if not parent.children:
+                parent.children = None
+                parent.f = min(parent.forgotten.values())
+                pushLeaf(parent)
+
+        # Every live leaf has one live entry in each heap, and there are at
+        # most held leaves, so this keeps the heaps within a few times held
+        if len(best) > 2 * held + 16:
+            compact(best)
+        if len(worst) > 2 * held + 16:
+            compact(worst)
+    problem._peakBytes = problem._peakNodes * bytesPerNode
+    return []
+
+def backUp(node):
+    "Raises the f value of node and its ancestors to the best f below them."
+    while node is not None and node.children:
+        f = min([child.f for child in node.children] + list(node.forgotten.values()))
+        if f <= node.f:
+            break
+        node.f = f
+        node = node.parent
+
+def anytimeRepairingAStarSearch(problem, heuristic=nullHeuristic, timeLimit=1.0,
+                                startWeight=3.0, weightStep=0.5, onSolution=None):
+    """
+    ARA*: weighted A* searches with f = g + weight * h, starting at
+    startWeight and lowering the weight by weightStep down to 1 after each
+    solution.  Each pass reuses the previous one's costs and only
+    re-expands the states whose costs improved since, so the first plan
+    comes quickly and later ones refine it.
+
+    Whenever a pass improves the plan, its cost and suboptimality bound (it
+    costs at most bound times the optimum, for an admissible heuristic) are
+    recorded in problem._solutions as (cost, bound, seconds) and passed to
+    onSolution(actions, cost, bound) if given.  The search returns the best
+    plan once the bound reaches 1 or timeLimit seconds have passed, but
+    always runs until it has a first plan.
+    """
+    import heapq, time
+
+    startTime = time.time()
+    start = problem.getStartState()
+    costs = {start: 0}
+    parents = {start: None}
+    heuristics = {}
+    def h(state):
+        if state not in heuristics:
+            heuristics[state] = heuristic(state, problem)
+        return heuristics[state]
+
+    weight = max(1.0, float(startWeight))
+    fringe, queued, pushes = [], {}, [0]
+    def push(state):
+        key = costs[state] + weight * h(state)
+        queued[state] = key
+        pushes[0] += 1
+        heapq.heappush(fringe, (key, pushes[0], state))
+    def minKey():
+        while fringe and queued.get(fringe[0][2]) != fringe[0][0]:
+            heapq.heappop(fringe)
+        return fringe[0][0] if fringe else float('inf')
+
+    push(start)
+    closed, inconsistent = set(), set()
+    goal, goalCost = None, float('inf')
+    problem._solutions = []
+    while True:
+        # Improve the plan with the current weight
+        while minKey() < goalCost:
+            if goal is not None and time.time() - startTime > timeLimit:
+                return pathTo(parents, goal)
+            key, _, state = heapq.heappop(fringe)
+            del queued[state]
+            if problem.isGoalState(state):
+                goal, goalCost = state, costs[state]
+                continue
+            closed.add(state)
+            for nextState, action, stepCost in problem.getSuccessors(state):
+                nextCost = costs[state] + stepCost
+                if nextState not in costs or nextCost < costs[nextState]:
+                    costs[nextState] = nextCost
+                    parents[nextState] = (state, action)
+                    if nextState in closed:
+                        inconsistent.add(nextState)
+                    else:
+                        push(nextState)
+        if goal is None:
+            return []
+
+        # The optimum is at least the lowest g + h still waiting to be expanded
+        waiting = list(queued) + list(inconsistent)
+        lowest = min([costs[s] + h(s) for s in waiting] + [goalCost])
+        bound = min(weight, goalCost / lowest) if lowest > 0 else weight
+        actions = pathTo(parents, goal)
+        if not problem._solutions or (goalCost, bound) < problem._solutions[-1][:2]:
+            problem._solutions.append((goalCost, bound, time.time() - startTime))
+            if onSolution is not None:
+                onSolution(actions, goalCost, bound)
+        if bound <= 1 or time.time() - startTime > timeLimit:
+            return actions
+
+        # Lower the weight and requeue everything that is out of date
+        weight = max(1.0, weight - weightStep)
+        for state in inconsistent:
+            queued[state] = None
+        fringe, pushes[0] = [], 0
+        for state in list(queued):
+            push(state)
+        closed, inconsistent = set(), set()
+
+def pathTo(parents, state):
+    "Follows the (parent, action) links from state back to the start."
+    actions = []
+    while parents[state] is not None:
+        state, action = parents[state]
+        actions.append(action)
+    actions.reverse()
+    return actions
+
 # Abbreviations
 bfs = breadthFirstSearch
 dfs = depthFirstSearch
 astar = aStarSearch
 ucs = uniformCostSearch
+bibfs = bidirectionalSearch
+biastar = bidirectionalAStarSearch
+jps = jumpPointSearch
+idastar = iterativeDeepeningAStarSearch
+smastar = simplifiedMemoryBoundedAStarSearch
+arastar = anytimeRepairingAStarSearch
@@ -37,9 +37,14 @@ Good luck and happy searching!
 from game import Directions
 from game import Agent
 from game import Actions
+from game import BitGrid
 import util
 import time
 import search
+import distanceCalculator
+import junctionGraph
+import heuristicCache
+import distanceField
 
 class GoWestAgent(Agent):
     "An agent that goes West until it can't."
@@ -151,8 +156,10 @@ class PositionSearchProblem(search.SearchProblem):
         gameState: A GameState object (pacman.py)
         costFn: A function from a search state (tuple) to a non-negative number
         goal: A position in the gameState
+        visualize: False skips the bookkeeping for drawing expanded cells
         """
         self.walls = gameState.getWalls()
+        self.moves = distanceField.getDistanceField(self.walls).moves
         self.startState = gameState.getPacmanPosition()
         if start != None: self.startState = start
         self.goal = goal
@@ -192,24 +199,37 @@ class PositionSearchProblem(search.SearchProblem):
          cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            x,y = state
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            if not self.walls[nextx][nexty]:
-                nextState = (nextx, nexty)
-                cost = self.costFn(nextState)
-                successors.append( ( nextState, action, cost) )
+        costFn = self.costFn
+        successors = [(nextState, action, costFn(nextState)) for nextState, action in self.moves[state]]
 
         # Bookkeeping for display purposes
         self._expanded += 1 # DO NOT CHANGE
-        if state not in self._visited:
+        if self.visualize and state not in self._visited:
             self._visited[state] = True
             self._visitedlist.append(state)
 
         return successors
 
+    def getGoalState(self):
+        return self.goal
+
+    def getPredecessors(self, state):
+        """
+        Returns the states one move away from state, for searching backwards
+        from the goal: triples (predecessor, action, stepCost), where 'action'
+        leads from the predecessor to state at a cost of 'stepCost'.
+        """
+        cost = self.costFn(state)
+        predecessors = [(prev, Directions.REVERSE[action], cost) for prev, action in self.moves[state]]
+
+        # Backward expansions count just like forward ones
+        self._expanded += 1
+        if self.visualize and state not in self._visited:
+            self._visited[state] = True
+            self._visitedlist.append(state)
+
+        return predecessors
+
     def getCostOfActions(self, actions):
         """
         Returns the cost of a particular sequence of actions. If those actions
@@ -226,6 +246,40 @@ class PositionSearchProblem(search.SearchProblem):
             cost += self.costFn((x,y))
         return cost
 
+class JunctionSearchAgent(SearchAgent):
+    """
+    A SearchAgent for PositionSearchProblems that runs its search function
+    on the maze's junction graph (see junctionGraph.py), so corridors cost one
+    expansion each instead of one per cell:
+
+    python pacman.py -l bigMaze -p JunctionSearchAgent -a fn=ucs
+    """
+    def __init__(self, fn='uniformCostSearch', heuristic='nullHeuristic'):
+        SearchAgent.__init__(self, fn, 'PositionSearchProblem', heuristic)
+        func = self.searchFunction
+        self.searchFunction = lambda problem: junctionGraph.junctionSearch(problem, func)
+
+class AnytimeSearchAgent(SearchAgent):
+    """
+    A SearchAgent that plans with anytime repairing A* (search.arastar) for at
+    most timeLimit seconds, printing each plan it finds with its bound on how
+    far from optimal it may be:
+
+    python pacman.py -l bigMaze -p AnytimeSearchAgent -a heuristic=manhattanHeuristic,timeLimit=0.1
+    """
+    def __init__(self, prob='PositionSearchProblem', heuristic='nullHeuristic',
+                 timeLimit=1.0, startWeight=3.0, weightStep=0.5):
+        SearchAgent.__init__(self, 'arastar', prob, heuristic)
+        if heuristic in globals().keys():
+            heur = globals()[heuristic]
+        else:
+            heur = getattr(search, heuristic)
+        def published(actions, cost, bound):
+            print('[AnytimeSearchAgent] plan of cost %d, at most %.3f times optimal' % (cost, bound))
+        self.searchFunction = lambda problem: search.arastar(problem, heur, float(timeLimit),
+                                                             float(startWeight), float(weightStep),
+                                                             published)
+
 class StayEastSearchAgent(SearchAgent):
     """
     An agent for position search with a cost function that penalizes being in
@@ -271,6 +325,12 @@ class CornersProblem(search.SearchProblem):
     This search problem finds paths through all four corners of a layout.
 
     You must select a suitable state space and successor function
+
+    A state is a single int, cellId * 16 + visited: the id of Pacman's cell
+    (an index into self.cells) and a 4-bit mask of the corners visited so
+    far (bit i for self.corners[i]).  Use positionOf and visitedOf to take
+    one apart.  The moves out of every cell and the maze distances from
+    every cell to every corner are worked out once, here.
     """
 
     def __init__(self, startingGameState):
@@ -289,6 +349,53 @@ class CornersProblem(search.SearchProblem):
         # in initializing the problem
         #"*** YOUR CODE HERE ***"
 
+        self.cells = self.walls.asList(False)
+        self.cellIds = dict((pos, i) for i, pos in enumerate(self.cells))
+        # The corner bits set by entering each cell
+        self.cornerBits = [0] * len(self.cells)
+        for i, corner in enumerate(self.corners):
+            if corner in self.cellIds:
+                self.cornerBits[self.cellIds[corner]] |= 1 << i
+        # (action, next cell id) for the legal moves out of each cell
+        self.moves = []
+        for x, y in self.cells:
+            moves = []
+            for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
+                dx, dy = Actions.directionToVector(action)
+                nextPosition = (int(x + dx), int(y + dy))
+                if nextPosition in self.cellIds:
+                    moves.append((action, self.cellIds[nextPosition]))
+            self.moves.append(moves)
+
+        # cornerDistances[i][cell id]: maze distance from corner i to the cell
+        self.cornerDistances = [self._distancesFrom(corner) for corner in self.corners]
+        self.tours = heldKarpTours([[self.cornerDistances[i][self.cellIds[c]] if c in self.cellIds
+                                     else CORNER_UNREACHABLE for c in self.corners]
+                                    for i in range(4)])
+
+    def _distancesFrom(self, position):
+        "Breadth-first maze distances from position to every cell, by cell id."
+        distances = [CORNER_UNREACHABLE] * len(self.cells)
+        if position not in self.cellIds:
+            return distances
+        start = self.cellIds[position]
+        distances[start] = 0
+        frontier = [start]
+        while frontier:
+            nextFrontier = []
+            for cell in frontier:
+                for action, nextCell in self.moves[cell]:
+                    if distances[nextCell] == CORNER_UNREACHABLE:
+                        distances[nextCell] = distances[cell] + 1
+                        nextFrontier.append(nextCell)
+            frontier = nextFrontier
+        return distances
+
+    def positionOf(self, state):
+        return self.cells[state >> 4]
+
+    def visitedOf(self, state):
+        return state & 15
 
     def getStartState(self):
         """
@@ -296,15 +403,15 @@ class CornersProblem(search.SearchProblem):
         space)
         """
         #"*** YOUR CODE HERE ***"
-        visited = tuple([True if c == self.startingPosition else False for c in self.corners])
-        return (self.startingPosition, visited)
+        cell = self.cellIds[self.startingPosition]
+        return (cell << 4) | self.cornerBits[cell]
 
     def isGoalState(self, state):
         """
         Returns whether this search state is a goal state of the problem.
         """
         #"*** YOUR CODE HERE ***"
-        return all(state[1])
+        return state & 15 == 15
 
     def getSuccessors(self, state):
         """
@@ -317,18 +424,10 @@ class CornersProblem(search.SearchProblem):
             is the incremental cost of expanding to that successor
         """
 
-        successors = []
-        for action in [Directions.NORTH, Directions.SOUTH, Directions.EAST, Directions.WEST]:
-            # Add a successor state to the successor list if the action is legal
-            # Here's a code snippet for figuring out whether a new position hits a wall:
-            x,y = state[0]
-            dx, dy = Actions.directionToVector(action)
-            nextx, nexty = int(x + dx), int(y + dy)
-            hitsWall = self.walls[nextx][nexty]
-            if not hitsWall:
-                newPosition = (nextx, nexty)
-                visited = tuple([state[1][i] or (newPosition == self.corners[i]) for i in range(4)])
-                successors.append(((newPosition, visited), action, 1))
+        visited = state & 15
+        cornerBits = self.cornerBits
+        successors = [(((nextCell << 4) | visited | cornerBits[nextCell]), action, 1)
+                      for action, nextCell in self.moves[state >> 4]]
         self._expanded += 1 # DO NOT CHANGE
         return successors
 
@@ -345,6 +444,28 @@ class CornersProblem(search.SearchProblem):
             if self.walls[x][y]: return 999999
         return len(actions)
 
+CORNER_UNREACHABLE = 1000000
+
+def heldKarpTours(distances):
+    """
+    Held-Karp over the corners: returns tours[mask][i], the length of the
+    shortest walk that starts at corner i and visits every corner in mask
+    (which includes i), given the corner-to-corner distances.
+    """
+    n = len(distances)
+    tours = [[CORNER_UNREACHABLE] * n for mask in range(1 << n)]
+    for mask in range(1, 1 << n):
+        for i in range(n):
+            if not mask & (1 << i):
+                continue
+            rest = mask & ~(1 << i)
+            if rest == 0:
+                tours[mask][i] = 0
+            else:
+                tours[mask][i] = min([distances[i][j] + tours[rest][j]
+                                      for j in range(n) if rest & (1 << j)])
+    return tours
+
 
 def cornersHeuristic(state, problem):
     """
@@ -364,14 +485,15 @@ def cornersHeuristic(state, problem):
 
     #"*** YOUR CODE HERE ***"
 
-    if all(state[1]):
+    # The shortest walk through the unvisited corners in the best order,
+    # from the precomputed maze distances: exact, so also consistent
+    unvisited = 15 & ~state
+    if unvisited == 0:
         return 0
-    else:
-        distances = []
-        for i in range(4):
-            if not state[1][i]:
-                distances.append(util.manhattanDistance(state[0], problem.corners[i]))
-        return max(distances)
+    cell = state >> 4
+    tours = problem.tours[unvisited]
+    return min([problem.cornerDistances[i][cell] + tours[i]
+                for i in range(4) if unvisited & (1 << i)])
 
 class AStarCornersAgent(SearchAgent):
     "A SearchAgent for FoodSearchProblem using A* and your foodHeuristic"
@@ -386,10 +508,10 @@ class FoodSearchProblem:
 
     A search state in this problem is a tuple ( pacmanPosition, foodGrid ) where
       pacmanPosition: a tuple (x,y) of integers specifying Pacman's position
-      foodGrid:       a Grid (see game.py) of either True or False, specifying remaining food
+      foodGrid:       a BitGrid (see game.py) of either True or False, specifying remaining food
     """
     def __init__(self, startingGameState):
-        self.start = (startingGameState.getPacmanPosition(), startingGameState.getFood())
+        self.start = (startingGameState.getPacmanPosition(), BitGrid.fromGrid(startingGameState.getFood()))
         self.walls = startingGameState.getWalls()
         self.startingGameState = startingGameState
         self._expanded = 0 # DO NOT CHANGE
@@ -410,8 +532,7 @@ class FoodSearchProblem:
             dx, dy = Actions.directionToVector(direction)
             nextx, nexty = int(x + dx), int(y + dy)
             if not self.walls[nextx][nexty]:
-                nextFood = state[1].copy()
-                nextFood[nextx][nexty] = False
+                nextFood = state[1].cleared(nextx, nexty)
                 successors.append( ( ((nextx, nexty), nextFood), direction, 1) )
         return successors
 
@@ -435,6 +556,26 @@ class AStarFoodSearchAgent(SearchAgent):
         self.searchFunction = lambda prob: search.aStarSearch(prob, foodHeuristic)
         self.searchType = FoodSearchProblem
 
+class MemoryBoundedFoodSearchAgent(SearchAgent):
+    """
+    A SearchAgent for FoodSearchProblem using foodHeuristic and IDA* or SMA*
+    within a node or byte budget, which reports the memory the search used:
+
+    python pacman.py -l trickySearch -p MemoryBoundedFoodSearchAgent -a fn=smastar,maxNodes=2000
+    """
+    def __init__(self, fn='smastar', maxNodes=None, maxBytes=None):
+        func = getattr(search, fn)
+        def run(prob):
+            self.problem = prob # kept for the memory report
+            return func(prob, foodHeuristic, maxNodes=maxNodes, maxBytes=maxBytes)
+        self.searchFunction = run
+        self.searchType = FoodSearchProblem
+
+    def registerInitialState(self, state):
+        SearchAgent.registerInitialState(self, state)
+        print('Peak nodes held: %d (about %d KiB), re-expansions: %d' %
+              (self.problem._peakNodes, self.problem._peakBytes // 1024, self.problem._reexpanded))
+
 def foodHeuristic(state, problem):
     """
     Your heuristic for the FoodSearchProblem goes here.
@@ -465,34 +606,30 @@ def foodHeuristic(state, problem):
     """
     #"*** YOUR CODE HERE ***"
 
-    position, foodGrid = state
-
-
-    cost = []
-
-    cost.append(state[1].count())
-
-    l = foodGrid.asList()
-
-    #cost.extend([util.manhattanDistance(position, loc) for loc in l])
-    cost.extend([mazeDistance(position, loc, problem.startingGameState) for loc in l])
-
-    return max(cost)
+    # Distances, spanning trees and values are cached in problem.heuristicInfo
+    return heuristicCache.getFoodHeuristicCache(problem).value(state)
 
 class ClosestDotSearchAgent(SearchAgent):
     "Search for all food using a sequence of searches"
     def registerInitialState(self, state):
+        """
+        Plans the whole tour with one reusable DistanceField (distanceField.py):
+        each segment is a breadth-first sweep from where the last one ended,
+        the same path findPathToClosestDot would return, and is checked
+        against the walls instead of being replayed through GameStates.
+        """
         self.actions = []
-        currentState = state
-        while(currentState.getFood().count() > 0):
-            nextPathSegment = self.findPathToClosestDot(currentState) # The missing piece
+        field = distanceField.getDistanceField(state.getWalls())
+        food = set(state.getFood().asList())
+        position = state.getPacmanPosition()
+        food.discard(position)
+        while len(food) > 0:
+            nextPathSegment = field.closestPath(position, food)
+            if nextPathSegment is None:
+                break # The rest of the food cannot be reached
             self.actions += nextPathSegment
-            for action in nextPathSegment:
-                legal = currentState.getLegalActions()
-                if action not in legal:
-                    t = (str(action), str(currentState))
-                    raise Exception('findPathToClosestDot returned an illegal move: %s!\n%s' % t)
-                currentState = currentState.generateSuccessor(0, action)
+            for position in field.follow(position, nextPathSegment):
+                food.discard(position)
         self.actionIndex = 0
         print('Path found with cost %d.' % len(self.actions))
 
@@ -534,6 +671,8 @@ class AnyFoodSearchProblem(PositionSearchProblem):
         self.walls = gameState.getWalls()
         self.startState = gameState.getPacmanPosition()
         self.costFn = lambda x: 1
+        self.moves = distanceField.getDistanceField(self.walls).moves
+        self.visualize = True
         self._visited, self._visitedlist, self._expanded = {}, [], 0 # DO NOT CHANGE
 
     def isGoalState(self, state):
@@ -548,9 +687,13 @@ class AnyFoodSearchProblem(PositionSearchProblem):
 
 def mazeDistance(point1, point2, gameState):
     """
-    Returns the maze distance between any two points, using the search functions
-    you have already built. The gameState can be any game state -- Pacman's
-    position in that state is ignored.
+    Returns the maze distance between any two points.  The gameState can be
+    any game state -- Pacman's position in that state is ignored.
+
+    Distances come from the all-pairs table in distanceCalculator.py, which is
+    computed once per layout, so each call is a constant-time lookup.  As
+    with the length of a breadth-first search path, points that cannot reach
+    each other are 0 apart.
 
     Example usage: mazeDistance( (2,4), (5,6), gameState)
 
@@ -561,5 +704,7 @@ def mazeDistance(point1, point2, gameState):
     walls = gameState.getWalls()
     assert not walls[x1][y1], 'point1 is a wall: ' + str(point1)
     assert not walls[x2][y2], 'point2 is a wall: ' + str(point2)
-    prob = PositionSearchProblem(gameState, start=point1, goal=point2, warn=False, visualize=False)
-    return len(search.bfs(prob))
+    distance = distanceCalculator.getMazeDistances(walls).distance(point1, point2)
+    if distance == distanceCalculator.UNREACHABLE:
+        return 0
+    return distance
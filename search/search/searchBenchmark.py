@@ -0,0 +1,146 @@
+# searchBenchmark.py
+# ------------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+Measures the throughput of the search algorithms in search.py on the bundled
+mazes.  For every layout in layouts/ that holds a single food pellet, each
+algorithm is asked for a path from Pacman to that pellet, and the script
+reports expanded nodes, nodes per second and peak memory:
+
+> python searchBenchmark.py
+> python searchBenchmark.py -l bigMaze,openMaze -f bfs,astar
+> python searchBenchmark.py -f bfs,bibfs,astar,biastar,jps
+> python searchBenchmark.py -f ucs,astar -g
+
+With -g each function also runs on the maze's junction graph (see
+junctionGraph.py), reported as e.g. ucs/jg.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import layout
+import pacman
+import search
+import searchAgents
+import junctionGraph
+
+ALGORITHMS = ['dfs', 'bfs', 'ucs', 'astar']
+
+def mazeLayouts(names=None):
+    """
+    Returns (name, Layout) pairs for the requested layouts, or for every
+    bundled layout that contains exactly one food pellet.
+    """
+    if names is None:
+        names = sorted(f[:-4] for f in os.listdir('layouts') if f.endswith('.lay'))
+        requested = False
+    else:
+        requested = True
+    mazes = []
+    for name in names:
+        lay = layout.getLayout(name)
+        if lay is None:
+            raise Exception('The layout ' + name + ' cannot be found')
+        if requested or lay.totalFood == 1:
+            mazes.append((name, lay))
+    return mazes
+
+def startState(lay):
+    "Returns the initial GameState for a layout, without any ghosts."
+    state = pacman.GameState()
+    state.initialize(lay, 0)
+    return state
+
+def positionProblem(gameState):
+    "A PositionSearchProblem from Pacman to the (first) food pellet."
+    goal = gameState.getFood().asList()[0]
+    return searchAgents.PositionSearchProblem(gameState, goal=goal, warn=False, visualize=False)
+
+def searchFunction(name):
+    func = getattr(search, name)
+    if name in ('astar', 'aStarSearch', 'biastar', 'bidirectionalAStarSearch'):
+        return lambda problem: func(problem, searchAgents.manhattanHeuristic)
+    return func
+
+def timeSearch(func, makeProblem, repeat=3):
+    """
+    Runs func on a fresh problem 'repeat' times and returns the best
+    wall-clock time, the number of expanded nodes and the path found.
+    """
+    best = None
+    for i in range(repeat):
+        problem = makeProblem()
+        start = time.perf_counter()
+        path = func(problem)
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best, problem._expanded, path
+
+def peakMemory(func, makeProblem):
+    "Returns the peak number of bytes allocated while func searches."
+    problem = makeProblem()
+    tracemalloc.start()
+    try:
+        func(problem)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def runBenchmark(mazes, algorithms, repeat=3, out=sys.stdout, junctions=False):
+    runs = []
+    for algorithm in algorithms:
+        func = searchFunction(algorithm)
+        runs.append((algorithm, func))
+        if junctions:
+            runs.append((algorithm + '/jg',
+                         lambda problem, func=func: junctionGraph.junctionSearch(problem, func)))
+    rows = []
+    print('%-18s %-10s %8s %8s %12s %10s %10s' % ('layout', 'fn', 'cost', 'expanded',
+                                                  'nodes/sec', 'time(ms)', 'peak(KiB)'), file=out)
+    for name, lay in mazes:
+        gameState = startState(lay)
+        makeProblem = lambda: positionProblem(gameState)
+        for algorithm, func in runs:
+            elapsed, expanded, path = timeSearch(func, makeProblem, repeat)
+            peak = peakMemory(func, makeProblem)
+            rate = expanded / elapsed if elapsed > 0 else float('inf')
+            row = (name, algorithm, len(path), expanded, rate, elapsed * 1000, peak / 1024.0)
+            print('%-18s %-10s %8d %8d %12.0f %10.2f %10.1f' % row, file=out)
+            rows.append(row)
+    return rows
+
+def readCommand(argv):
+    from optparse import OptionParser
+    parser = OptionParser('USAGE: python searchBenchmark.py <options>')
+    parser.add_option('-l', '--layouts', dest='layouts', default=None,
+                      help='comma separated layouts to run (default: every single-food maze)')
+    parser.add_option('-f', '--functions', dest='functions', default=','.join(ALGORITHMS),
+                      help='comma separated search functions from search.py (default: %default)')
+    parser.add_option('-r', '--repeat', dest='repeat', type='int', default=3,
+                      help='timed runs per search; the best is reported (default: %default)')
+    parser.add_option('-g', '--junctions', action='store_true', dest='junctions', default=False,
+                      help='also run each function on the junction graph of the maze')
+    options, otherjunk = parser.parse_args(argv)
+    if len(otherjunk) != 0:
+        raise Exception('Command line input not understood: ' + str(otherjunk))
+    layouts = options.layouts.split(',') if options.layouts else None
+    return mazeLayouts(layouts), options.functions.split(','), options.repeat, options.junctions
+
+if __name__ == '__main__':
+    mazes, algorithms, repeat, junctions = readCommand(sys.argv[1:])
+    runBenchmark(mazes, algorithms, repeat, junctions=junctions)
@@ -0,0 +1,116 @@
+# beliefEngine.py
+# ---------------
+# Licensing Information:  You are free to use or extend these projects for
+# educational purposes provided that (1) you do not distribute or publish
+# solutions, (2) you retain this notice, and (3) you provide clear
+# attribution to UC Berkeley, including a link to http://ai.berkeley.edu.
+#
+# Attribution Information: The Pacman AI projects were developed at UC Berkeley.
+# The core projects and autograders were primarily created by John DeNero
+# (denero@cs.berkeley.edu) and Dan Klein (klein@cs.berkeley.edu).
+# Student side autograding was added by Brad Miller, Nick Hay, and
+# Pieter Abbeel (pabbeel@cs.berkeley.edu).
+
+
+"""
+NumPy machinery for exact inference (see VectorizedExactInference in
+inference.py).  A belief is a vector over a fixed list of ghost positions,
+and the two steps of the forward algorithm become array operations:
+
+  elapse:   a sparse matrix-vector product with the ghost's transition
+            model, which is built once for each Pacman position from
+            InferenceModule.getPositionDistribution and then reused.
+  observe:  an elementwise product with the likelihoods of the noisy
+            distance, looked up in a table of P(noisy | true distance).
+"""
+
+import numpy as np
+
+import busters
+from inference import DiscreteDistribution
+
+
+class BeliefEngine:
+    """
+    Beliefs over 'positions', one of which is the ghost's jail.
+    """
+
+    def __init__(self, positions, jailPosition):
+        self.positions = list(positions)
+        self.positionIndex = dict((pos, i) for i, pos in enumerate(self.positions))
+        self.xs = np.array([x for x, y in self.positions])
+        self.ys = np.array([y for x, y in self.positions])
+        self.isJail = np.zeros(len(self.positions), dtype=bool)
+        self.isJail[self.positionIndex[jailPosition]] = True
+
+        # observationTable[noisy, true] = P(noisy | true)
+        maxDistance = int((self.xs.max() - self.xs.min()) + (self.ys.max() - self.ys.min()))
+        self.observationTable = np.array([[busters.getObservationProbability(noisy, true)
+                                           for true in range(maxDistance + 1)]
+                                          for noisy in range(maxDistance + int(busters.SONAR_MAX) + 1)])
+
+        # Pacman position -> (old position indices, new position indices, probabilities)
+        self.transitions = {}
+
+    def uniform(self, legalPositions):
+        "A uniform belief over legalPositions."
+        beliefs = np.zeros(len(self.positions))
+        for pos in legalPositions:
+            beliefs[self.positionIndex[pos]] = 1.0
+        return normalize(beliefs)
+
+    def likelihoods(self, noisyDistance, pacmanPosition):
+        "P(noisyDistance | ghost at each position), as getObservationProb computes it."
+        if noisyDistance is None:
+            return self.isJail.astype(float)
+        px, py = pacmanPosition
+        trueDistances = np.abs(self.xs - px) + np.abs(self.ys - py)
+        # Noisy distances are whole numbers, but may come as floats
+        row = int(noisyDistance)
+        if row == noisyDistance and row < self.observationTable.shape[0]:
+            byTrueDistance = self.observationTable[row]
+        else:
+            byTrueDistance = np.array([busters.getObservationProbability(noisyDistance, true)
+                                       for true in range(self.observationTable.shape[1])])
+        likelihoods = byTrueDistance[trueDistances]
+        likelihoods[self.isJail] = 0.0
+        return likelihoods
+
+    def observe(self, beliefs, noisyDistance, pacmanPosition):
+        return normalize(beliefs * self.likelihoods(noisyDistance, pacmanPosition))
+
+    def transitionModel(self, pacmanPosition, positionDistribution):
+        """
+        Returns the ghost's transition model while Pacman is at
+        pacmanPosition as parallel arrays (from, to, probability), asking
+        positionDistribution(pos) for the distribution of each position the
+        first time.  Moves to positions outside the belief are dropped.
+        """
+        if pacmanPosition not in self.transitions:
+            old, new, probs = [], [], []
+            for i, pos in enumerate(self.positions):
+                for nextPos, prob in positionDistribution(pos).items():
+                    if nextPos in self.positionIndex:
+                        old.append(i)
+                        new.append(self.positionIndex[nextPos])
+                        probs.append(prob)
+            self.transitions[pacmanPosition] = (np.array(old, dtype=np.intp),
+                                                np.array(new, dtype=np.intp),
+                                                np.array(probs, dtype=float))
+        return self.transitions[pacmanPosition]
+
+    def elapse(self, beliefs, pacmanPosition, positionDistribution):
+        old, new, probs = self.transitionModel(pacmanPosition, positionDistribution)
+        return normalize(np.bincount(new, weights=probs * beliefs[old], minlength=len(beliefs)))
+
+    def toDistribution(self, beliefs):
+        "The belief vector as a DiscreteDistribution."
+        return DiscreteDistribution(zip(self.positions, beliefs.tolist()))
+
+
+def normalize(beliefs):
+    "Scales beliefs to sum to 1, leaving them alone if they sum to 0."
+    total = beliefs.sum()
+    if total > 0:
+        return beliefs / total
+    return beliefs
@@ -160,7 +160,7 @@ class GameState:
         return self.data.capsules
 
     def getNumFood( self ):
-        return self.data.food.count()
+        return self.data.numFood
 
     def getFood(self):
         """
@@ -473,6 +473,8 @@ def readCommand( argv ):
                       help='Renders the ghosts in the display (cheating)', default=False)
     parser.add_option('-t', '--frameTime', dest='frameTime', type='float',
                       help=default('Time to delay between frames; <0 means keyboard'), default=0.1)
+    parser.add_option('-j', '--jobs', dest='jobs', type='int',
+                      help=default('Worker processes to play the games on (0: play them here)'), default=0)
 
     options, otherjunk = parser.parse_args()
     if len(otherjunk) != 0:
@@ -503,6 +505,7 @@ def readCommand( argv ):
                                                                   options.showGhosts, \
                                                                   frameTime = options.frameTime)
     args['numGames'] = options.numGames
+    args['jobs'] = options.jobs
 
     return args
 
@@ -529,7 +532,28 @@ def loadAgent(pacman, nographics):
                 return getattr(module, pacman)
     raise Exception('The agent ' + pacman + ' is not specified in any *Agents.py.')
 
-def runGames( layout, pacman, ghosts, display, numGames, maxMoves=-1):
+def runParallelGames( rules, layout, pacman, ghosts, display, numGames, maxMoves, jobs ):
+    """
+    Plays the games on 'jobs' worker processes (see parallelGames.py) and
+    returns them in order.  They are not displayed.
+    """
+    import __main__
+    import parallelGames
+    import textDisplay
+
+    def newGame(i):
+        nullDisplay = textDisplay.NullGraphics()
+        __main__.__dict__['_display'] = nullDisplay
+        return rules.newGame( layout, pacman, ghosts, nullDisplay, maxMoves )
+
+    agents = [pacman] + ghosts
+    games = {}
+    for i, game in parallelGames.playGames(newGame, range(numGames), jobs, random.getrandbits(32)):
+        game.agents, game.display, game.rules = agents, display, rules
+        games[i] = game
+    return [games[i] for i in range(numGames)]
+
+def runGames( layout, pacman, ghosts, display, numGames, maxMoves=-1, jobs=0):
     # Hack for agents writing to the display
     import __main__
     __main__.__dict__['_display'] = display
@@ -537,7 +561,9 @@ def runGames( layout, pacman, ghosts, display, numGames, maxMoves=-1):
     rules = BustersGameRules()
     games = []
 
-    for i in range( numGames ):
+    if jobs > 0:
+        games = runParallelGames(rules, layout, pacman, ghosts, display, numGames, maxMoves, jobs)
+    for i in range( len(games), numGames ):
         game = rules.newGame( layout, pacman, ghosts, display, maxMoves )
         game.run()
         games.append(game)
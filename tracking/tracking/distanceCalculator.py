@@ -16,7 +16,12 @@
 This file contains a Distancer object which computes and
 caches the shortest path between any two points in the maze. It
 returns a Manhattan distance between two points if the maze distance
-has not yet been calculated.
+has not yet been calculated.  The distances themselves come from the
+layout-keyed MazeDistances oracle at the bottom of this file, which
+search heuristics and evaluation functions can also use directly:
+
+oracle = getMazeDistances(gameState.getWalls())
+oracle.distance( (1,1), (10,10) )
 
 Example:
 distancer = Distancer(gameState.data.layout)
@@ -31,6 +36,7 @@ distances.
 """
 
 import threading, sys, time, random
+import array, hashlib, os, pickle
 
 class Distancer:
   def __init__(self, layout, background=True, default=10000):
@@ -75,11 +81,10 @@ class Distancer:
     return bestDistance
 
   def getDistanceOnGrid(self, pos1, pos2):
-    key = (pos1, pos2)
-    if key in self._distances:
-      return self._distances[key]
-    else:
-      raise Exception("Positions not in grid: " + str(key))
+    try:
+      return self._distances.distance(pos1, pos2)
+    except KeyError:
+      raise Exception("Positions not in grid: " + str((pos1, pos2)))
 
   def isReadyForMazeDistance(self):
     return self._distances != None
@@ -143,49 +148,138 @@ class DistanceCalculator(threading.Thread):
     self.distancer._distances = distances
 
 def computeDistances(layout):
-    distances = {}
-    allNodes = layout.walls.asList(False)
-    for source in allNodes:
-        dist = {}
-        closed = {}
-        for node in allNodes:
-            dist[node] = 1000000000
-        import util
-        queue = util.PriorityQueue()
-        queue.push(source, 0)
-        dist[source] = 0
-        while not queue.isEmpty():
-            node = queue.pop()
-            if node in closed:
-                continue
-            closed[node] = True
-            nodeDist = dist[node]
-            adjacent = []
-            x, y = node
-            if not layout.isWall((x,y+1)):
-                adjacent.append((x,y+1))
-            if not layout.isWall((x,y-1)):
-                adjacent.append((x,y-1) )
-            if not layout.isWall((x+1,y)):
-                adjacent.append((x+1,y) )
-            if not layout.isWall((x-1,y)):
-                adjacent.append((x-1,y))
-            for other in adjacent:
-                if not other in dist:
-                    continue
-                oldDist = dist[other]
-                newDist = nodeDist+1
-                if newDist < oldDist:
-                    dist[other] = newDist
-                    queue.push(other, newDist)
-        for target in allNodes:
-            distances[(target, source)] = dist[target]
-    return distances
+    "Returns the MazeDistances oracle for a layout (see getMazeDistances)."
+    return getMazeDistances(layout.walls)
 
 
 def getDistanceOnGrid(distances, pos1, pos2):
-    key = (pos1, pos2)
-    if key in distances:
-      return distances[key]
-    return 100000
+    try:
+      return distances.distance(pos1, pos2)
+    except KeyError:
+      return 100000
+
+###########################################
+# ALL-PAIRS MAZE DISTANCES, COMPUTED ONCE #
+###########################################
+
+UNREACHABLE = 1000000000
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.mazeDistances')
+CACHE_VERSION = 1
+
+_oracles = {}
+_lastLookup = (None, None) # (walls, oracle) of the most recent lookup
+
+class MazeDistances:
+    """
+    Shortest path lengths between every pair of open cells in a maze.
+
+    Each open cell gets an integer id (its index in walls.asList(False)), and
+    the distances are kept in one flat array of ints where the distance from
+    cell i to cell j is entry i * numCells + j.  Cells that cannot reach each
+    other are UNREACHABLE apart.  Build one with getMazeDistances(walls) so
+    that every caller on the same maze shares it.
+    """
+    def __init__(self, walls, cells=None, distances=None):
+        self.width, self.height = walls.width, walls.height
+        if cells is None:
+            cells = walls.asList(False)
+        self.cells = cells
+        self.cellIds = dict((pos, i) for i, pos in enumerate(cells))
+        self.numCells = len(cells)
+        if distances is None:
+            distances = self._allPairsBFS(walls)
+        self.distances = distances
+
+    def _allPairsBFS(self, walls):
+        cellIds = self.cellIds
+        neighbors = []
+        for x, y in self.cells:
+            adjacent = [(x, y + 1), (x, y - 1), (x + 1, y), (x - 1, y)]
+            neighbors.append([cellIds[pos] for pos in adjacent if pos in cellIds])
+
+        distances = array.array('i')
+        for source in range(self.numCells):
+            row = [UNREACHABLE] * self.numCells
+            row[source] = 0
+            frontier = [source]
+            depth = 0
+            while frontier:
+                depth += 1
+                nextFrontier = []
+                for cell in frontier:
+                    for other in neighbors[cell]:
+                        if row[other] == UNREACHABLE:
+                            row[other] = depth
+                            nextFrontier.append(other)
+                frontier = nextFrontier
+            distances.extend(row)
+        return distances
+
+    def cellId(self, pos):
+        "Returns the id of an open cell; raises KeyError for walls."
+        return self.cellIds[pos]
+
+    def distance(self, pos1, pos2):
+        "Returns the maze distance between two open cells in O(1), or UNREACHABLE."
+        return self.distances[self.cellIds[pos1] * self.numCells + self.cellIds[pos2]]
+
+    def distancesFrom(self, pos):
+        "Returns the row of distances from pos to every cell, indexed by cell id."
+        start = self.cellIds[pos] * self.numCells
+        return self.distances[start:start + self.numCells]
+
+def layoutKey(walls):
+    "A digest of the wall layout, used to share oracles in memory and on disk."
+    text = '%d %d\n%s' % (walls.width, walls.height, str(walls))
+    return hashlib.sha1(text.encode('ascii')).hexdigest()
+
+def getMazeDistances(walls, useDiskCache=True):
+    """
+    Returns the MazeDistances oracle for the maze with the given walls.
+
+    Oracles are kept in memory for the life of the process and, unless
+    useDiskCache is False, pickled under CACHE_DIR keyed by layoutKey(walls)
+    so that later runs on the same layout skip the BFS entirely.
+    """
+    global _lastLookup
+    if _lastLookup[0] is walls:
+        return _lastLookup[1]
+    key = layoutKey(walls)
+    if key in _oracles:
+        _lastLookup = (walls, _oracles[key])
+        return _oracles[key]
+    oracle = None
+    if useDiskCache:
+        oracle = _loadOracle(key, walls)
+    if oracle is None:
+        oracle = MazeDistances(walls)
+        if useDiskCache:
+            _saveOracle(key, oracle)
+    _oracles[key] = oracle
+    _lastLookup = (walls, oracle)
+    return oracle
+
+def _cachePath(key):
+    return os.path.join(CACHE_DIR, key + '.pickle')
+
+def _loadOracle(key, walls):
+    try:
+        with open(_cachePath(key), 'rb') as f:
+            version, cells, distances = pickle.load(f)
+    except (IOError, OSError, EOFError, ValueError, pickle.UnpicklingError):
+        return None
+    if version != CACHE_VERSION or len(distances) != len(cells) ** 2:
+        return None
+    return MazeDistances(walls, cells, distances)
 
+def _saveOracle(key, oracle):
+    # The cache is only an optimisation: failing to write it is not an error.
+    try:
+        if not os.path.isdir(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        tmpPath = '%s.%d.tmp' % (_cachePath(key), os.getpid())
+        with open(tmpPath, 'wb') as f:
+            pickle.dump((CACHE_VERSION, oracle.cells, oracle.distances), f, pickle.HIGHEST_PROTOCOL)
+        os.replace(tmpPath, _cachePath(key))
+    except (IOError, OSError):
+        pass
@@ -324,6 +324,30 @@ class ExactInference(InferenceModule):
         return self.beliefs
 
 
+class VectorizedExactInference(ExactInference):
+    """
+    ExactInference with the beliefs held in a NumPy vector over
+    self.allPositions (see beliefEngine.py).  The transition model for each
+    Pacman position is built once and reused, which assumes the ghost's moves
+    depend only on its own position and Pacman's, as they do for the ghosts
+    in ghostAgents.py.
+    """
+    def initializeUniformly(self, gameState):
+        import beliefEngine
+        self.engine = beliefEngine.BeliefEngine(self.allPositions, self.getJailPosition())
+        self.vector = self.engine.uniform(self.legalPositions)
+
+    def observeUpdate(self, observation, gameState):
+        self.vector = self.engine.observe(self.vector, observation, gameState.getPacmanPosition())
+
+    def elapseTime(self, gameState):
+        positionDistribution = lambda pos: self.getPositionDistribution(gameState, pos)
+        self.vector = self.engine.elapse(self.vector, gameState.getPacmanPosition(), positionDistribution)
+
+    def getBeliefDistribution(self):
+        return self.engine.toDistribution(self.vector)
+
+
 class ParticleFilter(InferenceModule):
     """
     A particle filter for approximately tracking a single ghost.